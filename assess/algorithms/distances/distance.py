@@ -3,10 +3,12 @@ Module deals with different handlings for distances. Those can easily be attache
 to algorithms to adjust calculated distance. Therefore different combinations
 become available and can easily be parameterised.
 """
+import math
 from typing import Dict
 
 from assess.events.events import ProcessExitEvent, ProcessStartEvent, TrafficEvent, \
     ParameterEvent, Event
+from assess.utility.state import object_state, restore_state
 
 
 class Distance(object):
@@ -81,6 +83,33 @@ class Distance(object):
         """
         raise NotImplementedError
 
+    def update_distance_many(self, prototypes, signature_prototypes,
+                             event_type=None, matches=None, count=1, **kwargs):
+        """
+        This method is called when the same event has been received *count*
+        times in a row. The result is the same as calling *update_distance*
+        *count* times, distances might only differ by rounding.
+
+        The default implementation calls *update_distance* repeatedly,
+        subclasses may apply all occurrences at once.
+
+        :param matches: List of dictionaries that relates a token to a list of
+            matching prototypes.
+        :param count: Number of occurrences of the event
+        :param kwargs:
+        :return: list of signatures of last update or None if count is 0
+        """
+        result = None
+        for _ in range(count):
+            result = self.update_distance(
+                prototypes=prototypes,
+                signature_prototypes=signature_prototypes,
+                event_type=event_type,
+                matches=matches,
+                **kwargs
+            )
+        return result
+
     def finish_distance(self, prototypes, signature_prototypes):
         """
         This method is usually called, when the tree has been finished. It can
@@ -138,6 +167,19 @@ class Distance(object):
         """
         return self._based_on_original
 
+    @staticmethod
+    def _lower_count(multiplicity, limit, count, step=1):
+        """
+        Returns how many of *count* occurrences see a multiplicity below
+        *limit* when the multiplicity starts at *multiplicity* and grows by
+        *step* with each occurrence.
+        """
+        if multiplicity >= limit:
+            return 0
+        if not step:
+            return count
+        return min(count, int(math.ceil((limit - multiplicity) / float(step))))
+
     @staticmethod
     def _add_result_dicts(base=None, to_add=None, index=None):
         if index is None:
@@ -158,10 +200,13 @@ class Distance(object):
         return result
 
     def __getstate__(self):
-        obj_dict = self.__dict__.copy()
+        obj_dict = object_state(self)
         # FIXME: maybe this needs to be something else here...
         obj_dict["_measured_nodes"] = [set()] * self.signature_count
         return obj_dict
 
+    def __setstate__(self, state):
+        restore_state(self, state)
+
     def __repr__(self):
         return "%s" % self.__class__.__name__
@@ -19,7 +19,18 @@ class SimpleDistance(Distance):
     The currently implemented formula is the following:
     * Explicit version: $\delta = |H(P)| - |H(T_{i})| + 2|H(T^{\mathrm{add}}_{i})|$
     * Recursive version: Too long ;)
+
+    When *lazy* is set, the increment of one for a new signature is not added to
+    every prototype but to a global offset per ensemble. Matching prototypes
+    only receive a correction of -2 so that the costs of an event depend on the
+    number of matching prototypes instead of the number of prototypes. The
+    effective distances are materialised when they are requested.
     """
+    def __init__(self, lazy=False, **kwargs):
+        Distance.__init__(self, **kwargs)
+        self._lazy = lazy
+        self._offsets = None
+
     def init_distance(self, prototypes, signature_prototypes):
         super().init_distance(prototypes, signature_prototypes)
         for prototype in prototypes:
@@ -29,6 +40,21 @@ class SimpleDistance(Distance):
                     self._monitoring_results_dict[index][prototype] = node_count[index]
                 except TypeError:
                     self._monitoring_results_dict[index][prototype] = node_count
+        self._offsets = [0] * self.signature_count
+
+    def iter_on_prototypes(self, prototypes=None):
+        if not self._lazy:
+            yield from super().iter_on_prototypes(prototypes)
+            return
+        for prototype in prototypes:
+            yield [result.get(prototype, 0) + offset for result, offset in
+                   zip(self._monitoring_results_dict, self._offsets)]
+
+    def current_distance(self):
+        if not self._lazy:
+            return super().current_distance()
+        return [{prototype: value + offset for prototype, value in result.items()}
+                for result, offset in zip(self._monitoring_results_dict, self._offsets)]
 
     def update_distance(self, prototypes, signature_prototypes, event_type=None,
                         matches=None, **kwargs):
@@ -48,8 +74,22 @@ class SimpleDistance(Distance):
                     self._measured_nodes[ensemble_index].add(signature)
         return [match.keys() for match in matches]
 
+    def update_distance_many(self, prototypes, signature_prototypes,
+                             event_type=None, matches=None, count=1, **kwargs):
+        # only the first occurrence of a signature is measured
+        return super().update_distance_many(
+            prototypes, signature_prototypes, event_type=event_type,
+            matches=matches, count=min(count, 1), **kwargs)
+
     def _update_distances(self, prototypes, index=0, prototype_nodes=None,
                           node_signature=None):
+        if self._lazy:
+            self._offsets[index] += 1
+            results = self._monitoring_results_dict[index]
+            for prototype_node in prototype_nodes:
+                if prototype_node in results:
+                    results[prototype_node] -= 2
+            return
         result_dict = dict.fromkeys(prototypes, 1)
         for prototype_node in prototype_nodes:
             result_dict[prototype_node] = -1
@@ -89,6 +129,13 @@ class SimpleDistance2(Distance):
                 self._measured_nodes[index].add(signature)
         return [list(match)[0] for match in matches]
 
+    def update_distance_many(self, prototypes, signature_prototypes,
+                             event_type=None, matches=None, count=1, **kwargs):
+        # only the first occurrence of a signature is measured
+        return super().update_distance_many(
+            prototypes, signature_prototypes, event_type=event_type,
+            matches=matches, count=min(count, 1), **kwargs)
+
     def finish_distance(self, prototypes, signature_prototypes):
         result_dict = [dict(zip(prototypes, [0] * len(prototypes))) for _
                        in range(self.signature_count)]
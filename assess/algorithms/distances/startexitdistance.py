@@ -5,6 +5,7 @@ trees based on their start and exit events.
 
 from assess.algorithms.distances.distance import Distance
 from assess.algorithms.signatures.signaturecache import SignatureCache
+from assess.algorithms.statistics.statisticscolumns import StatisticsColumns
 from assess.events.events import ProcessStartEvent, TrafficEvent, ParameterEvent
 
 
@@ -22,19 +23,44 @@ class StartExitDistance(Distance):
 
     * A weight of 1 means, that only nodes are considered.
     * A weight of zero means, that only attributes are considered.
+
+    When *vectorized* is set, the distances are not kept in dictionaries per
+    ensemble but in dense lists indexed by the position of a prototype in the
+    list of prototypes given to *init_distance*. The base distance of an event
+    is added to a global offset per ensemble and only the matching prototypes
+    receive a correction, so the costs of an event depend on the number of
+    matching prototypes instead of the number of prototypes. Results equal the
+    ones of the dictionary based mode up to rounding.
+
+    The statistics of the prototypes matching a signature are taken over into
+    :py:class:`StatisticsColumns` on first use, so the distance of a value to
+    all of them is determined at once. The columns are kept as long as the same
+    signature cache of prototypes is given to *init_distance*, so the cache must
+    not be changed in between.
     """
-    __slots__ = ("_signature_cache", "_weight", "_cached_weights")
+    __slots__ = ("_signature_cache", "_weight", "_cached_weights", "_vectorized",
+                 "_prototype_index", "_vector_results", "_offsets", "_statistics_columns",
+                 "_columns_prototypes")
 
-    def __init__(self, weight=.5, **kwargs):
+    def __init__(self, weight=.5, vectorized=False, **kwargs):
         Distance.__init__(self, **kwargs)
         self._based_on_original = False
         self._signature_cache = None
         assert 0 <= weight <= 1
         self._weight = weight
         self._cached_weights = None
+        self._vectorized = vectorized
+        self._prototype_index = None
+        self._vector_results = None
+        self._offsets = None
+        self._statistics_columns = {}
+        self._columns_prototypes = None
 
     def init_distance(self, prototypes, signature_prototypes):
         super().init_distance(prototypes, signature_prototypes)
+        if signature_prototypes is not self._columns_prototypes:
+            self._statistics_columns = {}
+            self._columns_prototypes = signature_prototypes
         self._signature_cache = [SignatureCache(
             statistics_cls=signature_prototypes.statistics_cls,
             supported=self.supported
@@ -46,6 +72,32 @@ class StartExitDistance(Distance):
                     self._monitoring_results_dict[index][prototype] = node_count[index]
                 except TypeError:
                     self._monitoring_results_dict[index][prototype] = node_count
+        if self._vectorized:
+            self._prototype_index = {
+                prototype: position for position, prototype in enumerate(prototypes)}
+            self._vector_results = [
+                [result.get(prototype, 0) for prototype in prototypes]
+                for result in self._monitoring_results_dict]
+            self._offsets = [0] * self.signature_count
+
+    def iter_on_prototypes(self, prototypes=None):
+        if not self._vectorized:
+            yield from super().iter_on_prototypes(prototypes)
+            return
+        for prototype in prototypes:
+            position = self._prototype_index.get(prototype)
+            if position is None:
+                yield [0 for _ in self._vector_results]
+            else:
+                yield [result[position] + offset for result, offset in
+                       zip(self._vector_results, self._offsets)]
+
+    def current_distance(self):
+        if not self._vectorized:
+            return super().current_distance()
+        return [{prototype: value + offset for prototype, value in
+                 zip(self._prototype_index, result)}
+                for result, offset in zip(self._vector_results, self._offsets)]
 
     def update_distance(self, prototypes, signature_prototypes, event_type,
                         matches=None, value=None, **kwargs):
@@ -89,6 +141,36 @@ class StartExitDistance(Distance):
                         {"value": value if value is not None else 0}
         return [list(match)[0] for match in matches]
 
+    def update_distance_many(self, prototypes, signature_prototypes, event_type,
+                             matches=None, count=1, value=None, **kwargs):
+        if count < 1 or (value is not None and
+                         self.weights().get(event_type, 0) > self._weight):
+            # distance of value depends on the values that have been seen before
+            return super().update_distance_many(
+                prototypes, signature_prototypes, event_type=event_type,
+                matches=matches, count=count, value=value, **kwargs)
+        if matches is None:
+            matches = []
+        stored_value = value
+        if event_type != ProcessStartEvent and value is None:
+            stored_value = 0
+        for index, match in enumerate(matches):
+            for signature, matching_prototypes in match.items():
+                if signature is None:
+                    continue
+                self._update_distances(
+                    prototypes=prototypes,
+                    event_type=event_type,
+                    index=index,
+                    prototype_nodes=matching_prototypes,
+                    node_signature=signature,
+                    value=value,
+                    count=count
+                )
+                self._signature_cache[index].set_many(
+                    [((signature, event_type), {"value": stored_value})] * count)
+        return [list(match)[0] for match in matches]
+
     def node_count(self, prototypes=None, signature_prototypes=None, signature=False,
                    by_event=False):
         if prototypes:
@@ -125,36 +207,82 @@ class StartExitDistance(Distance):
         return self._cached_weights
 
     def _update_distances(self, prototypes, event_type=None, index=0,
-                          prototype_nodes=None, node_signature=None, value=None):
+                          prototype_nodes=None, node_signature=None, value=None,
+                          count=1):
         base = self.weights().get(event_type, 0)
+        self._apply_results(
+            prototypes=prototypes,
+            index=index,
+            base=base * count,
+            results=self._matching_results(
+                event_type=event_type,
+                index=index,
+                base=base,
+                prototype_nodes=prototype_nodes,
+                node_signature=node_signature,
+                value=value,
+                count=count
+            )
+        )
+
+    def _matching_results(self, event_type=None, index=0, base=0,
+                          prototype_nodes=None, node_signature=None, value=None,
+                          count=1):
+        """
+        Determines the local distance for each prototype containing the
+        *node_signature*. Prototypes that are not included within the result
+        get the *base* distance assigned.
+
+        For a *count* above 1 the distances of as many occurrences are summed
+        up. This is only supported for a *value* of None, as distances of
+        values depend on the values seen before.
+
+        :return: Dict of prototype -> local distance
+        """
+        results = {}
+        if not prototype_nodes:
+            return results
         node_base = self._weight
         property_base = base - node_base
-        result_dict = dict.fromkeys(prototypes, base)
-        for prototype_node in prototype_nodes:
-            if prototype_nodes[prototype_node] is None:
-                continue
-            result = 0
-            if self._signature_cache[index].multiplicity(
+        # counts of the monitoring tree do not depend on the actual prototype
+        signature_cache = self._signature_cache[index]
+        multiplicity = signature_cache.multiplicity(
+            signature=node_signature,
+            event_type=event_type
+        )
+        # multiplicity grows with each occurrence if it is stored
+        step = 1 if signature_cache.supported.get(event_type, False) else 0
+        if property_base > 0:
+            try:
+                statistic = self._signature_cache[index].get_statistics(
                     signature=node_signature,
+                    key="value",
                     event_type=event_type
-            ) < prototype_nodes[prototype_node][event_type]["value"].count():
-                result -= node_base
+                )
+            except KeyError:
+                # no data has been saved for node_signature
+                signature_count = 0
+            else:
+                signature_count = statistic.count(value=value)
+            if value is not None:
+                distances = self._column_distances(
+                    index, node_signature, event_type, prototype_nodes, value,
+                    signature_count)
             else:
-                result += node_base
+                distances = None
+        for prototype_node in prototype_nodes:
+            if prototype_nodes[prototype_node] is None:
+                continue
+            lower = self._lower_count(
+                multiplicity,
+                prototype_nodes[prototype_node][event_type]["value"].count(),
+                count, step)
+            result = (count - 2 * lower) * node_base
             if property_base > 0:
-                try:
-                    statistic = self._signature_cache[index].get_statistics(
-                        signature=node_signature,
-                        key="value",
-                        event_type=event_type
-                    )
-                except KeyError:
-                    # no data has been saved for node_signature
-                    signature_count = 0
-                else:
-                    signature_count = statistic.count(value=value)
                 if value is None:
                     distance = 0
+                elif distances is not None:
+                    distance = distances[prototype_node]
                 else:
                     try:
                         statistic = \
@@ -168,16 +296,60 @@ class StartExitDistance(Distance):
                         )
                 if distance > .5:
                     # partial or full mismatch
-                    result += distance * property_base
+                    result += count * distance * property_base
                 else:
-                    result -= (1 - distance) * property_base
-            result_dict[prototype_node] = result
-        # add local node distance to global tree distance
-        self._monitoring_results_dict = self._add_result_dicts(
-            index=index,
-            to_add=[result_dict],
-            base=self._monitoring_results_dict
-        )
+                    result -= count * (1 - distance) * property_base
+            results[prototype_node] = result
+        return results
+
+    def _column_distances(self, index, node_signature, event_type, prototype_nodes,
+                          value, count):
+        """
+        Returns the distances of *value* to the statistics of the prototypes in
+        *prototype_nodes* by using :py:class:`StatisticsColumns`. None is
+        returned if the statistics are not supported by the columns.
+
+        :return: Dict of prototype -> distance or None
+        """
+        key = (index, node_signature, event_type)
+        try:
+            columns = self._statistics_columns[key]
+        except KeyError:
+            prototypes = [prototype for prototype in prototype_nodes
+                          if prototype_nodes[prototype] is not None]
+            try:
+                statistics = [prototype_nodes[prototype][event_type]["value"]
+                              for prototype in prototypes]
+            except KeyError:
+                columns = None
+            else:
+                columns = StatisticsColumns.from_statistics(prototypes, statistics)
+            self._statistics_columns[key] = columns
+        if columns is None:
+            return None
+        return dict(zip(columns.prototypes, columns.distances(value, count)))
+
+    def _apply_results(self, prototypes, index, base, results):
+        """
+        Adds the local node distance to the global tree distance. Prototypes that
+        are not part of *results* are increased by *base*.
+        """
+        if not self._vectorized:
+            result_dict = dict.fromkeys(prototypes, base)
+            result_dict.update(results)
+            self._monitoring_results_dict = self._add_result_dicts(
+                index=index,
+                to_add=[result_dict],
+                base=self._monitoring_results_dict
+            )
+            return
+        self._offsets[index] += base
+        vector = self._vector_results[index]
+        prototype_index = self._prototype_index
+        for prototype, result in results.items():
+            position = prototype_index.get(prototype)
+            if position is not None:
+                vector[position] += result - base
 
     def __repr__(self):
         return "%s (weight=%s)" % (self.__class__.__name__, self._weight)
@@ -189,10 +361,16 @@ class StartExitDistanceWOAttributes(StartExitDistance):
     also the removal of nodes but ignores local as well as global attributes.
     Only the pure existence of nodes does influence actual distance measurement
     """
-    def __init__(self, **kwargs):
+    def __init__(self, vectorized=False, **kwargs):
         Distance.__init__(self, **kwargs)
         self._based_on_original = False
         self._signature_cache = None
+        self._vectorized = vectorized
+        self._prototype_index = None
+        self._vector_results = None
+        self._offsets = None
+        self._statistics_columns = {}
+        self._columns_prototypes = None
 
     def update_distance(self, prototypes, signature_prototypes, event_type,
                         matches=None, value=None, **kwargs):
@@ -213,28 +391,54 @@ class StartExitDistanceWOAttributes(StartExitDistance):
                 self._signature_cache[index][signature, event_type] = {"value": value}
         return [list(match)[0] for match in matches]
 
+    def update_distance_many(self, prototypes, signature_prototypes, event_type,
+                             matches=None, count=1, value=None, **kwargs):
+        if count < 1:
+            return None
+        if matches is None:
+            matches = []
+        for index, match in enumerate(matches):
+            for signature, matching_prototypes in match.items():
+                if signature is None:
+                    continue
+                self._update_distances(
+                    prototypes=prototypes,
+                    event_type=event_type,
+                    index=index,
+                    prototype_nodes=matching_prototypes,
+                    node_signature=signature,
+                    value=value,
+                    count=count
+                )
+                self._signature_cache[index].set_many(
+                    [((signature, event_type), {"value": value})] * count)
+        return [list(match)[0] for match in matches]
+
     def _update_distances(self, prototypes, event_type=None, index=0,
-                          prototype_nodes=None, node_signature=None, value=None):
+                          prototype_nodes=None, node_signature=None, value=None,
+                          count=1):
         node_base = .5
-        result_dict = dict(zip(prototypes, [node_base for _ in range(len(prototypes))]))
-
-        for prototype_node in prototype_nodes:
-            if prototype_nodes[prototype_node] is None:
-                continue
-            result = 0
-            if self._signature_cache[index].multiplicity(
-                    signature=node_signature,
-                    event_type=event_type
-            ) < prototype_nodes[prototype_node][event_type]["value"].count():
-                result -= node_base
-            else:
-                result += node_base
-            result_dict[prototype_node] = result
-        # add local node distance to global tree distance
-        self._monitoring_results_dict = self._add_result_dicts(
+        results = {}
+        if prototype_nodes:
+            signature_cache = self._signature_cache[index]
+            multiplicity = signature_cache.multiplicity(
+                signature=node_signature,
+                event_type=event_type
+            )
+            step = 1 if signature_cache.supported.get(event_type, False) else 0
+            for prototype_node in prototype_nodes:
+                if prototype_nodes[prototype_node] is None:
+                    continue
+                lower = self._lower_count(
+                    multiplicity,
+                    prototype_nodes[prototype_node][event_type]["value"].count(),
+                    count, step)
+                results[prototype_node] = (count - 2 * lower) * node_base
+        self._apply_results(
+            prototypes=prototypes,
             index=index,
-            to_add=[result_dict],
-            base=self._monitoring_results_dict
+            base=node_base * count,
+            results=results
         )
 
     def __repr__(self):
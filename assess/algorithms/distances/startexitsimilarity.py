@@ -56,6 +56,31 @@ class StartExitSimilarity(Distance):
                     }
         return [list(match)[0] for match in matches]
 
+    def update_distance_many(self, prototypes, signature_prototypes, event_type=None,
+                             matches=None, count=1, value=None, **kwargs):
+        if count < 1:
+            return None
+        if matches is None:
+            matches = []
+        for index, match in enumerate(matches):
+            for signature, matching_prototypes in match.items():
+                if signature is None:
+                    continue
+                self._update_distances(
+                    prototypes=prototypes,
+                    index=index,
+                    prototype_nodes=matching_prototypes,
+                    node_signature=signature,
+                    value=value,
+                    event_type=event_type,
+                    count=count
+                )
+                self._signature_cache[index].set_many(
+                    [((signature, event_type), {
+                        "value": 0 if event_type == ProcessStartEvent else value
+                    })] * count)
+        return [list(match)[0] for match in matches]
+
     def node_count(self, prototypes=None, signature_prototypes=None, signature=False,
                    by_event=False):
         if prototypes is not None:
@@ -69,20 +94,27 @@ class StartExitSimilarity(Distance):
                 self._signature_cache]
 
     def _update_distances(self, prototypes, index=0, prototype_nodes=None,
-                          node_signature=None, value=None, event_type=None):
+                          node_signature=None, value=None, event_type=None, count=1):
         result_dict = dict.fromkeys(prototypes, 0)
+        signature_cache = self._signature_cache[index]
+        multiplicity = signature_cache.multiplicity(
+            signature=node_signature,
+            event_type=ProcessExitEvent
+        )
+        # only exit events raise the multiplicity that is compared
+        step = 1 if event_type == ProcessExitEvent and \
+            signature_cache.supported.get(ProcessExitEvent, False) else 0
         for prototype_node in prototype_nodes:
             # FIXME: Ich denke die 2* muss entfernt werden
             statistic = prototype_nodes[prototype_node][ProcessExitEvent]["value"]
-            if self._signature_cache[index].multiplicity(
-                    signature=node_signature,
-                    event_type=ProcessExitEvent
-            ) < 2 * statistic.count():
+            lower = self._lower_count(
+                multiplicity, 2 * statistic.count(), count, step)
+            if lower:
                 distance = statistic.distance(value=value)
                 if distance is None:
-                    result_dict[prototype_node] = 1
+                    result_dict[prototype_node] = lower
                 else:
-                    result_dict[prototype_node] = 1 - distance
+                    result_dict[prototype_node] = lower * (1 - distance)
         # add local node distance to global tree distance
         self._monitoring_results_dict = self._add_result_dicts(
             index=index,
@@ -90,6 +90,8 @@ class IncrementalDistanceAlgorithm(TreeDistanceAlgorithm):
                 matches=[{token: matching_prototypes[index]}
                          for index, token in enumerate(signature)]
             )
+        if not kwargs.get("checkpoint", True):
+            return None
         # [[p1e1, ..., p1en], ..., [pne1, ..., pnen]]
         result = [value for value in self.distance.iter_on_prototypes(
             self.prototypes)]
@@ -0,0 +1,488 @@
+"""
+Module offers a columnar implementation of a PrototypeSignatureCache. Instead of
+nested dictionaries, signatures and prototypes are mapped to dense integer ids
+and the pairs of both are stored in compressed sparse rows.
+"""
+import logging
+from array import array
+from collections import OrderedDict
+
+from assess.algorithms.signatures.signaturecache import group_values, \
+    PrototypeSignatureCache
+from assess.algorithms.statistics.splittedstatistics import SplittedStatistics
+from assess.events.events import ProcessStartEvent, ProcessExitEvent, TrafficEvent
+
+
+class ColumnarPrototypeSignatureCache(object):
+    """
+    The ColumnarPrototypeSignatureCache offers the same interface as the
+    :py:class:`PrototypeSignatureCache` but stores its data column wise. Each
+    signature is assigned a row, each prototype a column. An entry represents
+    the occurrence of a signature within a prototype and holds its multiplicity
+    as well as its statistics per event type.
+
+    While values are added, entries are appended in order of appearance. On the
+    first read access the entries are sorted by rows (compressed sparse rows),
+    so the prototypes matching a signature are stored consecutively. Adding
+    further values is still possible, but requires the ordering to be restored
+    on the next read access.
+
+    Reading a signature returns a dictionary view of its row in the format of
+    :py:class:`PrototypeSignatureCache`. The views of the *view_cache_size*
+    signatures read last are kept, so repeated lookups do not build the
+    dictionaries again, and are dropped when values are added. Views need about
+    as much memory as the rows of a :py:class:`PrototypeSignatureCache`, so
+    the bound keeps the memory of the cache independent of the number of
+    signatures being read. Setting *view_cache_size* to None keeps all views,
+    trading memory for lookup time.
+
+    Multiplicities are stored as integers. Once a multiplicity that is not an
+    integer is added for an event type, e.g. from averaged statistics, the
+    multiplicities of the event type are stored as floats.
+
+    The cache can be selected by setting the *prototype_signature_cache_class* of
+    a :py:class:`Signature`.
+    """
+    def __init__(self, supported=None, statistics_cls=None, view_cache_size=4096):
+        self.supported = supported or {
+            ProcessStartEvent: True,
+            ProcessExitEvent: False,
+            TrafficEvent: False
+        }
+        self.statistics_cls = statistics_cls or SplittedStatistics
+        self.signature_cache_count = 1
+        self._keys = None
+        self._signature_ids = {}
+        self._signatures = []
+        self._prototype_ids = {}
+        self._prototypes = []
+        # (row, column) -> entry, only available while values are added
+        self._entries = {}
+        self._rows = array("l")
+        self._columns = array("l")
+        # row -> first entry of row, only available when entries are sorted
+        self._indptr = None
+        # event_type -> multiplicity/statistics per entry
+        self._counts = {}
+        self._statistics = {}
+        # (entry, event_type) -> {key: statistics} for keys other than value
+        self._extras = {}
+        # entry -> probability of signature for averaged caches
+        self._probabilities = {}
+        # signature -> view of row in least recently used order
+        self._views = OrderedDict()
+        self.view_cache_size = view_cache_size
+        self._multiplicities = {}
+        self._prototype_multiplicities = []
+        self._node_counts = array("l")
+
+    def __setitem__(self, key, value):
+        signature, prototype, event_type = key
+        if not self.supported.get(event_type, False):
+            logging.getLogger(self.__class__.__name__).warning(
+                "Skipping %s (%s) for event %s" % (signature, value, event_type))
+            return
+        if signature is None:
+            return
+        entry = self._entry(signature, prototype, create=True)
+        statistics = self._event_statistics(event_type)
+        for item in value:
+            if item == "value":
+                statistic = statistics[entry]
+                if statistic is None:
+                    statistic = statistics[entry] = self.statistics_cls()
+                statistic.add(value=value[item])
+                self._count_added(entry, event_type, 1)
+            else:
+                self._extras.setdefault((entry, event_type), {}).setdefault(
+                    item, self.statistics_cls()).add(value=value[item])
+
+    def set_many(self, entries):
+        """
+        Method adds the values of several entries at once, see
+        :py:meth:`SignatureCache.set_many`.
+
+        :param entries: Iterable of tuples from key and value as for `[]`
+        """
+        for key, values in group_values(entries).items():
+            signature, prototype, event_type = key
+            if not self.supported.get(event_type, False):
+                logging.getLogger(self.__class__.__name__).warning(
+                    "Skipping %s (%s) for event %s" % (signature, values, event_type))
+                continue
+            if signature is None:
+                continue
+            entry = self._entry(signature, prototype, create=True)
+            statistics = self._event_statistics(event_type)
+            for item, item_values in values.items():
+                if item == "value":
+                    statistic = statistics[entry]
+                    if statistic is None:
+                        statistic = statistics[entry] = self.statistics_cls()
+                    statistic.add_many(item_values)
+                    self._count_added(entry, event_type, len(item_values))
+                else:
+                    self._extras.setdefault((entry, event_type), {}).setdefault(
+                        item, self.statistics_cls()).add_many(item_values)
+
+    def __iadd__(self, other):
+        if type(self) != type(other):
+            return NotImplemented
+        if self.supported != other.supported:
+            return NotImplemented
+        if self.statistics_cls != other.statistics_cls:
+            return NotImplemented
+        for signature in other:
+            for prototype, values in other.get(signature).items():
+                if self.multiplicity(signature, prototype) > 0:
+                    logging.getLogger(self.__class__.__name__).warning(
+                        "skipping signature %s for prototype %s "
+                        "because it already exists" % (signature, prototype))
+                    continue
+                entry = self._entry(signature, prototype, create=True)
+                for event_type, statistics in values.items():
+                    if event_type == "probability":
+                        self._probabilities[entry] = statistics
+                        continue
+                    event_statistics = self._event_statistics(event_type)
+                    for stat_key, statistic in statistics.items():
+                        if stat_key == "value":
+                            current = event_statistics[entry]
+                            if current is None:
+                                current = event_statistics[entry] = \
+                                    self.statistics_cls()
+                            try:
+                                self._count_added(
+                                    entry, event_type, statistic.count())
+                            except (TypeError, AttributeError):
+                                # statistics that could not be averaged
+                                pass
+                        else:
+                            current = self._extras.setdefault(
+                                (entry, event_type), {}).setdefault(
+                                stat_key, self.statistics_cls())
+                        current += statistic
+        return self
+
+    def update(self, other, prototypes=None):
+        """
+        Method takes over the entries of *other* for prototypes that are not part
+        of the cache yet. In contrast to `+=` the statistics are not merged but
+        taken over as they are, so *other* must not be used afterwards.
+        Prototypes of *other* can be replaced by the mapping *prototypes*.
+
+        :param other: The cache to take the entries from
+        :param prototypes: Mapping from prototypes of other to prototypes
+        :return: Updated cache
+        """
+        for signature in other:
+            for prototype, values in other.get(signature).items():
+                if prototypes is not None:
+                    prototype = prototypes[prototype]
+                if self._entry(signature, prototype) is not None:
+                    logging.getLogger(self.__class__.__name__).warning(
+                        "skipping signature %s for prototype %s "
+                        "because it already exists" % (signature, prototype))
+                    continue
+                entry = self._entry(signature, prototype, create=True)
+                for event_type, statistics in values.items():
+                    if event_type == "probability":
+                        self._probabilities[entry] = statistics
+                        continue
+                    event_statistics = self._event_statistics(event_type)
+                    for stat_key, statistic in statistics.items():
+                        if stat_key == "value":
+                            event_statistics[entry] = statistic
+                            try:
+                                count = statistic.count()
+                            except (TypeError, AttributeError):
+                                # statistics that could not be averaged
+                                continue
+                            self._count_added(entry, event_type, count)
+                        else:
+                            self._extras.setdefault(
+                                (entry, event_type), {})[stat_key] = statistic
+        return self
+
+    @classmethod
+    def from_signature_caches(cls, signature_caches, prototype=None, threshold=.1):
+        """
+        Method combines several signature caches to one single prototype
+        signature cache, see :py:meth:`PrototypeSignatureCache.from_signature_caches`.
+
+        :param signature_caches: List of signature caches to consider
+        :param prototype: Reference of prototype to consider for resulting cache
+        :param threshold: Threshold to consider for dropping signatures
+        :return: Combined cache
+        """
+        averaged = PrototypeSignatureCache.from_signature_caches(
+            signature_caches, prototype=prototype, threshold=threshold)
+        result = cls(supported=averaged.supported,
+                     statistics_cls=averaged.statistics_cls)
+        result.signature_cache_count = averaged.signature_cache_count
+        return result.update(averaged)
+
+    def __getitem__(self, item):
+        views = self._views
+        try:
+            view = views[item]
+        except KeyError:
+            if item not in self._signature_ids:
+                return {}
+            view = views[item] = {
+                self._prototypes[self._columns[entry]]: self._entry_statistics(entry)
+                for entry in self._row_entries(item)}
+            if self.view_cache_size is not None and \
+                    len(views) > self.view_cache_size:
+                views.popitem(last=False)
+        else:
+            views.move_to_end(item)
+        return view
+
+    def __iter__(self):
+        for signature in self._signatures:
+            yield signature
+
+    def __contains__(self, item):
+        return item in self._signature_ids
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def support_keys(self):
+        if self._keys is None:
+            self._keys = []
+            for key, value in self.supported.items():
+                if value:
+                    self._keys.append(key)
+        return self._keys
+
+    def get(self, signature):
+        """
+        Returns a dictionary of prototypes with their statistics for a given
+        signature. If the signature does not exist, an empty dictionary is returned.
+
+        :param signature: Signature to return the statistics for
+        :return: Dictionary of prototypes with statistics as value
+        """
+        return self[signature]
+
+    def get_statistics(self, signature, key, event_type, prototype):
+        entry = self._entry(signature, prototype)
+        if entry is not None:
+            if key == "value":
+                statistics = self._statistics.get(event_type)
+                statistic = statistics[entry] if statistics is not None else None
+            else:
+                statistic = self._extras.get((entry, event_type), {}).get(key)
+            if statistic is not None:
+                return statistic
+        return self.statistics_cls()
+
+    def node_count(self, prototype=None):
+        """
+        Returns the number of signatures stored for a given prototype.
+
+        :param prototype: Prototype to get the number of signatures for
+        :return: Number of signature for prototype
+        """
+        if prototype is None:
+            return len(self._signatures)
+        column = self._prototype_ids.get(prototype)
+        if column is None:
+            return 0
+        return self._node_counts[column]
+
+    def multiplicity(self, signature=None, prototype=None, event_type=None,
+                     by_event=False):
+        """
+        Returns the frequency of added objects. If no prototype is given, it
+        considers the frequency of all elements. Otherwise only the frequency
+        per prototype is given. This can further be detailed by specifying
+        signature or event_type.
+
+        :param signature: Signature to determine frequency from
+        :param prototype: Prototype to determine frequency from
+        :param event_type: Event_type to determine frequency from
+        :return: Frequency of signatures
+        """
+        if prototype is not None:
+            column = self._prototype_ids.get(prototype)
+            multiplicities = self._prototype_multiplicities[column] \
+                if column is not None else {}
+            if by_event and event_type is None:
+                return {event_key: multiplicities.get(event_key, 0)
+                        for event_key in self.support_keys()}
+            if signature is None:
+                return self._count_for_multiplicities(multiplicities, event_type)
+            entry = self._entry(signature, prototype)
+            return self._count_for_entry(entry, event_type) \
+                if entry is not None else 0
+        if by_event and event_type is None:
+            raise NotImplementedError
+        if signature is None:
+            return self._count_for_multiplicities(self._multiplicities, event_type)
+        return sum(self._count_for_entry(entry, event_type)
+                   for entry in self._row_entries(signature))
+
+    def internal(self):
+        """
+        Method returns a nested dictionary representation of the cache as it is
+        used by :py:class:`PrototypeSignatureCache`.
+
+        :return: Dict of signatures
+        """
+        return {signature: self[signature] for signature in self}
+
+    def _count_for_multiplicities(self, multiplicities, event_type):
+        if event_type is None:
+            return sum(multiplicities.get(support_key, 0)
+                       for support_key in self.support_keys())
+        return multiplicities.get(event_type, 0)
+
+    def _count_for_entry(self, entry, event_type):
+        if event_type is None:
+            return sum(self._counts[support_key][entry]
+                       for support_key in self.support_keys()
+                       if support_key in self._counts)
+        try:
+            return self._counts[event_type][entry]
+        except KeyError:
+            return 0
+
+    def _count_added(self, entry, event_type, count):
+        counts = self._counts[event_type]
+        try:
+            counts[entry] += count
+        except TypeError:
+            # multiplicity is not an integer
+            counts = self._counts[event_type] = array("d", counts)
+            counts[entry] += count
+        self._multiplicities[event_type] = \
+            self._multiplicities.get(event_type, 0) + count
+        multiplicities = self._prototype_multiplicities[self._columns[entry]]
+        multiplicities[event_type] = multiplicities.get(event_type, 0) + count
+
+    def _entry_statistics(self, entry):
+        result = {}
+        for event_type, statistics in self._statistics.items():
+            statistic = statistics[entry]
+            if statistic is not None:
+                result[event_type] = {"value": statistic}
+        if self._extras:
+            for event_type in self._statistics:
+                extras = self._extras.get((entry, event_type))
+                if extras:
+                    result.setdefault(event_type, {}).update(extras)
+        if self._probabilities:
+            probability = self._probabilities.get(entry)
+            if probability is not None:
+                result["probability"] = probability
+        return result
+
+    def _event_statistics(self, event_type):
+        try:
+            return self._statistics[event_type]
+        except KeyError:
+            self._counts[event_type] = array("l", [0]) * len(self._columns)
+            statistics = self._statistics[event_type] = [None] * len(self._columns)
+            return statistics
+
+    def _entry(self, signature, prototype, create=False):
+        """
+        Returns the entry for given *signature* and *prototype*. If *create* is
+        True, missing signatures, prototypes, and entries are created.
+
+        :return: Index of entry or None if it does not exist
+        """
+        row = self._signature_ids.get(signature)
+        column = self._prototype_ids.get(prototype)
+        if not create:
+            if row is None or column is None:
+                return None
+            if self._entries is not None:
+                return self._entries.get((row, column))
+            for entry in range(self._indptr[row], self._indptr[row + 1]):
+                if self._columns[entry] == column:
+                    return entry
+            return None
+        if self._views:
+            self._views.clear()
+        self._unsort()
+        if row is None:
+            row = self._signature_ids[signature] = len(self._signatures)
+            self._signatures.append(signature)
+        if column is None:
+            column = self._prototype_ids[prototype] = len(self._prototypes)
+            self._prototypes.append(prototype)
+            self._prototype_multiplicities.append({})
+            self._node_counts.append(0)
+        entry = self._entries.get((row, column))
+        if entry is None:
+            entry = self._entries[row, column] = len(self._columns)
+            self._rows.append(row)
+            self._columns.append(column)
+            for counts in self._counts.values():
+                counts.append(0)
+            for statistics in self._statistics.values():
+                statistics.append(None)
+            self._node_counts[column] += 1
+        return entry
+
+    def _row_entries(self, signature):
+        row = self._signature_ids.get(signature)
+        if row is None:
+            return range(0)
+        self._sort()
+        return range(self._indptr[row], self._indptr[row + 1])
+
+    def _sort(self):
+        """
+        Sorts the entries by rows and builds the row index. The mapping of rows
+        and columns to entries is released afterwards.
+        """
+        if self._entries is None:
+            return
+        order = sorted(range(len(self._rows)), key=self._rows.__getitem__)
+        indptr = array("l", [0]) * (len(self._signatures) + 1)
+        for row in self._rows:
+            indptr[row + 1] += 1
+        for row in range(len(self._signatures)):
+            indptr[row + 1] += indptr[row]
+        self._columns = array("l", (self._columns[entry] for entry in order))
+        for event_type, counts in self._counts.items():
+            self._counts[event_type] = array(
+                counts.typecode, (counts[entry] for entry in order))
+        for event_type, statistics in self._statistics.items():
+            self._statistics[event_type] = [statistics[entry] for entry in order]
+        if self._extras or self._probabilities:
+            position = array("l", [0]) * len(order)
+            for index, entry in enumerate(order):
+                position[entry] = index
+            self._extras = {(position[entry], event_type): value for
+                            (entry, event_type), value in self._extras.items()}
+            self._probabilities = {
+                position[entry]: value
+                for entry, value in self._probabilities.items()}
+        self._indptr = indptr
+        self._entries = None
+        self._rows = None
+
+    def _unsort(self):
+        """
+        Restores the mapping of rows and columns to entries to add further values.
+        """
+        if self._entries is not None:
+            return
+        self._rows = array("l")
+        for row in range(len(self._signatures)):
+            self._rows.extend(
+                [row] * (self._indptr[row + 1] - self._indptr[row]))
+        self._entries = {(row, column): entry for entry, (row, column) in
+                         enumerate(zip(self._rows, self._columns))}
+        self._indptr = None
+
+    def __repr__(self):
+        return "%s (signatures=%d, prototypes=%d, entries=%d)" % (
+            self.__class__.__name__, len(self._signatures), len(self._prototypes),
+            len(self._columns))
@@ -0,0 +1,128 @@
+"""
+Module offers a process-wide cache of compiled signature caches of prototypes.
+Algorithms sharing a signature, supported events, and statistics can reuse the
+signature cache of their prototypes instead of compiling it again.
+"""
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize",
+                                     "currsize"])
+
+
+class CompiledPrototypeCache(object):
+    """
+    The CompiledPrototypeCache keeps the signature caches of prototypes in
+    least recently used order. Entries are identified by the prototypes, the
+    representation of the signature, the supported events, and the class of
+    statistics. Prototypes are identified by their identity, so entries keep a
+    reference to their prototypes.
+
+    The size of an entry is the number of signatures it stores. Least recently
+    used entries are evicted as long as the size of all entries exceeds
+    *maxsize*. With a *maxsize* of 0 the cache is disabled.
+
+    :param maxsize: Maximum number of signatures to keep
+    """
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def key(prototypes, signature, supported, statistics_cls):
+        """
+        Method returns the key of an entry. Only supported events that are
+        enabled are considered.
+
+        :param prototypes: List of prototypes
+        :param signature: Signature used for compilation
+        :param supported: Dictionary of supported events
+        :param statistics_cls: Class of statistics to use
+        :return: Key of entry
+        """
+        return (tuple(id(prototype) for prototype in prototypes), repr(signature),
+                frozenset(event for event, value in supported.items() if value),
+                statistics_cls)
+
+    def get(self, prototypes, signature, supported, statistics_cls):
+        """
+        Method returns the signature cache of *prototypes* if it has already
+        been compiled, otherwise None.
+
+        :param prototypes: List of prototypes
+        :param signature: Signature used for compilation
+        :param supported: Dictionary of supported events
+        :param statistics_cls: Class of statistics to use
+        :return: Signature cache of prototypes or None
+        """
+        key = self.key(prototypes, signature, supported, statistics_cls)
+        try:
+            _, cache, _ = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return cache
+
+    def put(self, prototypes, signature, supported, statistics_cls, cache):
+        """
+        Method stores the signature *cache* compiled for *prototypes*. Caches
+        exceeding *maxsize* on their own are not stored.
+
+        :param prototypes: List of prototypes
+        :param signature: Signature used for compilation
+        :param supported: Dictionary of supported events
+        :param statistics_cls: Class of statistics to use
+        :param cache: Signature cache of prototypes
+        """
+        size = cache.node_count()
+        try:
+            # ensemble caches count the signatures per signature
+            size = sum(size)
+        except TypeError:
+            pass
+        if size > self.maxsize:
+            return
+        key = self.key(prototypes, signature, supported, statistics_cls)
+        self._discard(key)
+        self._entries[key] = (list(prototypes), cache, size)
+        self._size += size
+        while self._size > self.maxsize:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    def cache_info(self):
+        """
+        Method returns the statistics of the cache for tuning its size.
+
+        :return: Hits, misses, evictions, maximum and current size
+        """
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize,
+                         self._size)
+
+    def clear(self):
+        """
+        Method removes all entries and resets the statistics.
+        """
+        self._entries.clear()
+        self._size = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[2]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "%s (%s)" % (self.__class__.__name__, self.cache_info())
+
+
+#: cache used by all algorithms of the current process
+compiled_prototypes = CompiledPrototypeCache()
@@ -6,7 +6,7 @@ calculate distances.
 from itertools import zip_longest
 from typing import List
 
-from assess.algorithms.signatures.signatures import Signature
+from assess.algorithms.signatures.signatures import Signature, SignatureContext
 from assess.algorithms.signatures.ensemblesignaturecache import \
     EnsembleSignatureCache, EnsemblePrototypeSignatureCache
 
@@ -20,6 +20,12 @@ class EnsembleSignatureList(list):
 
 
 class EnsembleSignature(Signature):
+    """
+    The EnsembleSignature evaluates several signatures at once. Intermediate
+    results that are shared by its signatures, i.e. the tokens of the parent,
+    the position of a node, and its preceding siblings, are determined once per
+    node by a :py:class:`SignatureContext` that is handed to all signatures.
+    """
     signature_cache_class = EnsembleSignatureCache
     prototype_signature_cache_class = EnsemblePrototypeSignatureCache
 
@@ -27,10 +33,23 @@ class EnsembleSignature(Signature):
         Signature.__init__(self)
         self._signatures = signatures
         self.count = len(signatures)
+        self._sibling_width = None
 
-    def prepare_signature(self, node, parent):
+    def prototype_signature_cache(self, supported=None, statistics_cls=None):
+        return self.prototype_signature_cache_class(
+            supported=supported,
+            statistics_cls=statistics_cls,
+            cache_classes=[signature.prototype_signature_cache_class for
+                           signature in self._signatures]
+        )
+
+    def prepare_signature(self, node, parent, context=None):
+        if context is None:
+            context = SignatureContext(node, parent, width=self.sibling_width)
+        if not hasattr(node, "signature_id"):
+            node.signature_id = {}
         for signature in self._signatures:
-            signature.prepare_signature(node, parent)
+            signature.prepare_signature(node, parent, context)
 
     def get_signature(self, node, parent):
         """
@@ -42,17 +61,49 @@ class EnsembleSignature(Signature):
         :param parent:
         :return: List of token in signature order
         """
+        signature_ids = getattr(node, "signature_id", None)
+        if signature_ids is None:
+            self.prepare_signature(node, parent)
+            signature_ids = node.signature_id
         result = EnsembleSignatureList()
+        context = None
         for signature in self._signatures:
-            result.append(signature.get_signature(node, parent))
+            signature_id = signature_ids.get(signature)
+            if signature_id is None:
+                if context is None:
+                    context = SignatureContext(
+                        node, parent, width=self.sibling_width)
+                signature.prepare_signature(node, parent, context)
+                signature_id = signature_ids[signature]
+            result.append(signature_id[None])
         return result
 
-    def finish_node(self, node):
+    def finish_node(self, node, context=None):
+        if context is None:
+            context = SignatureContext(node, width=self.sibling_width, finish=True)
         result = EnsembleSignatureList()
         for signature in self._signatures:
-            result.append(signature.finish_node(node))
+            result.append(signature.finish_node(node, context))
         return [EnsembleSignatureList(element) for element in zip_longest(*result)]
 
+    @property
+    def sibling_width(self):
+        if self._sibling_width is None:
+            self._sibling_width = max(
+                signature.sibling_width for signature in self._signatures)
+        return self._sibling_width
+
+    @property
+    def stateless(self):
+        return all(signature.stateless for signature in self._signatures)
+
+    def symbol(self, token):
+        if token is None:
+            return token
+        return EnsembleSignatureList(
+            signature.symbol(element) for signature, element in
+            zip(self._signatures, token))
+
     def __repr__(self):
         return "%s (%s)" % (self.__class__.__name__, ", ".join(
             [repr(signature) for signature in self._signatures]))
@@ -10,6 +10,21 @@ from assess.algorithms.signatures.signaturecache import SignatureCache, \
 from assess.events.events import ProcessStartEvent, ProcessExitEvent, TrafficEvent
 
 
+def _supported_entries(cache, entries):
+    """
+    Function returns the list of *entries* whose event type is supported by
+    *cache*. Skipped entries are logged.
+    """
+    result = []
+    for key, value in entries:
+        if cache.supported.get(key[-1], False):
+            result.append((key, value))
+        else:
+            logging.getLogger(cache.__class__.__name__).warning(
+                "Skipping %s (%s) for event %s" % (key[0], value, key[-1]))
+    return result
+
+
 class EnsembleSignatureCacheList(list):
     def __repr__(self):
         return "%s%s" % (self.__class__.__name__, list.__repr__(self))
@@ -51,6 +66,26 @@ class EnsembleSignatureCache(object):
                 ) for _ in range(len(signature))]
                 self._signature_dicts[index][token, event_type] = value
 
+    def set_many(self, entries):
+        """
+        Method adds the values of several entries by handing the entries of
+        each signature to its cache, see :py:meth:`SignatureCache.set_many`.
+
+        :param entries: Iterable of tuples from key and value as for `[]`
+        """
+        entries = _supported_entries(self, entries)
+        if not entries:
+            return
+        if not self._signature_dicts:
+            self._signature_dicts = [SignatureCache(
+                self.supported, self.statistics_cls
+            ) for _ in range(len(entries[0][0][0]))]
+        for index, cache in enumerate(self._signature_dicts):
+            cache.set_many(
+                ((signature[index], event_type), value)
+                for (signature, event_type), value in entries
+                if index < len(signature) and signature[index] is not None)
+
     def __iter__(self):
         return zip_longest(*self._signature_dicts)
 
@@ -130,9 +165,11 @@ class EnsembleSignatureCache(object):
 class EnsemblePrototypeSignatureCache(object):
     """
     The EnsemblePrototypeSignatureCache holds a list of PrototypeSignatureCaches
-    to enable ensemble methods for distance measurements.
+    to enable ensemble methods for distance measurements. The class of the cache
+    to use per signature can be given by *cache_classes*, it defaults to
+    :py:class:`PrototypeSignatureCache`.
     """
-    def __init__(self, supported=None, statistics_cls=None):
+    def __init__(self, supported=None, statistics_cls=None, cache_classes=None):
         self._prototype_dict = []
         self.supported = supported or {
             ProcessStartEvent: True,
@@ -140,6 +177,7 @@ class EnsemblePrototypeSignatureCache(object):
             TrafficEvent: False
         }
         self.statistics_cls = statistics_cls
+        self._cache_classes = cache_classes
 
     def __iter__(self):
         for prototype_dict in self._prototype_dict:
@@ -155,10 +193,59 @@ class EnsemblePrototypeSignatureCache(object):
             try:
                 self._prototype_dict[index][token, prototype, event_type] = value
             except IndexError:
-                self._prototype_dict = [PrototypeSignatureCache(
-                    self.supported, self.statistics_cls) for _ in range(len(signature))]
+                self._create_caches(len(signature))
                 self._prototype_dict[index][token, prototype, event_type] = value
 
+    def set_many(self, entries):
+        """
+        Method adds the values of several entries by handing the entries of
+        each signature to its cache, see :py:meth:`SignatureCache.set_many`.
+
+        :param entries: Iterable of tuples from key and value as for `[]`
+        """
+        entries = _supported_entries(self, entries)
+        if not entries:
+            return
+        if not self._prototype_dict:
+            self._create_caches(len(entries[0][0][0]))
+        for index, cache in enumerate(self._prototype_dict):
+            cache.set_many(
+                ((signature[index], prototype, event_type), value)
+                for (signature, prototype, event_type), value in entries
+                if index < len(signature))
+
+    def __iadd__(self, other):
+        if type(self) != type(other):
+            return NotImplemented
+        if not self._prototype_dict:
+            self._create_caches(len(other._prototype_dict))
+        if len(self._prototype_dict) != len(other._prototype_dict):
+            return NotImplemented
+        for index, cache in enumerate(other._prototype_dict):
+            self._prototype_dict[index] += cache
+        return self
+
+    def update(self, other, prototypes=None):
+        """
+        Method takes over the entries of the caches of *other* for prototypes
+        that are not part of the caches yet, see
+        :py:meth:`PrototypeSignatureCache.update`.
+
+        :param other: The cache to take the entries from
+        :param prototypes: Mapping from prototypes of other to prototypes
+        :return: Updated cache
+        """
+        if not self._prototype_dict:
+            self._create_caches(len(other._prototype_dict))
+        for index, cache in enumerate(other._prototype_dict):
+            self._prototype_dict[index].update(cache, prototypes=prototypes)
+        return self
+
+    def _create_caches(self, count):
+        cache_classes = self._cache_classes or [PrototypeSignatureCache] * count
+        self._prototype_dict = [cache_class(
+            self.supported, self.statistics_cls) for cache_class in cache_classes]
+
     @classmethod
     def from_prototype_signature_caches(cls, cache_list):
         if cache_list is not None and 0 < len(cache_list):
@@ -0,0 +1,161 @@
+"""
+Module offers hash based variants of the signatures. Instead of strings that
+grow with the depth of a node, tokens are fixed-width 64-bit integers that are
+derived from the hash of the parent token, the name of a node, and the
+additional part of the transition (e.g. the position of a node). Creating a
+token therefore is independent of the depth of a node and caches only need to
+store integers.
+
+As different transitions might result in the same hash, a
+:py:class:`HashCollisionCounter` can be given to count collisions against the
+string representation of the original signatures.
+"""
+import hashlib
+
+from assess.algorithms.signatures.signatures import \
+    ParentChildByNameTopologySignature, ParentChildOrderTopologySignature, \
+    ParentChildOrderByNameTopologySignature, \
+    ParentCountedChildrenByNameTopologySignature, ParentSiblingSignature
+
+
+def hash64(parent_token, name, extra=None):
+    """
+    Method returns a stable 64-bit hash for the transition from *parent_token*
+    given by *name* and *extra*. In contrast to :py:func:`hash` the result does
+    not depend on the interpreter or the process.
+
+    :param parent_token: Token of parent or None
+    :param name: Name of the node
+    :param extra: Additional part identifying the transition
+    :return: Integer in range [0, 2**64)
+    """
+    return int.from_bytes(hashlib.blake2b(("%s|%s|%r" % (
+        parent_token if parent_token is not None else "", name, extra)).encode(
+            'utf-8', errors='surrogateescape'), digest_size=8).digest(), "big")
+
+
+class HashCollisionCounter(object):
+    """
+    The HashCollisionCounter keeps the string representation of each hash that
+    has been created. A collision is counted when a hash is created for a
+    different string representation than the one it was first created for.
+
+    The string representation of a token is built from the string of its parent
+    hash. Collisions are therefore only counted where they occur first, the
+    descendants of colliding nodes share the hash as well as the string
+    representation of their parents.
+    """
+    __slots__ = ("_symbols", "collisions")
+
+    def __init__(self):
+        self._symbols = {}
+        self.collisions = 0
+
+    def add(self, token, parent_token, symbol_function, *args):
+        """
+        Method registers the string representation of *token* that is built by
+        calling *symbol_function* with the string representation of
+        *parent_token* (an empty string if it is None) and *args*.
+
+        :param token: The hash to register
+        :param parent_token: Hash of the parent or None
+        :param symbol_function: Function to create string representation
+        """
+        symbol = symbol_function(
+            self._symbols.get(parent_token, "") if parent_token is not None
+            else "", *args)
+        known_symbol = self._symbols.setdefault(token, symbol)
+        if known_symbol != symbol:
+            self.collisions += 1
+
+    def symbol(self, token):
+        """
+        Returns the string representation given *token* was created for first.
+
+        :param token: Hash
+        :return: String representation
+        """
+        return self._symbols[token]
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def __repr__(self):
+        return "%s (%d/%d)" % (
+            self.__class__.__name__, self.collisions, len(self._symbols))
+
+
+class HashSignature(object):
+    """
+    Mixin that replaces the tokens of a signature by 64-bit hashes. It needs to
+    be placed in front of the signature whose tokens should be hashed.
+
+    :param collisions: Optional :py:class:`HashCollisionCounter` for accounting
+    """
+    def __init__(self, *args, collisions=None, **kwargs):
+        super(HashSignature, self).__init__(*args, **kwargs)
+        self._collisions = collisions
+
+    def _token(self, parent_token, name, extra, symbol_function, *args):
+        token = self._hash(parent_token, name, extra)
+        if self._collisions is not None:
+            self._collisions.add(token, parent_token, symbol_function, *args)
+        return token
+
+    _hash = staticmethod(hash64)
+
+    @property
+    def stateless(self):
+        # collisions are only counted within the current process
+        return self._collisions is None and \
+            super(HashSignature, self).stateless
+
+    def symbol(self, token):
+        """
+        Method returns the string representation of a given token if collisions
+        are accounted, otherwise the token itself.
+
+        :param token: Token to return the string representation for
+        :return: String representation of token
+        """
+        if self._collisions is None or token is None:
+            return token
+        return self._collisions.symbol(token)
+
+    @property
+    def collisions(self):
+        """
+        Number of collisions that have been counted, None if collisions are not
+        accounted.
+
+        :return: Number of collisions
+        """
+        if self._collisions is None:
+            return None
+        return self._collisions.collisions
+
+
+class HashParentChildByNameTopologySignature(
+        HashSignature, ParentChildByNameTopologySignature):
+    pass
+
+
+class HashParentChildOrderTopologySignature(
+        HashSignature, ParentChildOrderTopologySignature):
+    pass
+
+
+class HashParentChildOrderByNameTopologySignature(
+        HashSignature, ParentChildOrderByNameTopologySignature):
+    pass
+
+
+class HashParentCountedChildrenByNameTopologySignature(
+        HashSignature, ParentCountedChildrenByNameTopologySignature):
+    def __init__(self, count=20, collisions=None):
+        HashSignature.__init__(self, count=count, collisions=collisions)
+
+
+class HashParentSiblingSignature(HashSignature, ParentSiblingSignature):
+    def __init__(self, width=20, collisions=None):
+        HashSignature.__init__(self, width=width, collisions=collisions)
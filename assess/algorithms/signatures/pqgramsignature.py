@@ -14,32 +14,63 @@ class PQGramSignature(Signature):
         self._height = height
         self._width = width
 
-    def prepare_signature(self, node, parent):
-        parents = self.parent_generator(node)
-        siblings = self.sibling_generator(node, self._width)
+    @property
+    def sibling_width(self):
+        return self._width
+
+    def prepare_signature(self, node, parent, context=None):
+        siblings = self.sibling_generator(node, self._width, context)
         # Attention: this ordering is different from original pq-grams!
-        algorithm_id = "_".join(str(next(parents)) for _ in range(self._height)) + \
-                       ("_%s_" % node.name) + \
-                       "_".join(str(next(siblings)) for _ in range(self._width))
+        algorithm_id = self.ancestor_part(node.parent(), self._height) + \
+            ("_%s_" % node.name) + \
+            "_".join(str(next(siblings)) for _ in range(self._width))
         self._prepare_signature(node, algorithm_id)
 
-    def finish_node(self, node):
+    def finish_node(self, node, context=None):
         # node is the PARENT of the current hierarchy ^^
         result = []
         if node.children_list():
-            # take the last node to initialize the generators
-            parent_generator = self.parent_generator(node)
-            parents = [node.name] + [next(parent_generator) for _ in
-                                     range(self._height - 1)]
-            siblings = list(self.sibling_finish_generator(node, self._width))
+            prefix = self.ancestor_part(node, max(self._height, 1)) + ("_%s_" % "")
+            siblings = list(self.sibling_finish_generator(
+                node, self._width, context))
             while siblings:
-                algorithm_id = "_".join(parents) + \
-                               ("_%s_" % "") + \
-                               "_".join(siblings)
-                result.append(algorithm_id)
+                result.append(prefix + "_".join(siblings))
                 siblings.pop()
         return result
 
+    @staticmethod
+    def ancestor_part(node, length):
+        """
+        Method returns the names of *node* and its ancestors joined by "_",
+        considering *length* names. Missing ancestors are represented by an
+        empty string. The names are cached at the node and derived from the
+        cached names of its parent, so the parent chain is only walked once.
+
+        :param node: The node to start at
+        :param length: Number of names to consider
+        :return: Joined names
+        """
+        if node is None or length == 0:
+            return "_".join([""] * length)
+        nodes = []
+        names, part = ("",) * length, None
+        while node is not None:
+            try:
+                names, part = node._ancestor_names[length]
+                break
+            except (AttributeError, KeyError):
+                nodes.append(node)
+                node = node.parent()
+        for node in reversed(nodes):
+            names = (str(node.name),) + names[:length - 1]
+            part = "_".join(names)
+            try:
+                ancestor_names = node._ancestor_names
+            except AttributeError:
+                ancestor_names = node._ancestor_names = {}
+            ancestor_names[length] = (names, part)
+        return part
+
     @staticmethod
     def parent_generator(root):
         """
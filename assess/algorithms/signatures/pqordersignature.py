@@ -17,22 +17,26 @@ class PQOrderSignature(Signature):
         Signature.__init__(self)
         self._width = width
 
-    def prepare_signature(self, node, parent):
+    @property
+    def sibling_width(self):
+        return self._width + 1
+
+    def prepare_signature(self, node, parent, context=None):
         ordered_nodes = [node.name] + list(self.sibling_generator(
-            node, self._width + 1))
+            node, self._width + 1, context))
         ordered_nodes.sort()  # ascending order
+        parent_signature = self._parent_signature(parent, context, dimension="p")
         algorithm_id = "%s_%s_%s" % (
             "_".join(ordered_nodes[1:-1]),  # up to width ordered siblings
             ordered_nodes[-1],  # last element as anchor node name
-            zlib.adler32(self.get_signature(parent, None, dimension="p").encode(
+            zlib.adler32(parent_signature.encode(
                 'utf-8', errors='surrogateescape') if parent is not None else b'')
         )
         p_signature = ParentChildByNameTopologySignature.signature_string(
-            node.name, self.get_signature(parent, None, dimension="p")
-            if parent is not None else '')
+            node.name, parent_signature if parent is not None else '')
         self._prepare_signature(node, algorithm_id, p=p_signature)
 
-    def finish_node(self, node):
+    def finish_node(self, node, context=None):
         # node is the PARENT of the current hierarchy :D
         result = []
         p_signature = ParentChildByNameTopologySignature.signature_string(
@@ -41,7 +45,8 @@ class PQOrderSignature(Signature):
         )
         if node.children_list():
             # we need to consider the insertion of empty nodes
-            ordered_nodes = list(self.sibling_finish_generator(node, self._width + 1))
+            ordered_nodes = list(self.sibling_finish_generator(
+                node, self._width + 1, context))
             if ordered_nodes:
                 ordered_nodes.sort()
                 ordered_nodes.pop(0)
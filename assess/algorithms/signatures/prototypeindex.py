@@ -0,0 +1,497 @@
+"""
+Module offers a compiled index of prototypes that is stored in a binary file.
+The file is written once from the signature caches of prototypes and opened via
+:py:mod:`mmap`, so opening an index does not depend on the number of signatures
+and processes opening the same file share its pages.
+
+The file starts with a fixed header followed by sections that are aligned to
+eight bytes. Per signature of an ensemble it contains
+
+* the table of encoded signatures and an open addressing hash table to look
+  them up,
+* the prototypes per signature as compressed sparse rows,
+* the multiplicity per signature, prototype, and event type, as well as
+* the statistics per signature and prototype.
+
+Numbers are stored as 64-bit integers in the byte order of the writing machine.
+Statistics are pickled per signature and only unpickled when they are accessed. The
+remaining metadata, i.e. supported events, statistics class, prototypes, and
+the location of the sections, is pickled at the end of the file.
+"""
+import mmap
+import pickle
+import struct
+import sys
+import zlib
+from array import array
+
+from assess.algorithms.signatures.ensemblesignaturecache import \
+    EnsemblePrototypeSignatureCache
+from assess.exceptions.exceptions import PrototypeIndexFormatException
+
+#: magic bytes, version, byte order, offset and length of metadata
+_HEADER = struct.Struct("<8sHHxxxxQQ")
+_MAGIC = b"ASSESSPI"
+_VERSION = 1
+
+
+def _encode(signature):
+    """
+    Method encodes *signature* to the bytes it is stored and looked up by.
+
+    :param signature: Token of a signature
+    :return: Encoded signature
+    """
+    if isinstance(signature, str):
+        return b"s" + signature.encode("utf-8", errors="surrogateescape")
+    if isinstance(signature, int):
+        return b"i%d" % signature
+    return b"p" + pickle.dumps(signature, protocol=4)
+
+
+def _decode(key):
+    if key[:1] == b"s":
+        return key[1:].decode("utf-8", errors="surrogateescape")
+    if key[:1] == b"i":
+        return int(key[1:])
+    return pickle.loads(key[1:])
+
+
+class IndexedPrototype(object):
+    """
+    Placeholder for a prototype that has been compiled into a
+    :py:class:`PrototypeIndex`. It keeps the name and the number of nodes of the
+    original prototype.
+    """
+    __slots__ = ("name", "index", "_node_count")
+
+    def __init__(self, name, index, node_count=None):
+        self.name = name
+        self.index = index
+        self._node_count = node_count
+
+    def node_count(self):
+        return self._node_count
+
+    def __eq__(self, other):
+        return type(self) == type(other) and self.index == other.index and \
+            self.name == other.name
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.index, self.name))
+
+    def __repr__(self):
+        return "%s (%s)" % (self.__class__.__name__, self.name)
+
+
+class PrototypeIndex(object):
+    """
+    The PrototypeIndex gives access to a prototype index file. Its
+    :py:attr:`caches` offer the interface of the
+    :py:class:`PrototypeSignatureCache` for reading, one cache per signature of
+    an ensemble. Prototypes are represented by :py:class:`IndexedPrototype`.
+
+    An index is written by :py:meth:`write` and can be given as prototypes of
+    a :py:class:`TreeDistanceAlgorithm`. When it is pickled, only its path is
+    stored, so unpickling reopens the file.
+
+    :param path: Path of the index file
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as index_file:
+            try:
+                self._mmap = mmap.mmap(
+                    index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise PrototypeIndexFormatException(path, "file is empty")
+        try:
+            magic, version, little_endian, offset, length = \
+                _HEADER.unpack_from(self._mmap)
+        except struct.error:
+            self._mmap.close()
+            raise PrototypeIndexFormatException(path, "header is truncated")
+        if magic != _MAGIC or version != _VERSION or \
+                bool(little_endian) != (sys.byteorder == "little"):
+            self._mmap.close()
+            raise PrototypeIndexFormatException(
+                path, "unsupported format %r, version %d" % (magic, version))
+        self._view = memoryview(self._mmap)
+        metadata = pickle.loads(self._view[offset:offset + length])
+        self.supported = metadata["supported"]
+        self.statistics_cls = metadata["statistics_cls"]
+        self.prototypes = [IndexedPrototype(name, index, node_count) for
+                           index, (name, node_count) in
+                           enumerate(metadata["prototypes"])]
+        self.caches = [PrototypeIndexCache(self, number, member) for
+                       number, member in enumerate(metadata["members"])]
+
+    @classmethod
+    def write(cls, path, signature_prototypes, prototypes, names=None):
+        """
+        Method writes the signature caches of *prototypes* to an index file at
+        *path*. By default, prototypes are named by their position.
+
+        :param path: Path of the index file
+        :param signature_prototypes: Signature cache of prototypes, e.g.
+            :py:attr:`TreeDistanceAlgorithm.signature_prototypes`
+        :param prototypes: List of prototypes in the cache
+        :param names: Optional list of names for prototypes
+        :return: Written index
+        """
+        if isinstance(signature_prototypes, EnsemblePrototypeSignatureCache):
+            caches = list(signature_prototypes)
+        else:
+            caches = [signature_prototypes]
+        if names is None:
+            names = [str(index) for index in range(len(prototypes))]
+        prototype_ids = {prototype: index for index, prototype in
+                         enumerate(prototypes)}
+        metadata = {
+            "supported": caches[0].supported if caches else {},
+            "statistics_cls": caches[0].statistics_cls if caches else None,
+            "prototypes": [],
+            "members": []
+        }
+        for name, prototype in zip(names, prototypes):
+            try:
+                node_count = prototype.node_count()
+            except AttributeError:
+                node_count = None
+            metadata["prototypes"].append((name, node_count))
+        with open(path, "wb") as index_file:
+            index_file.write(b"\0" * _HEADER.size)
+            for cache in caches:
+                metadata["members"].append(cls._write_cache(
+                    index_file, cache, prototype_ids))
+            offset = index_file.tell()
+            index_file.write(pickle.dumps(metadata, protocol=4))
+            length = index_file.tell() - offset
+            index_file.seek(0)
+            index_file.write(_HEADER.pack(
+                _MAGIC, _VERSION, sys.byteorder == "little", offset, length))
+        return cls(path)
+
+    @staticmethod
+    def _write_cache(index_file, cache, prototype_ids):
+        """
+        Method writes the sections of a single *cache* and returns the metadata
+        to find them.
+        """
+        keys = bytearray()
+        key_offsets = array("q", [0])
+        indptr = array("q", [0])
+        columns = array("q")
+        values_data = bytearray()
+        value_offsets = array("q", [0])
+        event_types = list(cache.support_keys())
+        entry_counts = []
+        for signature in cache:
+            keys += _encode(signature)
+            key_offsets.append(len(keys))
+            row_values = []
+            for column, values in sorted(
+                    ((prototype_ids[prototype], values) for prototype, values in
+                     cache.get(signature).items()), key=lambda item: item[0]):
+                columns.append(column)
+                row_values.append(values)
+                counts = _value_counts(values)
+                for event_type in counts:
+                    if event_type not in event_types:
+                        event_types.append(event_type)
+                entry_counts.append(counts)
+            indptr.append(len(columns))
+            # statistics of a row share the references to their classes
+            values_data += pickle.dumps(row_values, protocol=4)
+            value_offsets.append(len(values_data))
+        counts = array("q", [0]) * (len(event_types) * len(columns))
+        multiplicities = array("q", [0]) * (len(event_types) * len(prototype_ids))
+        for event_index, event_type in enumerate(event_types):
+            for entry, entry_count in enumerate(entry_counts):
+                count = entry_count.get(event_type, 0)
+                counts[event_index * len(columns) + entry] = count
+                multiplicities[
+                    event_index * len(prototype_ids) + columns[entry]] += count
+        node_counts = array("q", [0]) * len(prototype_ids)
+        for column in columns:
+            node_counts[column] += 1
+        capacity = 8
+        while capacity < 2 * len(key_offsets):
+            capacity *= 2
+        table = array("q", [-1]) * capacity
+        for row in range(len(key_offsets) - 1):
+            slot = zlib.crc32(keys[key_offsets[row]:key_offsets[row + 1]]) & \
+                (capacity - 1)
+            while table[slot] >= 0:
+                slot = (slot + 1) & (capacity - 1)
+            table[slot] = row
+
+        sections = {}
+        for name, data in [("keys", keys), ("key_offsets", key_offsets),
+                           ("table", table), ("indptr", indptr),
+                           ("columns", columns), ("counts", counts),
+                           ("multiplicities", multiplicities),
+                           ("node_counts", node_counts),
+                           ("value_offsets", value_offsets),
+                           ("values", values_data)]:
+            index_file.write(b"\0" * (-index_file.tell() % 8))
+            data = bytes(data) if isinstance(data, bytearray) else data.tobytes()
+            sections[name] = (index_file.tell(), len(data))
+            index_file.write(data)
+        return {
+            "signature_cache_count": cache.signature_cache_count,
+            "event_types": event_types,
+            "sections": sections
+        }
+
+    def close(self):
+        """
+        Method releases the mapping of the file. Caches of the index must not be
+        used afterwards.
+        """
+        for cache in self.caches:
+            cache._release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __reduce__(self):
+        return self.__class__, (self.path,)
+
+    def __repr__(self):
+        return "%s (%s, prototypes=%d, signatures=%d)" % (
+            self.__class__.__name__, self.path, len(self.prototypes),
+            len(self.caches))
+
+
+def _index_cache(path, member):
+    return PrototypeIndex(path).caches[member]
+
+
+class PrototypeIndexCache(object):
+    """
+    The PrototypeIndexCache offers read access to a single signature of a
+    :py:class:`PrototypeIndex` with the interface of the
+    :py:class:`PrototypeSignatureCache`. Statistics of a signature are unpickled
+    on first access and kept afterwards.
+    """
+    def __init__(self, index, number, member):
+        self._index = index
+        self._number = number
+        self.supported = index.supported
+        self.statistics_cls = index.statistics_cls
+        self.signature_cache_count = member["signature_cache_count"]
+        self._keys = None
+        self._event_types = member["event_types"]
+        self._event_ids = {event_type: event_index for event_index, event_type in
+                           enumerate(self._event_types)}
+        self._prototypes = index.prototypes
+        self._prototype_ids = {prototype: prototype.index for prototype in
+                               self._prototypes}
+        self._signature_values = {}
+        sections = {}
+        for name, (offset, length) in member["sections"].items():
+            sections[name] = index._view[offset:offset + length]
+        self._signatures = sections.pop("keys")
+        self._values = sections.pop("values")
+        self._key_offsets = sections["key_offsets"].cast("q")
+        self._table = sections["table"].cast("q")
+        self._indptr = sections["indptr"].cast("q")
+        self._columns = sections["columns"].cast("q")
+        self._counts = sections["counts"].cast("q")
+        self._multiplicity_table = sections["multiplicities"].cast("q")
+        self._node_counts = sections["node_counts"].cast("q")
+        self._value_offsets = sections["value_offsets"].cast("q")
+        self._multiplicities = self._sum_multiplicities()
+
+    def __getitem__(self, item):
+        try:
+            return self._signature_values[item]
+        except KeyError:
+            pass
+        row = self._row(item)
+        if row is None:
+            return {}
+        row_values = pickle.loads(
+            self._values[self._value_offsets[row]:self._value_offsets[row + 1]])
+        result = self._signature_values[item] = {
+            self._prototypes[self._columns[entry]]: values for entry, values in
+            zip(range(self._indptr[row], self._indptr[row + 1]), row_values)}
+        return result
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield _decode(bytes(self._signatures[
+                self._key_offsets[row]:self._key_offsets[row + 1]]))
+
+    def __contains__(self, item):
+        return self._row(item) is not None
+
+    def __len__(self):
+        return len(self._key_offsets) - 1
+
+    def support_keys(self):
+        if self._keys is None:
+            self._keys = []
+            for key, value in self.supported.items():
+                if value:
+                    self._keys.append(key)
+        return self._keys
+
+    def get(self, signature):
+        """
+        Returns a dictionary of prototypes with their statistics for a given
+        signature. If the signature does not exist, an empty dictionary is returned.
+
+        :param signature: Signature to return the statistics for
+        :return: Dictionary of prototypes with statistics as value
+        """
+        return self[signature]
+
+    def get_statistics(self, signature, key, event_type, prototype):
+        return self[signature].get(
+            prototype, {}).get(
+            event_type, {}).get(
+            key, self.statistics_cls())
+
+    def node_count(self, prototype=None):
+        """
+        Returns the number of signatures stored for a given prototype.
+
+        :param prototype: Prototype to get the number of signatures for
+        :return: Number of signature for prototype
+        """
+        if prototype is None:
+            return len(self)
+        column = self._prototype_ids.get(prototype)
+        if column is None:
+            return 0
+        return self._node_counts[column]
+
+    def multiplicity(self, signature=None, prototype=None, event_type=None,
+                     by_event=False):
+        """
+        Returns the frequency of added objects. If no prototype is given, it
+        considers the frequency of all elements. Otherwise only the frequency
+        per prototype is given. This can further be detailed by specifying
+        signature or event_type.
+
+        :param signature: Signature to determine frequency from
+        :param prototype: Prototype to determine frequency from
+        :param event_type: Event_type to determine frequency from
+        :return: Frequency of signatures
+        """
+        if prototype is not None:
+            column = self._prototype_ids.get(prototype)
+            if by_event and event_type is None:
+                return {event_key: self._prototype_multiplicity(column, event_key)
+                        for event_key in self.support_keys()}
+            if signature is None:
+                return sum(self._prototype_multiplicity(column, event_key) for
+                           event_key in self._event_keys(event_type))
+            entries = [entry for entry in self._row_entries(signature)
+                       if self._columns[entry] == column]
+        else:
+            if by_event and event_type is None:
+                raise NotImplementedError
+            if signature is None:
+                return sum(self._multiplicities.get(event_key, 0) for
+                           event_key in self._event_keys(event_type))
+            entries = self._row_entries(signature)
+        return sum(self._entry_count(entry, event_key) for entry in entries
+                   for event_key in self._event_keys(event_type))
+
+    def internal(self):
+        """
+        Method returns a nested dictionary representation of the cache as it is
+        used by :py:class:`PrototypeSignatureCache`.
+
+        :return: Dict of signatures
+        """
+        return {signature: self[signature] for signature in self}
+
+    def _row(self, signature):
+        """
+        Returns the row of *signature* by looking it up in the hash table.
+
+        :return: Row of signature or None if it does not exist
+        """
+        key = _encode(signature)
+        mask = len(self._table) - 1
+        slot = zlib.crc32(key) & mask
+        while True:
+            row = self._table[slot]
+            if row < 0:
+                return None
+            if self._signatures[
+                    self._key_offsets[row]:self._key_offsets[row + 1]] == key:
+                return row
+            slot = (slot + 1) & mask
+
+    def _row_entries(self, signature):
+        row = self._row(signature)
+        if row is None:
+            return range(0)
+        return range(self._indptr[row], self._indptr[row + 1])
+
+    def _event_keys(self, event_type):
+        if event_type is None:
+            return self.support_keys()
+        return event_type,
+
+    def _entry_count(self, entry, event_type):
+        event_index = self._event_ids.get(event_type)
+        if event_index is None:
+            return 0
+        return self._counts[event_index * len(self._columns) + entry]
+
+    def _prototype_multiplicity(self, column, event_type):
+        event_index = self._event_ids.get(event_type)
+        if column is None or event_index is None:
+            return 0
+        return self._multiplicity_table[
+            event_index * len(self._prototypes) + column]
+
+    def _sum_multiplicities(self):
+        return {event_type: sum(self._prototype_multiplicity(column, event_type)
+                                for column in range(len(self._prototypes)))
+                for event_type in self._event_types}
+
+    def _release(self):
+        for name in ["_signatures", "_values", "_key_offsets", "_table",
+                     "_indptr", "_columns", "_counts", "_multiplicity_table",
+                     "_node_counts", "_value_offsets"]:
+            getattr(self, name).release()
+            setattr(self, name, None)
+
+    def __reduce__(self):
+        return _index_cache, (self._index.path, self._number)
+
+    def __repr__(self):
+        return "%s (signatures=%d, prototypes=%d, entries=%d)" % (
+            self.__class__.__name__, len(self), len(self._prototypes),
+            len(self._columns))
+
+
+def _value_counts(values):
+    """
+    Method returns the multiplicity per event type of the statistics *values*
+    of a signature and prototype, as done by
+    :py:meth:`PrototypeSignatureCache._recount`.
+    """
+    result = {}
+    for event_type, statistics in (values or {}).items():
+        try:
+            result[event_type] = statistics["value"].count()
+        except (KeyError, TypeError):
+            # e.g. probability of signature
+            continue
+    return result
@@ -8,13 +8,34 @@ from assess.algorithms.statistics.splittedstatistics import SplittedStatistics
 from assess.events.events import ProcessStartEvent, ProcessExitEvent, TrafficEvent
 
 
+def group_values(entries):
+    """
+    Function groups the values of *entries* by their key and the key of the
+    value while keeping the order of appearance of keys and values.
+
+    :param entries: Iterable of tuples from key and dictionary of values
+    :return: Dictionary of key to dictionary of value key to list of values
+    """
+    grouped = {}
+    for key, value in entries:
+        current = grouped.setdefault(key, {})
+        for item in value:
+            current.setdefault(item, []).append(value[item])
+    return grouped
+
+
 class SignatureCache(object):
     """
     The SignatureCache takes care of managing statistics for based on the signature.
     Different statistics, e.g. MeanVariance can be supported.
+
+    The overall multiplicity per event type is maintained while values are added,
+    so requesting the multiplicity of the whole cache does not depend on the
+    number of signatures stored.
     """
     def __init__(self, supported=None, statistics_cls=None):
         self._prototype_dict = {}
+        self._multiplicities = {}
         self.supported = supported or {
             ProcessStartEvent: True,
             ProcessExitEvent: False,
@@ -33,6 +54,32 @@ class SignatureCache(object):
             event_type, {})
         for key in value:
             current_value.setdefault(key, self.statistics_cls()).add(value[key])
+            if key == "value":
+                self._multiplicities[event_type] = \
+                    self._multiplicities.get(event_type, 0) + 1
+
+    def set_many(self, entries):
+        """
+        Method adds the values of several entries. It gives the same result as
+        setting the entries one after another, but values are grouped per
+        statistics and added at once.
+
+        :param entries: Iterable of tuples from key and value as for `[]`
+        """
+        for key, values in group_values(entries).items():
+            signature, event_type = key
+            if not self.supported.get(event_type, False):
+                logging.getLogger(self.__class__.__name__).warning(
+                    "Skipping %s (%s) for event %s" % (signature, values, event_type))
+                continue
+            current_value = self._prototype_dict.setdefault(
+                signature, {}).setdefault(event_type, {})
+            for item, item_values in values.items():
+                current_value.setdefault(item, self.statistics_cls()).add_many(
+                    item_values)
+                if item == "value":
+                    self._multiplicities[event_type] = \
+                        self._multiplicities.get(event_type, 0) + len(item_values)
 
     def __getitem__(self, item):
         return self._prototype_dict.get(item, None)
@@ -77,6 +124,12 @@ class SignatureCache(object):
         """
         return len(self._prototype_dict.keys())
 
+    def _count_for_multiplicities(self, multiplicities, event_type):
+        if event_type is None:
+            return sum(multiplicities.get(support_key, 0)
+                       for support_key in self.support_keys())
+        return multiplicities.get(event_type, 0)
+
     def _count_for_statistics(self, statistics, event_type):
         result = 0
         if event_type is None:
@@ -100,17 +153,13 @@ class SignatureCache(object):
         if by_event and event_type is None:
             result = {}
             for event_key in self.support_keys():
-                current_result = 0
-                for statistics in self._prototype_dict.values():
-                    current_result += self._count_for_statistics(statistics, event_key)
-                result[event_key] = current_result
+                result[event_key] = self._multiplicities.get(event_key, 0)
         else:
-            result = 0
             if signature is None:
-                for statistics in self._prototype_dict.values():
-                    result += self._count_for_statistics(statistics, event_type)
+                result = self._count_for_multiplicities(
+                    self._multiplicities, event_type)
             else:
-                result += self._count_for_statistics(
+                result = self._count_for_statistics(
                     self._prototype_dict.get(signature, {}), event_type)
         return result
 
@@ -128,11 +177,16 @@ class PrototypeSignatureCache(SignatureCache):
     The PrototypeSignatureCache offers a specialised SignatureCache for Prototypes.
     It does not only do a count on signatures but also introduces a MeanVariance
     statistic on a given value for signatures.
+
+    Next to the overall multiplicity, the multiplicity per prototype and event
+    type as well as the number of signatures per prototype are maintained.
     """
     def __init__(self, supported=None, statistics_cls=None):
         self.signature_cache_count = 1
         SignatureCache.__init__(
             self, supported=supported, statistics_cls=statistics_cls)
+        self._prototype_multiplicities = {}
+        self._prototype_node_counts = {}
 
     def __setitem__(self, key, value):
         signature, prototype, event_type = key
@@ -142,11 +196,35 @@ class PrototypeSignatureCache(SignatureCache):
             return
         if signature is not None:
             prototype_dictionary = self._prototype_dict.setdefault(signature, dict())
+            if prototype not in prototype_dictionary:
+                self._count_node(prototype)
             current_value = prototype_dictionary.setdefault(prototype, {}).setdefault(
                 event_type, {})
             for item in value:
                 current_value.setdefault(item, self.statistics_cls()).add(
                     value=value[item])
+                if item == "value":
+                    self._count_added(prototype, event_type, 1)
+
+    def set_many(self, entries):
+        for key, values in group_values(entries).items():
+            signature, prototype, event_type = key
+            if not self.supported.get(event_type, False):
+                logging.getLogger(self.__class__.__name__).warning(
+                    "Skipping %s (%s) for event %s" % (signature, values, event_type))
+                continue
+            if signature is None:
+                continue
+            prototype_dictionary = self._prototype_dict.setdefault(signature, dict())
+            if prototype not in prototype_dictionary:
+                self._count_node(prototype)
+            current_value = prototype_dictionary.setdefault(prototype, {}).setdefault(
+                event_type, {})
+            for item, item_values in values.items():
+                current_value.setdefault(item, self.statistics_cls()).add_many(
+                    item_values)
+                if item == "value":
+                    self._count_added(prototype, event_type, len(item_values))
 
     def __iadd__(self, other):
         if type(self) != type(other):
@@ -163,6 +241,8 @@ class PrototypeSignatureCache(SignatureCache):
                         "skipping signature %s for prototype %s "
                         "because it already exists" % (signature, prototype))
                     continue
+                if prototype not in self._prototype_dict.get(signature, {}):
+                    self._count_node(prototype)
                 for event_type, statistics in values.items():
                     try:
                         for stat_key, statistic in statistics.items():
@@ -172,6 +252,9 @@ class PrototypeSignatureCache(SignatureCache):
                                 event_type, {}).setdefault(
                                 stat_key, self.statistics_cls())
                             current += statistic
+                            if stat_key == "value":
+                                self._count_added(
+                                    prototype, event_type, statistic.count())
                     except AttributeError:
                         current = self._prototype_dict.setdefault(
                             signature, {}).setdefault(
@@ -179,6 +262,37 @@ class PrototypeSignatureCache(SignatureCache):
                         current[event_type] = statistics
         return self
 
+    def update(self, other, prototypes=None):
+        """
+        Method takes over the entries of *other* for prototypes that are not part
+        of the cache yet. In contrast to `+=` the statistics are not merged but
+        taken over as they are, so *other* must not be used afterwards.
+        Prototypes of *other* can be replaced by the mapping *prototypes*.
+
+        :param other: The cache to take the entries from
+        :param prototypes: Mapping from prototypes of other to prototypes
+        :return: Updated cache
+        """
+        for signature in other:
+            for prototype, values in other[signature].items():
+                if prototypes is not None:
+                    prototype = prototypes[prototype]
+                prototype_dictionary = self._prototype_dict.setdefault(signature, {})
+                if prototype in prototype_dictionary:
+                    logging.getLogger(self.__class__.__name__).warning(
+                        "skipping signature %s for prototype %s "
+                        "because it already exists" % (signature, prototype))
+                    continue
+                prototype_dictionary[prototype] = values
+                self._count_node(prototype)
+                for event_type, statistics in values.items():
+                    try:
+                        count = statistics["value"].count()
+                    except (KeyError, TypeError):
+                        continue
+                    self._count_added(prototype, event_type, count)
+        return self
+
     @classmethod
     def from_signature_caches(cls, signature_caches, prototype=None, threshold=.1):
         """
@@ -224,6 +338,7 @@ class PrototypeSignatureCache(SignatureCache):
                             statistic_list[0].mean(
                                 statistic_list, length=len(signature_caches))
                 current_value["probability"] = probability
+        result._recount()
         return result
 
     @classmethod
@@ -248,6 +363,36 @@ class PrototypeSignatureCache(SignatureCache):
                 signature_cache[element["name"], cluster, object] = None
         return signature_cache
 
+    def _count_added(self, prototype, event_type, count):
+        self._multiplicities[event_type] = \
+            self._multiplicities.get(event_type, 0) + count
+        multiplicities = self._prototype_multiplicities.setdefault(prototype, {})
+        multiplicities[event_type] = multiplicities.get(event_type, 0) + count
+
+    def _count_node(self, prototype):
+        self._prototype_node_counts[prototype] = \
+            self._prototype_node_counts.get(prototype, 0) + 1
+
+    def _recount(self):
+        """
+        Rebuilds the maintained multiplicities and numbers of signatures from
+        the internal representation.
+        """
+        self._multiplicities = {}
+        self._prototype_multiplicities = {}
+        self._prototype_node_counts = {}
+        for prototype_dict in self._prototype_dict.values():
+            for prototype, values in prototype_dict.items():
+                self._count_node(prototype)
+                for event_type, statistics in values.items():
+                    try:
+                        count = statistics["value"].count()
+                    except (KeyError, TypeError, AttributeError):
+                        # e.g. probability of signature or statistics that
+                        # could not be averaged
+                        continue
+                    self._count_added(prototype, event_type, count)
+
     def add_signature(self, signature, prototype=None, value=None):
         """
         Add a signature and its current value for a given prototype.
@@ -267,7 +412,7 @@ class PrototypeSignatureCache(SignatureCache):
         """
         if prototype is None:
             return len(self._prototype_dict)
-        return sum([1 for value in self._prototype_dict.values() if prototype in value])
+        return self._prototype_node_counts.get(prototype, 0)
 
     def __getitem__(self, item):
         return self._prototype_dict.get(item, dict())
@@ -304,19 +449,14 @@ class PrototypeSignatureCache(SignatureCache):
         """
         result = 0
         if prototype is not None:
+            multiplicities = self._prototype_multiplicities.get(prototype, {})
             if by_event and event_type is None:
                 result = {}
                 for event_key in self.support_keys():
-                    current_result = 0
-                    for signatures in self._prototype_dict.values():
-                        current_result += self._count_for_statistics(
-                            signatures.get(prototype, {}), event_key)
-                    result[event_key] = current_result
+                    result[event_key] = multiplicities.get(event_key, 0)
             else:
                 if signature is None:
-                    for signatures in self._prototype_dict.values():
-                        result += self._count_for_statistics(
-                            signatures.get(prototype, {}), event_type)
+                    result = self._count_for_multiplicities(multiplicities, event_type)
                 else:
                     current_dict = self._prototype_dict.get(signature, {})
                     result += self._count_for_statistics(
@@ -325,9 +465,8 @@ class PrototypeSignatureCache(SignatureCache):
             if by_event and event_type is None:
                 raise NotImplementedError
             if signature is None:
-                for prototype_dict in self._prototype_dict.values():
-                    for statistics in prototype_dict.values():
-                        result += self._count_for_statistics(statistics, event_type)
+                result = self._count_for_multiplicities(
+                    self._multiplicities, event_type)
             else:
                 current_dict = self._prototype_dict.get(signature, {})
                 for statistics in current_dict.values():
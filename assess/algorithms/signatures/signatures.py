@@ -3,22 +3,130 @@ Module supports different signature implementations that can be used to compress
 trees based on different characteristics of workflows.
 """
 import zlib
+from collections import deque
 
 from assess.algorithms.signatures.signaturecache import SignatureCache, \
     PrototypeSignatureCache
 
 
+class SiblingWindow(object):
+    """
+    Rolling window of the names of the last children of a node. The names of
+    the last *width* children as well as the names of the last *width* children
+    that are no attributes are kept. The window covers the first
+    :py:attr:`position` children of the node.
+
+    :param width: Number of names to keep
+    """
+    __slots__ = ("position", "names", "siblings")
+
+    def __init__(self, width):
+        self.position = 0
+        self.names = deque(maxlen=width)
+        self.siblings = deque(maxlen=width)
+
+    def add(self, node):
+        self.names.append(node.name)
+        if not hasattr(node, "attribute"):
+            self.siblings.append(node.name)
+
+
+class SignatureContext(object):
+    """
+    The SignatureContext holds intermediate results that are shared by several
+    signatures, e.g. within an :py:class:`EnsembleSignature`, while preparing the
+    signatures of a single *node* or finishing it. The position of the node,
+    the tokens of its parent, and its preceding siblings are only determined
+    once for the largest *width* that is required. Signatures requiring fewer
+    siblings get a slice of those.
+
+    :param node: The node to prepare or finish
+    :param parent: The parent given to prepare the node
+    :param width: Maximum number of siblings required by the signatures
+    :param finish: True if the children of node are finished
+    """
+    __slots__ = ("node", "parent", "width", "finish", "position", "_window",
+                 "_names", "_siblings", "parent_signatures")
+
+    def __init__(self, node, parent=None, width=0, finish=False):
+        self.node = node
+        self.parent = parent
+        self.width = width
+        self.finish = finish
+        self.position = node.node_number()
+        self.parent_signatures = getattr(parent, "signature_id", None)
+        self._window = self
+        self._names = None
+        self._siblings = None
+
+    def names(self, width):
+        """
+        Returns the names of up to *width* preceding siblings in order, including
+        attributes. None is returned if the names are not available.
+
+        :param width: Number of names
+        :return: Tuple of names or None
+        """
+        if width > self.width:
+            return None
+        names = self._names
+        if names is None:
+            window = self._sibling_window()
+            if window is None:
+                return None
+            names = self._names = tuple(str(name) for name in window.names)
+        return names[len(names) - width:] if len(names) > width else names
+
+    def siblings(self, width):
+        """
+        Returns the names of *width* siblings as they are generated by
+        :py:meth:`Signature.sibling_generator`, or by
+        :py:meth:`Signature.sibling_finish_generator` if the context finishes the
+        node. None is returned if the siblings are not available.
+
+        :param width: Number of siblings
+        :return: Tuple of names or None
+        """
+        if width > self.width:
+            return None
+        siblings = self._siblings
+        if siblings is None:
+            window = self._sibling_window()
+            if window is None:
+                return None
+            siblings = self._siblings = tuple(Signature._window_generator(
+                window, self.width, finish=self.finish))
+        return siblings[:width]
+
+    def _sibling_window(self):
+        if self._window is self:
+            if self.finish:
+                self._window = Signature.sibling_window(
+                    self.node, self.node.child_count(), self.width)
+            else:
+                parent = self.node.parent()
+                self._window = Signature.sibling_window(
+                    parent, self.position, self.width) if parent else None
+        return self._window
+
+
 class Signature(object):
     """
     Signatures are a concept to create IDs based on processes inside the trees.
     By using signatures, similar nodes might be grouped for example. This improves
     the compression factor but might decrease the precision of the algorithm.
+
+    Signatures supporting a *symbol_table* create integer tokens instead of
+    strings. The transitions from parent to child tokens are memoized by the
+    :py:class:`SymbolTable`, so the string representation is only built once
+    per transition and can be looked up via :py:meth:`symbol`.
     """
     signature_cache_class = SignatureCache
     prototype_signature_cache_class = PrototypeSignatureCache
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, symbol_table=None, **kwargs):
         self.count = 1
+        self._symbol_table = symbol_table
 
     def __new__(cls, *args, **kwargs):
         for arg in args:
@@ -35,12 +143,26 @@ class Signature(object):
             #     return ParentCountedChildrenByNameTopologySignature()
         return super(Signature, cls).__new__(cls)
 
-    def prepare_signature(self, node, parent):
+    def prototype_signature_cache(self, supported=None, statistics_cls=None):
+        """
+        Method creates a new and empty cache to store the signatures of
+        prototypes. The class of the cache is defined by
+        *prototype_signature_cache_class*.
+
+        :param supported: Dictionary of supported events
+        :param statistics_cls: Class of statistics to use
+        :return: Prototype signature cache
+        """
+        return self.prototype_signature_cache_class(
+            supported=supported, statistics_cls=statistics_cls)
+
+    def prepare_signature(self, node, parent, context=None):
         """
         Methods takes a node and prepares its signature. The signature is directly
         attached to the node.
         :param node: The node whose signature needs to be calculated.
         :param parent: Parent of the node
+        :param context: Intermediate results shared with other signatures
         """
         self._prepare_signature(node, node.name)
 
@@ -67,29 +189,158 @@ class Signature(object):
             self.prepare_signature(node, parent)
             return node.signature_id[self][dimension]
 
-    def finish_node(self, node):
+    def finish_node(self, node, context=None):
         return []
 
-    def sibling_generator(self, node, width):
+    @property
+    def sibling_width(self):
+        """
+        Number of preceding siblings of a node that need to be known to create
+        its signature or the signatures when finishing its parent.
+
+        :return: Number of siblings
+        """
+        return 0
+
+    @property
+    def stateless(self):
+        """
+        True if tokens only depend on the nodes they are created for. Tokens of
+        a stateless signature can therefore be created in several processes,
+        while tokens of a symbol table depend on the order they are created in.
+
+        :return: If signature is stateless
+        """
+        return self._symbol_table is None
+
+    def symbol(self, token):
+        """
+        Method returns the string representation of a given token.
+
+        :param token: Token to return the string representation for
+        :return: String representation of token
+        """
+        if self._symbol_table is None or token is None:
+            return token
+        return self._symbol_table.symbol(token)
+
+    def _token(self, parent_token, name, extra, symbol_function, *args):
+        """
+        Method returns the token for a node given the token of its parent. The
+        string representation is built by *symbol_function* that is called with
+        the string representation of the parent and *args*. If a symbol table is
+        used, the transition given by *parent_token*, *name*, and *extra* is
+        resolved to an integer token instead.
+
+        :param parent_token: Token of parent or None
+        :param name: Name of the node
+        :param extra: Additional part identifying the transition
+        :param symbol_function: Function to create string representation
+        :return: Token
+        """
+        if self._symbol_table is None:
+            return symbol_function(
+                parent_token if parent_token is not None else "", *args)
+        return self._symbol_table.token(
+            parent_token, name, extra, symbol_function, *args)
+
+    def _parent_signature(self, parent, context=None, dimension=None):
+        """
+        Method returns the token of *parent*, or None if there is no parent.
+
+        :param parent: The parent to return the token for
+        :param context: Intermediate results shared with other signatures
+        :param dimension: Special dimension of signature if existent
+        :return: Token of parent
+        """
+        if parent is None:
+            return None
+        if context is not None and context.parent_signatures is not None:
+            try:
+                return context.parent_signatures[self][dimension]
+            except KeyError:
+                pass
+        return self.get_signature(parent, None, dimension)
+
+    def sibling_generator(self, node, width, context=None):
         """
         Generator returns names of left siblings in order. When no more siblings
         to the left can be found, an empty string is returned.
 
         :param node: The node to start at
         :param width: number of siblings to return
+        :param context: Intermediate results shared with other signatures
         :return: Sibling names
         :rtype: generator
         """
         if hasattr(node, "attribute"):
             return self._sibling_generator(None, 0, width)
         else:
-            position = node.node_number()
+            position = node.node_number() if context is None else \
+                context.position
             parent = node.parent()
+            if parent and width > 0:
+                if context is not None:
+                    siblings = context.siblings(width)
+                    if siblings is not None:
+                        return iter(siblings)
+                window = self.sibling_window(parent, position, width)
+                if window is not None:
+                    return self._window_generator(window, width)
             return self._sibling_generator(parent, position, width)
 
-    def sibling_finish_generator(self, parent, width):
+    def sibling_finish_generator(self, parent, width, context=None):
+        if parent and width > 0:
+            if context is not None:
+                siblings = context.siblings(width)
+                if siblings is not None:
+                    return iter(siblings)
+            window = self.sibling_window(parent, parent.child_count(), width)
+            if window is not None:
+                return self._window_generator(window, width, finish=True)
         return self._sibling_generator(parent, None, width)
 
+    @staticmethod
+    def sibling_window(parent, position, width):
+        """
+        Method returns the :py:class:`SiblingWindow` of *width* for the first
+        *position* children of *parent*. The window is kept at the parent and
+        rolled forward with each request, so requesting children in order only
+        considers the children that have been added in between. If the window
+        already covers further children, None is returned.
+
+        :param parent: The parent whose children are considered
+        :param position: Number of children to cover
+        :param width: Number of names within the window
+        :return: Sibling window or None
+        """
+        try:
+            windows = parent._sibling_windows
+        except AttributeError:
+            windows = parent._sibling_windows = {}
+        try:
+            window = windows[width]
+        except KeyError:
+            window = windows[width] = SiblingWindow(width)
+        if window.position > position:
+            return None
+        if window.position < position:
+            for node in parent.children_list()[window.position:position]:
+                window.add(node)
+            window.position = position
+        return window
+
+    @staticmethod
+    def _window_generator(window, width, finish=False):
+        siblings = window.siblings
+        if finish and not siblings:
+            # handle special case that children are attributes only
+            return
+        for name in reversed(siblings):
+            yield name
+        for _ in range(width - len(siblings)):
+            yield ''
+
     @staticmethod
     def _sibling_generator(parent, position, width):
         returned_nodes = 0
@@ -129,13 +380,16 @@ class ParentChildByNameTopologySignature(Signature):
 
     Attention: The signature does not take care on the ordering of nodes.
     """
-    def prepare_signature(self, node, parent):
-        algorithm_id = self.__class__.signature_string(
-            node.name,
-            self.get_signature(parent, None) if parent is not None else ''
-        )
+    def prepare_signature(self, node, parent, context=None):
+        algorithm_id = self._token(
+            self._parent_signature(parent, context),
+            node.name, None, self.name_symbol, node.name)
         self._prepare_signature(node, algorithm_id)
 
+    @classmethod
+    def name_symbol(cls, parent_signature, node_name):
+        return cls.signature_string(node_name, parent_signature)
+
     @staticmethod
     def signature_string(node_name, parent_signature):
         """
@@ -157,19 +411,22 @@ class ParentChildOrderTopologySignature(Signature):
     You cannot expect any compression from this signature except the skipping
     of attributes and their values.
     """
-    def prepare_signature(self, node, parent):
-        parent_signature = self.get_signature(parent, None) \
-            if parent is not None else None
-        algorithm_id = "%s.%d_%s" % (
-            self._first_part_algorithm_id(parent_signature
-                                          if parent_signature is not None else ""),
-            node.node_number(),
-            zlib.adler32(parent_signature.encode(
-                'utf-8', errors='surrogateescape')
-                if parent_signature is not None else b"")
-        )
+    def prepare_signature(self, node, parent, context=None):
+        parent_signature = self._parent_signature(parent, context)
+        position = context.position if context is not None else node.node_number()
+        algorithm_id = self._token(
+            parent_signature, None, ("order", position), self._order_symbol,
+            position)
         self._prepare_signature(node, algorithm_id)
 
+    @classmethod
+    def _order_symbol(cls, parent_signature, position):
+        return "%s.%d_%s" % (
+            cls._first_part_algorithm_id(parent_signature),
+            position,
+            zlib.adler32(parent_signature.encode('utf-8', errors='surrogateescape'))
+        )
+
     @staticmethod
     def _first_part_algorithm_id(algorithm_id):
         return algorithm_id.split("_")[0]
@@ -181,8 +438,12 @@ class ParentChildOrderByNameTopologySignature(ParentChildOrderTopologySignature)
     with the same name after each other, they get the same resulting signature.
     If they appear again after another process it differs.
     """
-    def prepare_signature(self, node, parent):
-        count = node.node_number()
+    @property
+    def sibling_width(self):
+        return 1
+
+    def prepare_signature(self, node, parent, context=None):
+        count = context.position if context is not None else node.node_number()
         if count > 0:
             previous_node = parent.children_list()[count - 1]
             grouped_count = previous_node.group_position \
@@ -191,18 +452,20 @@ class ParentChildOrderByNameTopologySignature(ParentChildOrderTopologySignature)
             grouped_count = 0
         node.group_position = grouped_count
 
-        parent_signature = self.get_signature(parent, None) \
-            if parent is not None else None
-        algorithm_id = "%s.%d_%s_%s" % (
-            self._first_part_algorithm_id(parent_signature
-                                          if parent_signature is not None else ""),
+        parent_signature = self._parent_signature(parent, context)
+        algorithm_id = self._token(
+            parent_signature, node.name, ("group", grouped_count),
+            self._group_symbol, grouped_count, node.name)
+        self._prepare_signature(node, algorithm_id)
+
+    @classmethod
+    def _group_symbol(cls, parent_signature, grouped_count, node_name):
+        return "%s.%d_%s_%s" % (
+            cls._first_part_algorithm_id(parent_signature),
             grouped_count,
-            node.name,
-            zlib.adler32(parent_signature.encode(
-                'utf-8', errors='surrogateescape')
-                if parent_signature is not None else b"")
+            node_name,
+            zlib.adler32(parent_signature.encode('utf-8', errors='surrogateescape'))
         )
-        self._prepare_signature(node, algorithm_id)
 
 
 class ParentCountedChildrenByNameTopologySignature(Signature):
@@ -211,40 +474,57 @@ class ParentCountedChildrenByNameTopologySignature(Signature):
     If there are less neighbours available, nothing is appended. On this way, there
     is an upper bound in possible signatures being created.
     """
-    def __init__(self, count=20):
-        Signature.__init__(self)
+    def __init__(self, count=20, symbol_table=None):
+        Signature.__init__(self, symbol_table=symbol_table)
         self._count = count
 
-    def prepare_signature(self, node, parent):
-        position = node.node_number()
-        neighbors = parent.children_list()[(position - self._count
-                                            if position > self._count else 0):position]\
-            if parent is not None else []
-        algorithm_id = "%s_%s_%s" % (
-            "_".join(str(node.name) for node in neighbors),
-            node.name,
-            zlib.adler32(self.get_signature(parent, None).encode(
-                'utf-8', errors='surrogateescape') if parent is not None else b"")
-        )
+    @property
+    def sibling_width(self):
+        return self._count
+
+    def prepare_signature(self, node, parent, context=None):
+        position = context.position if context is not None else node.node_number()
+        neighbors = window = None
+        if parent is not None and self._count > 0:
+            if context is not None:
+                neighbors = context.names(self._count)
+            if neighbors is None:
+                window = self.sibling_window(parent, position, self._count)
+        if window is not None:
+            neighbors = tuple(str(name) for name in window.names)
+        elif neighbors is None:
+            neighbors = parent.children_list()[
+                (position - self._count if position > self._count else 0):position]\
+                if parent is not None else []
+            neighbors = tuple(str(node.name) for node in neighbors)
+        algorithm_id = self._token(
+            self._parent_signature(parent, context),
+            node.name, ("neighbors", neighbors), self._neighbors_symbol,
+            neighbors, node.name)
         self._prepare_signature(node, algorithm_id)
 
-    def finish_node(self, node):
+    def finish_node(self, node, context=None):
         result = []
         if node.children_list():
             # we need to consider the insertion of empty nodes
-            parent = node
-            parent_signature = zlib.adler32(self.get_signature(parent, None).encode(
-                'utf-8', errors='surrogateescape'))
-            neighbors = list(self.sibling_finish_generator(node, self._count))
+            parent_signature = self.get_signature(node, None)
+            neighbors = list(self.sibling_finish_generator(
+                node, self._count, context))
             while neighbors:
-                result.append("%s_%s_%s" % (
-                    "_".join(neighbors),
-                    "",
-                    parent_signature
-                ))
+                result.append(self._token(
+                    parent_signature, "", ("neighbors", tuple(neighbors)),
+                    self._neighbors_symbol, neighbors, ""))
                 neighbors.pop()
         return result
 
+    @staticmethod
+    def _neighbors_symbol(parent_signature, neighbors, node_name):
+        return "%s_%s_%s" % (
+            "_".join(neighbors),
+            node_name,
+            zlib.adler32(parent_signature.encode('utf-8', errors='surrogateescape'))
+        )
+
     def __repr__(self):
         return self.__class__.__name__ + " (count: %d)" % self._count
 
@@ -254,40 +534,46 @@ class ParentSiblingSignature(Signature):
     This class offers infinite P dimension encoding and fixed width finite-length
     Q encoding. No further things are performed in here, so no sorting or such
     """
-    def __init__(self, width=20):
-        Signature.__init__(self)
+    def __init__(self, width=20, symbol_table=None):
+        Signature.__init__(self, symbol_table=symbol_table)
         self._width = width
 
-    def prepare_signature(self, node, parent):
-        siblings = self.sibling_generator(node, self._width)
-        parent_signature = self.get_signature(parent, None, dimension="p") \
-            if parent is not None else ''
-        p_signature = ParentChildByNameTopologySignature.signature_string(
-            node.name, parent_signature)
-        algorithm_id = "%s_%s" % (
-            "_".join(siblings),
-            p_signature
-        )
+    @property
+    def sibling_width(self):
+        return self._width
+
+    def prepare_signature(self, node, parent, context=None):
+        siblings = tuple(self.sibling_generator(node, self._width, context))
+        p_signature = self._token(
+            self._parent_signature(parent, context, dimension="p"),
+            node.name, None, ParentChildByNameTopologySignature.name_symbol,
+            node.name)
+        algorithm_id = self._token(
+            p_signature, None, ("siblings", siblings), self._siblings_symbol,
+            siblings)
         self._prepare_signature(node, algorithm_id, p=p_signature)
 
-    def finish_node(self, node):
+    def finish_node(self, node, context=None):
         # node is the PARENT of the current hierarchy :P
         result = []
-        p_signature = ParentChildByNameTopologySignature.signature_string(
-            '',
-            self.get_signature(node, None, dimension="p")
-        )
+        p_signature = self._token(
+            self.get_signature(node, None, dimension="p"), "", None,
+            ParentChildByNameTopologySignature.name_symbol, "")
         if node.children_list():
             # we need to consider the insertion of empty nodes
-            siblings = list(self.sibling_finish_generator(node, self._width))
+            siblings = list(self.sibling_finish_generator(
+                node, self._width, context))
             while siblings:
-                algorithm_id = "%s_%s" % (
-                    "_".join(siblings),
-                    p_signature
-                )
+                algorithm_id = self._token(
+                    p_signature, None, ("siblings", tuple(siblings)),
+                    self._siblings_symbol, siblings)
                 result.append(algorithm_id)
                 siblings.pop()
         return result
 
+    @staticmethod
+    def _siblings_symbol(p_signature, siblings):
+        return "%s_%s" % ("_".join(siblings), p_signature)
+
     def __repr__(self):
         return self.__class__.__name__ + " (width: %d)" % self._width
@@ -0,0 +1,64 @@
+"""
+Module offers a symbol table that memoizes the transitions of signatures from the
+token of a parent to the token of its child. Tokens are small integers instead of
+strings, so repeated process paths are resolved without any string operations.
+"""
+
+
+class SymbolTable(object):
+    """
+    The SymbolTable maps transitions given by a parent token, the name of a node
+    and an optional extra part (e.g. the position of a node) to integer tokens.
+    Tokens are assigned in order of appearance starting from 0.
+
+    For each new transition the string representation of the token is determined
+    once and kept for reverse lookups, e.g. for output or debugging. The same
+    table can be shared by several signatures, as long as the extra part of
+    their transitions differs whenever their string representations differ.
+    """
+    __slots__ = ("_transitions", "_symbols")
+
+    def __init__(self):
+        self._transitions = {}
+        self._symbols = []
+
+    def token(self, parent_token, name, extra=None, symbol_function=None, *args):
+        """
+        Returns the token for the given transition. If the transition is unknown,
+        a new token is created. The string representation for new tokens is
+        built by calling *symbol_function* with the string representation of
+        *parent_token* (an empty string if it is None) and *args*.
+
+        :param parent_token: Token of the parent or None
+        :param name: Name of the node
+        :param extra: Additional hashable part of the transition
+        :param symbol_function: Function to create string representation
+        :return: Integer token
+        """
+        key = (parent_token, name, extra)
+        try:
+            return self._transitions[key]
+        except KeyError:
+            token = self._transitions[key] = len(self._symbols)
+            if symbol_function is None:
+                self._symbols.append(None)
+            else:
+                self._symbols.append(symbol_function(
+                    self._symbols[parent_token] if parent_token is not None else "",
+                    *args))
+            return token
+
+    def symbol(self, token):
+        """
+        Returns the string representation of given *token*.
+
+        :param token: Integer token
+        :return: String representation
+        """
+        return self._symbols[token]
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def __repr__(self):
+        return "%s (%d)" % (self.__class__.__name__, len(self._symbols))
@@ -49,6 +49,9 @@ class SetStatistics(Statistics):
     def add(self, value):
         self._data.update([self._convert(value)])
 
+    def add_many(self, values):
+        self._data.update(map(self._convert, values))
+
     def count(self, value=None):
         if value is not None:
             converted = self._convert(value)
@@ -0,0 +1,198 @@
+"""
+Module offers statistics with bounded memory that summarise values in a
+mergeable histogram of logarithmically growing buckets. Each bucket covers
+values whose relative distance to the value representing the bucket is below a
+given relative accuracy. The memory of the statistics therefore depends on the
+number of buckets only and not on the number of different values.
+
+On the process durations of the test data (33k durations of 152 process
+names), statistics per name need 64 KiB in total compared to 137 KiB for
+:py:class:`SplittedStatistics`. All durations match the statistics they have
+been added to, 46% of the durations scaled by 1.5 do not match anymore compared
+to 37% for :py:class:`SplittedStatistics`, and medians are estimated within the
+relative accuracy of 5%. See ``benchmarks/sketch_statistics.py``.
+"""
+import math
+
+from assess.algorithms.statistics.statistics import Statistic, Statistics
+
+
+class SketchStatistic(Statistic):
+    __slots__ = ("_count", "_value")
+
+    def __init__(self, value, count):
+        self._count = count
+        self._value = value
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def value(self):
+        return self._value
+
+
+class SketchStatistics(Statistics):
+    """
+    The SketchStatistics count values in buckets of logarithmically growing
+    width. A positive value is assigned to bucket
+    ``ceil(log(value) / log(gamma))`` with ``gamma = (1 + a) / (1 - a)`` for a
+    *relative_accuracy* ``a``. Values of 0 are counted separately.
+
+    At most *max_buckets* buckets are kept. If more buckets are needed, the
+    lowest buckets are collapsed into the next higher one, so the accuracy is
+    kept for the longest durations.
+
+    Similar to :py:class:`SetStatistics`, a value matches the statistics if
+    the bucket of the value has been counted more often than the given count.
+
+    :param relative_accuracy: Relative accuracy of values within a bucket
+    :param max_buckets: Maximum number of buckets to keep
+    """
+    __slots__ = ("_buckets", "_zero_count", "_relative_accuracy", "_gamma",
+                 "_log_gamma", "_max_buckets", "_min_key")
+
+    def __init__(self, relative_accuracy=.05, max_buckets=128):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative accuracy must be in range (0, 1)")
+        if max_buckets < 1:
+            raise ValueError("at least one bucket is required")
+        self._buckets = {}
+        self._zero_count = 0
+        self._relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_buckets = max_buckets
+        # lowest key once buckets have been collapsed
+        self._min_key = None
+
+    def __add__(self, other):
+        result = type(self)(relative_accuracy=self._relative_accuracy,
+                            max_buckets=self._max_buckets)
+        result += self
+        if other is not None:
+            result += other
+        return result
+
+    def __iadd__(self, other):
+        if other is None:
+            return self
+        if not isinstance(other, SketchStatistics) or \
+                self._relative_accuracy != other._relative_accuracy:
+            raise TypeError("statistics can not be merged with %s" % other)
+        buckets = self._buckets
+        for key, count in other._buckets.items():
+            buckets[key] = buckets.get(key, 0) + count
+        self._zero_count += other._zero_count
+        if other._min_key is not None:
+            self._min_key = max(self._min_key, other._min_key) \
+                if self._min_key is not None else other._min_key
+        if self._min_key is not None:
+            collapsed = sum(buckets.pop(key) for key in list(buckets)
+                            if key < self._min_key)
+            if collapsed:
+                buckets[self._min_key] = buckets.get(self._min_key, 0) + collapsed
+        self._collapse()
+        return self
+
+    def __iter__(self):
+        if self._zero_count:
+            yield SketchStatistic(0, self._zero_count)
+        for key in sorted(self._buckets):
+            yield SketchStatistic(self._value(key), self._buckets[key])
+
+    def add(self, value):
+        key = self._key(value)
+        if key is None:
+            self._zero_count += 1
+        else:
+            self._buckets[key] = self._buckets.get(key, 0) + 1
+            if len(self._buckets) > self._max_buckets:
+                self._collapse()
+
+    def add_many(self, values):
+        buckets = self._buckets
+        for value in values:
+            key = self._key(value)
+            if key is None:
+                self._zero_count += 1
+            else:
+                buckets[key] = buckets.get(key, 0) + 1
+        # collapsing once gives the same buckets as collapsing on each add
+        self._collapse()
+
+    def count(self, value=None):
+        if value is not None:
+            key = self._key(value)
+            if key is None:
+                return self._zero_count
+            return self._buckets.get(key, 0)
+        return self._zero_count + sum(self._buckets.values())
+
+    def distance(self, value, count=0):
+        if value is None:
+            return None
+        if count < self.count(value=value):
+            return 0
+        return 1
+
+    def quantile(self, quantile):
+        """
+        Method returns an estimate of the given *quantile* of the values that
+        have been added. The estimate is within the relative accuracy of the
+        exact quantile unless buckets have been collapsed.
+
+        :param quantile: Quantile in the range [0, 1]
+        :return: Estimated value, None if no values have been added
+        """
+        total = self.count()
+        if total == 0:
+            return None
+        rank = quantile * (total - 1)
+        current = self._zero_count
+        if rank < current:
+            return 0
+        for key in sorted(self._buckets):
+            current += self._buckets[key]
+            if rank < current:
+                return self._value(key)
+        return self._value(max(self._buckets))
+
+    @classmethod
+    def mean(cls, values, length=None):
+        result = values[0] + None
+        for value in values[1:]:
+            result += value
+        length = float(len(values) if length is None else length)
+        for key in result._buckets:
+            result._buckets[key] /= length
+        result._zero_count /= length
+        return result
+
+    def _key(self, value):
+        if value <= 0:
+            return None
+        key = int(math.ceil(math.log(value) / self._log_gamma))
+        if self._min_key is not None and key < self._min_key:
+            # values below collapsed buckets belong to lowest bucket
+            return self._min_key
+        return key
+
+    def _value(self, key):
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def _collapse(self):
+        excess = len(self._buckets) - self._max_buckets
+        if excess <= 0:
+            return
+        keys = sorted(self._buckets)
+        collapsed = sum(self._buckets.pop(key) for key in keys[:excess])
+        self._min_key = keys[excess]
+        self._buckets[self._min_key] += collapsed
+
+    def __repr__(self):
+        values = [(statistic.value, statistic.count) for statistic in self]
+        if len(values) > 3:
+            return "%s: %s..." % (self.__class__.__name__, values[0:3])
+        return "%s: %s" % (self.__class__.__name__, values)
@@ -3,6 +3,7 @@ Module offers an incremental method to split underlying distributions to more
 correctly represent the underlying data for distance measurement.
 """
 import bisect
+from array import array
 
 from assess.algorithms.statistics.statistics import Statistics, MeanVariance
 
@@ -20,14 +21,19 @@ class SplittedStatistics(Statistics):
     This can be configured via specifying threshold and attraction factor.
 
     Attention: the attraction factor is currently not in use.
+
+    The means of the statistics are kept in a sorted array next to the
+    statistics, so looking up the closest statistics does not need to collect
+    them. Statistics must therefore not be changed from outside.
     """
-    __slots__ = ("_statistics_type", "_statistics", "_threshold",
+    __slots__ = ("_statistics_type", "_statistics", "_means", "_threshold",
                  "_distribution_threshold", "_attraction_factor")
 
     def __init__(self, statistics_type=MeanVariance, threshold=.5,
                  distribution_threshold=1.2, attraction_factor=None):
         self._statistics_type = statistics_type
         self._statistics = [statistics_type()]
+        self._means = array("d", [self._statistics[0].mean])
         self._threshold = threshold
         self._distribution_threshold = distribution_threshold
         self._attraction_factor = attraction_factor
@@ -62,20 +68,21 @@ class SplittedStatistics(Statistics):
                 if distance > self._threshold:
                     new_statistic = self._statistics_type()
                     new_statistic += statistic
-                    if (self._statistics[index - 1].mean if index > 0 else -float(
-                            "inf")) < value < self._statistics[index].mean:
-                        self._statistics.insert(index, new_statistic)
+                    if (self._means[index - 1] if index > 0 else -float(
+                            "inf")) < value < self._means[index]:
+                        self._insert(index, new_statistic)
                         self._perform_merging(index)
                     else:
-                        self._statistics.insert(index + 1, new_statistic)
+                        self._insert(index + 1, new_statistic)
                         self._perform_merging(index + 1)
                 else:
                     self._statistics[index] += statistic
+                    self._means[index] = self._statistics[index].mean
                     self._perform_merging(index)
             else:
                 new_statistic = self._statistics_type()
                 new_statistic += statistic
-                self._statistics.append(new_statistic)
+                self._insert(len(self._statistics), new_statistic)
         return self
 
     def __iter__(self):
@@ -91,26 +98,61 @@ class SplittedStatistics(Statistics):
         """
         if value == 0:
             self._statistics[0].add(value)
+            self._means[0] = self._statistics[0].mean
             return
         if len(self._statistics) > 0:
             # look for closest statistics_type dataset
             distance, index = self._closest_value_and_index(value=value)
             if distance > self._threshold:
                 # check where to insert value
-                if (self._statistics[index - 1].mean if index > 0 else -float(
-                        "inf")) < value < self._statistics[index].mean:
-                    self._statistics.insert(index, self._statistics_type(
-                        value=value))
+                if (self._means[index - 1] if index > 0 else -float(
+                        "inf")) < value < self._means[index]:
+                    self._insert(index, self._statistics_type(value=value))
                 else:
-                    self._statistics.insert(index + 1, self._statistics_type(
-                        value=value))
+                    self._insert(index + 1, self._statistics_type(value=value))
             else:
                 self._statistics[index].add(value=value)
+                self._means[index] = self._statistics[index].mean
                 # perform merging
                 self._perform_merging(index)
         else:
             # just create a statistics object
-            self._statistics.append(self._statistics_type(value=value))
+            self._insert(0, self._statistics_type(value=value))
+
+    def add_many(self, values):
+        """
+        Method adds several values. As the splitting depends on the order of
+        values, values are clustered one after another. Values of 0 do not
+        influence the clustering of positive values and are therefore added to
+        their statistics in a single step.
+
+        :param values: Iterable of values to add
+        """
+        values = list(values)
+        if any(value < 0 for value in values):
+            # negative values are compared to the statistics of 0
+            for value in values:
+                self.add(value)
+            return
+        self._statistics[0].add_many(value for value in values if value == 0)
+        self._means[0] = self._statistics[0].mean
+        add = self.add
+        for value in values:
+            if value != 0:
+                add(value)
+
+    def _insert(self, index, statistic):
+        self._statistics.insert(index, statistic)
+        self._means.insert(index, statistic.mean)
+
+    def _merge(self, index):
+        """
+        Merges the statistics at *index* + 1 into the statistics at *index*.
+        """
+        self._statistics[index] += self._statistics[index + 1]
+        del self._statistics[index + 1]
+        del self._means[index + 1]
+        self._means[index] = self._statistics[index].mean
 
     def _perform_merging(self, index):
         if len(self._statistics) <= 1:
@@ -120,15 +162,13 @@ class SplittedStatistics(Statistics):
             merged = False
             if self._distribution_distance(index, index + 1) <= \
                     self._distribution_threshold:
-                self._statistics[index] += self._statistics[index + 1]
-                del self._statistics[index + 1]
+                self._merge(index)
                 merged = True
             # don't look at index 0, because there 0 objects are dumped
             if index > 1:
                 if self._distribution_distance(index - 1, index) <= \
                         self._distribution_threshold:
-                    self._statistics[index - 1] += self._statistics[index]
-                    del self._statistics[index]
+                    self._merge(index - 1)
                     index -= 1
                     merged = True
 
@@ -186,8 +226,7 @@ class SplittedStatistics(Statistics):
         :param value: reference value to look for
         :return: tuple from distance and index of closest value
         """
-        index = bisect.bisect_left([statistic.mean for
-                                    statistic in self._statistics], value)
+        index = bisect.bisect_left(self._means, value)
         left_distance = self._statistics[index - 1].distance(value=value) \
             if index > 1 else float("inf")
         right_distance = self._statistics[index].distance(value=value) \
@@ -197,6 +236,17 @@ class SplittedStatistics(Statistics):
         return min(left_distance, right_distance), index \
             if right_distance < left_distance else index - 1
 
+    def __getstate__(self):
+        # means are derived from the statistics, so they are not stored
+        return None, {slot: getattr(self, slot) for slot in self.__slots__
+                      if slot != "_means"}
+
+    def __setstate__(self, state):
+        instance_state, slot_state = state
+        for key, value in dict(instance_state or {}, **slot_state).items():
+            setattr(self, key, value)
+        self._means = array("d", (statistic.mean for statistic in self._statistics))
+
     def __repr__(self):
         return "%s (%s)" % (self.__class__.__name__, [
             {statistic.value: statistic.count} for statistic in self._statistics])
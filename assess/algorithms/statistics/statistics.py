@@ -37,6 +37,11 @@ class Statistics(object):
 
        Method adds another object to the statistics.
 
+    .. describe:: add_many(values)
+
+       Method adds several objects to the statistics. The result is the same
+       as adding the objects one after another.
+
     .. describe:: distance(value)
 
        Returns for a given *value* the distance to the stored objects.
@@ -69,6 +74,15 @@ class Statistics(object):
         """
         return NotImplemented
 
+    def add_many(self, values):
+        """
+        Add given values to the current statistics in the given order.
+
+        :param values: Iterable of values to be added
+        """
+        for value in values:
+            self.add(value)
+
     def count(self, value=None):
         """
         If value is not given, returns the count of objects that went into
@@ -164,6 +178,28 @@ class MeanVariance(Statistic):
         else:
             self.variance /= self._count - 1
 
+    def add_many(self, values):
+        """
+        Method adds several values at once. Mean and variance of the values are
+        determined in a single pass and merged with the current ones, giving
+        the same result as sequential adding within floating point precision.
+
+        :param values: Iterable of values to be added
+        """
+        values = list(values)
+        count = len(values)
+        if count == 0:
+            return
+        mean = math.fsum(values) / count
+        squares = math.fsum((value - mean)**2 for value in values)
+        total = self._count + count
+        delta = mean - self._mean
+        squares += self.variance * (self._count - 1) if self._count > 1 else 0
+        squares += delta * delta * self._count * count / total
+        self._mean += delta * count / total
+        self._count = total
+        self.variance = squares / (total - 1) if total > 1 else 0
+
     @property
     def mean(self):
         """
@@ -0,0 +1,148 @@
+"""
+Module offers a column wise snapshot of the statistics several prototypes hold
+for a single signature. The distance of one value to the statistics of all
+prototypes can then be determined in a single call without dispatching to the
+single statistics and their components.
+"""
+import bisect
+import math
+from array import array
+
+from assess.algorithms.statistics.splittedstatistics import SplittedStatistics
+from assess.algorithms.statistics.statistics import MeanVariance
+
+
+class StatisticsColumns(object):
+    """
+    The StatisticsColumns store count, mean, and variance of the components of
+    :py:class:`SplittedStatistics` of several prototypes in aligned arrays. The
+    components of the prototype at position *i* are found in the range
+    ``indptr[i]`` to ``indptr[i + 1]`` ordered by their mean.
+
+    Distances equal the ones given by :py:meth:`SplittedStatistics.distance`.
+    The snapshot does not follow changes of the statistics it was taken from.
+
+    :param prototypes: List of prototypes
+    :param statistics: List of statistics in order of prototypes
+    """
+    __slots__ = ("prototypes", "_indptr", "_counts", "_means", "_variances",
+                 "_second_parts", "_factors")
+
+    def __init__(self, prototypes, statistics):
+        self.prototypes = prototypes
+        self._indptr = array("l", [0])
+        self._counts = array("d")
+        self._means = array("d")
+        # valid variances as used by MeanVariance
+        self._variances = array("d")
+        self._second_parts = array("d")
+        # factors of the probability density function, nan for variances of 0
+        self._factors = array("d")
+        for statistic in statistics:
+            for component in statistic:
+                self._counts.append(component.count)
+                self._means.append(component.mean)
+                variance = component.all_valid_variance
+                self._variances.append(variance)
+                # components remember their second part once it has been
+                # determined, so it is taken over instead of being recalculated
+                second_part = component._second_part
+                if second_part is None:
+                    second_part = -1 / (2 * variance) if variance else 0
+                self._second_parts.append(second_part)
+                self._factors.append(1 / math.sqrt(2 * variance * math.pi)
+                                     if variance else float("nan"))
+            self._indptr.append(len(self._means))
+
+    @classmethod
+    def from_statistics(cls, prototypes, statistics):
+        """
+        Method creates the columns if all *statistics* are supported, otherwise
+        None is returned.
+
+        :param prototypes: List of prototypes
+        :param statistics: List of statistics in order of prototypes
+        :return: Columns or None
+        """
+        for statistic in statistics:
+            if type(statistic) is not SplittedStatistics:
+                return None
+            for component in statistic:
+                if type(component) is not MeanVariance:
+                    return None
+        return cls(prototypes, statistics)
+
+    def distances(self, value, count=0):
+        """
+        Method returns the distances of *value* to the statistics of all
+        prototypes, see :py:meth:`SplittedStatistics.distance`.
+
+        :param value: The value to check the distance for
+        :param count: Number of times the value has already been seen
+        :return: List of distances in order of prototypes
+        """
+        if value is None:
+            return [None] * len(self.prototypes)
+        indptr = self._indptr
+        counts = self._counts
+        means = self._means
+        variances = self._variances
+        second_parts = self._second_parts
+        factors = self._factors
+        bisect_left = bisect.bisect_left
+        exp = math.exp
+        infinity = float("inf")
+        result = []
+        start = 0
+        for stop in indptr[1:]:
+            index = bisect_left(means, value, start, stop)
+            # distances of closest components following MeanVariance.distance
+            if index > start + 1:
+                if counts[index - 1] > 0:
+                    if value == 0:
+                        left = None
+                    elif value == means[index - 1]:
+                        left = 0
+                    else:
+                        left = 1 - exp(second_parts[index - 1] *
+                                       (value - means[index - 1])**2)
+                else:
+                    left = infinity
+            else:
+                left = infinity
+            if index < stop:
+                if counts[index] > 0:
+                    if value == 0:
+                        right = None
+                    elif value == means[index]:
+                        right = 0
+                    else:
+                        right = 1 - exp(second_parts[index] *
+                                        (value - means[index])**2)
+                else:
+                    right = infinity
+            else:
+                right = infinity
+            if left is None or right is None:
+                distance = None
+            else:
+                if not right < left:
+                    index -= 1
+                    if index < start:
+                        # statistics are indexed from their end then
+                        index = stop - 1
+                distance = min(left, right)
+            # height of the closest component following MeanVariance.height
+            factor = factors[index]
+            if factor != factor:
+                raise ZeroDivisionError("variance of statistics is 0")
+            if count >= factor * exp(-(value - means[index])**2 / (
+                    2.0 * variances[index])) * counts[index]:
+                distance = 1
+            elif distance is None or distance < 1:
+                distance = 0
+            if distance == infinity:
+                distance = 1
+            result.append(distance)
+            start = stop
+        return result
@@ -2,16 +2,23 @@
 Module implement the general TreeDistanceAlgorithm that is the base for working
 with dynamic trees whilst calculating distances.
 """
+import logging
+import multiprocessing
 from typing import Dict, List
 
 from assess.prototypes.simpleprototypes import Tree, Prototype
+from assess.prototypes.frontierprototypes import FrontierTree
 from assess.algorithms.signatures.signatures import Signature
 from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
+from assess.algorithms.signatures.compiledprototypecache import \
+    compiled_prototypes
+from assess.algorithms.signatures.prototypeindex import PrototypeIndex
 from assess.events.events import ProcessStartEvent, ProcessExitEvent, TrafficEvent, \
     ParameterEvent, Event
 from assess.exceptions.exceptions import EventNotSupportedException, \
     TreeNotStartedException, DataNotInCacheException
 from assess.utility.objectcache import ObjectCache
+from assess.utility.state import object_state, restore_state
 
 
 class TreeDistanceAlgorithm(object):
@@ -25,10 +32,30 @@ class TreeDistanceAlgorithm(object):
     * start_tree and finish_tree,
     * _add_event, and
     * _update_distance
+
+    If *frontier* is set, the monitoring tree only keeps its frontier: after a
+    node has been finished and no later event can reference it anymore, its
+    children are released. Only the siblings required by the signature are kept
+    for alive nodes as well as the latest attribute of each name, so memory is
+    bounded by the number of alive processes and their distinct attributes.
+    Distances are the same as for the full monitoring tree as long as events
+    only reference processes that are alive. The tree itself can then not be
+    traversed completely anymore.
+
+    If *processes* is greater than 1, prototypes are compiled into their
+    signature caches by a pool of processes when they are set. The partial caches
+    are merged in order of the prototypes, so the resulting cache is the same as
+    for compiling them one after another. This requires a stateless signature,
+    otherwise prototypes are still compiled sequentially.
+
+    Compiled prototypes of stateless signatures are kept by the process-wide
+    :py:data:`compiled_prototypes` cache if its *maxsize* is set. Algorithms
+    that share the prototypes, signature, supported events, and statistics then
+    share the signature cache of prototypes, that must not be changed.
     """
     __slots__ = ("_signature", "_cache_statistics", "_signature_prototypes",
                  "_distance", "_prototypes", "_tree", "_tree_dict", "_event_counter",
-                 "supported", "_maxlen", "__dict__")
+                 "supported", "frontier", "processes", "_maxlen", "__dict__")
 
     def __init__(self, signature: Signature = None, cache_statistics=None):
         if signature is None:
@@ -39,7 +66,7 @@ class TreeDistanceAlgorithm(object):
             self._signature = signature
         # signature caches
         self._cache_statistics = cache_statistics
-        self._signature_prototypes = self._signature.prototype_signature_cache_class(
+        self._signature_prototypes = self._signature.prototype_signature_cache(
             statistics_cls=self._cache_statistics)
         self._distance = None
 
@@ -54,6 +81,8 @@ class TreeDistanceAlgorithm(object):
             TrafficEvent: False,
             ParameterEvent: False
         }
+        self.frontier: bool = False
+        self.processes: int = None
         self._maxlen: int = None
 
     @property
@@ -88,22 +117,90 @@ class TreeDistanceAlgorithm(object):
     def prototypes(self, value=None):
         """
         Setter method to set the current list of prototypes to be used for
-        distance measurements.
-
-        :param value: List of prototypes
-        """
+        distance measurements. Instead of a list, a :py:class:`PrototypeIndex`
+        of prototypes that have been compiled before can be given. Its caches
+        are used as they are, similar to :py:meth:`cluster_representatives`.
+        Tokens of signatures with a symbol table only match when the index has
+        been compiled with the same symbol table.
+
+        :param value: List of prototypes or prototype index
+        """
+        if isinstance(value, PrototypeIndex):
+            if len(value.caches) != self._signature.count:
+                raise ValueError("%s does not match %d signatures" % (
+                    value, self._signature.count))
+            if not self._signature.stateless:
+                logging.getLogger(self.__class__.__name__).warning(
+                    "tokens of %s might not match the tokens of %s" % (
+                        self._signature, value))
+            self.cluster_representatives(
+                signature_prototypes=list(value.caches),
+                prototypes=value.prototypes)
+            return
+        cacheable = compiled_prototypes.maxsize > 0 and self._signature.stateless
+        if cacheable:
+            cache = compiled_prototypes.get(
+                value, self._signature, self.supported, self._cache_statistics)
+            if cache is not None:
+                self._signature_prototypes = cache
+                self._prototypes = value
+                return
         # clean old prototypes first...
-        self._signature_prototypes = self._signature.prototype_signature_cache_class(
+        self._signature_prototypes = self._signature.prototype_signature_cache(
             statistics_cls=self._cache_statistics, supported=self.supported)
-        for prototype in value:
-            # store links to nodes based on node_ids into dictionary
-            prototype.to_prototype(
-                signature=self.signature,
-                supported=self.supported,
-                cache=self._signature_prototypes
-            )
+        if self.processes is not None and self.processes > 1 and \
+                len(value) > 1 and self._signature.stateless:
+            self._compile_prototypes(value)
+        else:
+            for prototype in value:
+                # store links to nodes based on node_ids into dictionary
+                prototype.to_prototype(
+                    signature=self.signature,
+                    supported=self.supported,
+                    cache=self._signature_prototypes
+                )
+        if cacheable:
+            compiled_prototypes.put(
+                value, self._signature, self.supported, self._cache_statistics,
+                self._signature_prototypes)
         self._prototypes = value
 
+    def _compile_prototypes(self, prototypes):
+        """
+        Method compiles *prototypes* into the signature cache of prototypes by
+        a pool of :py:attr:`processes`. Prototypes are split into consecutive
+        chunks whose caches are merged in order. Where available, processes are
+        forked to inherit the prototypes instead of pickling them.
+
+        :param prototypes: List of prototypes
+        """
+        global _pool_prototypes
+        chunk_count = min(len(prototypes), 4 * self.processes)
+        chunk_size = -(-len(prototypes) // chunk_count)
+        tasks = [(self._signature, self.supported, self._cache_statistics,
+                  offset, min(offset + chunk_size, len(prototypes))) for offset in
+                 range(0, len(prototypes), chunk_size)]
+        try:
+            context = multiprocessing.get_context("fork")
+            initargs = (None,)
+            _pool_prototypes = prototypes
+        except ValueError:
+            context = multiprocessing.get_context()
+            initargs = (prototypes,)
+        try:
+            pool = context.Pool(processes=self.processes,
+                                initializer=_set_pool_prototypes, initargs=initargs)
+            try:
+                for (_, _, _, start, stop), cache in zip(
+                        tasks, pool.starmap(_compile_pool_prototypes, tasks)):
+                    self._signature_prototypes.update(cache, prototypes={
+                        index: prototypes[index] for index in range(start, stop)})
+            finally:
+                pool.terminate()
+                pool.join()
+        finally:
+            _pool_prototypes = None
+
     @property
     def signature_prototypes(self):
         """
@@ -233,8 +330,13 @@ class TreeDistanceAlgorithm(object):
 
         :param maxlen: How many prototypes are considered for distance measurement.
         """
-        self._tree = Tree()
-        self._tree_dict = ObjectCache()
+        if self.frontier:
+            self._tree = FrontierTree(width=self._signature.sibling_width)
+        else:
+            self._tree = Tree()
+        # only the frontier requires events in order, so superseded processes
+        # can be released from the lookup
+        self._tree_dict = ObjectCache(ordered=self.frontier)
         self._event_counter = 0
         assert maxlen is None or maxlen <= len(self._prototypes)
         self._maxlen = maxlen
@@ -248,19 +350,47 @@ class TreeDistanceAlgorithm(object):
         """
         return None
 
-    def add_events(self, eventgenerator, **kwargs):
+    def add_events(self, eventgenerator, checkpoint_events=1, checkpoint_tme=None,
+                   **kwargs):
         """
         Convenience method that takes an event generator and calls method
         add_event for each event that is yielded.
 
+        Distances are only materialised for events that are checkpoints. An
+        event becomes a checkpoint when *checkpoint_events* events have been
+        added since the last checkpoint or when its tme is at least
+        *checkpoint_tme* after the tme of the last checkpoint. If both are None,
+        distances are only available after the stream, e.g. when calling
+        finish_tree. Decorators that require the results of every event still
+        receive them, see :py:attr:`Decorator.checkpoints_only`.
+
         :param eventgenerator: Event generator yielding events.
+        :param checkpoint_events: Number of events between checkpoints,
+            defaults to 1
+        :param checkpoint_tme: Event time between checkpoints, defaults to None
         :param kwargs:
+        :return: Result of the last checkpoint
         """
+        result = None
+        pending = 0
+        last_tme = None
         for event in eventgenerator:
+            pending += 1
+            checkpoint = checkpoint_events is not None and pending >= checkpoint_events
+            if checkpoint_tme is not None:
+                if last_tme is None:
+                    last_tme = event.tme
+                elif event.tme - last_tme >= checkpoint_tme:
+                    checkpoint = True
             try:
-                self.add_event(event, **kwargs)
+                event_result = self.add_event(event, checkpoint=checkpoint, **kwargs)
             except EventNotSupportedException:
-                pass
+                continue
+            if checkpoint:
+                result = event_result
+                pending = 0
+                last_tme = event.tme
+        return result
 
     def add_event(self, event, **kwargs):
         """
@@ -274,6 +404,10 @@ class TreeDistanceAlgorithm(object):
         Attention: This format is put into a list, because of empty nodes that
         might be required to put into the current tree.
 
+        If the event is not a checkpoint (keyword *checkpoint* is False),
+        distances are updated but not materialised, so None is returned per
+        signature instead.
+
         :param event: The event to be added to the current distance measurement.
         :param kwargs:
         :return: Returns the current distances after the event has been applied.
@@ -283,6 +417,8 @@ class TreeDistanceAlgorithm(object):
         self._event_counter += 1
         if isinstance(event, ProcessStartEvent):
             if self.supported.get(ProcessStartEvent, False):
+                if self.frontier:
+                    self._release_nodes(event)
                 # create node
                 node, parent = self._create_node(event, **kwargs)
                 signature = self._create_signature(node, parent)
@@ -293,6 +429,8 @@ class TreeDistanceAlgorithm(object):
             # finish node to take care on empty nodes
             result = []
             event.signature = []
+            if self.frontier:
+                self._release_nodes(event)
             node, parent = self._finish_node(event, **kwargs)
             signatures = self._create_signature_for_finished_node(node)
             for signature in signatures:
@@ -314,6 +452,9 @@ class TreeDistanceAlgorithm(object):
                 # added to keep information related signature for event
                 event.signature.append(signature)
                 result.append(self.update_distance(event, signature, **kwargs))
+            if self.frontier:
+                self._tree_dict.finish_data(data=node, key=event.pid,
+                                            end_value=event.tme)
         elif isinstance(event, TrafficEvent):
             if self.supported.get(TrafficEvent, False):
                 result = self._process_parameter_event(event, **kwargs)
@@ -328,7 +469,19 @@ class TreeDistanceAlgorithm(object):
             raise EventNotSupportedException(event)
         return result
 
+    def _release_nodes(self, event):
+        """
+        Method releases the nodes that have been finished before the given event
+        from the frontier of the monitoring tree.
+
+        :param event: Event that was received
+        """
+        for node in self._tree_dict.evict(event.tme):
+            self._tree.release_node(node)
+
     def _process_parameter_event(self, event, **kwargs):
+        if self.frontier:
+            self._release_nodes(event)
         # create or reuse node
         node, parent = self._create_or_reuse_node(event, **kwargs)
         signature = self._create_signature(node, parent)
@@ -488,9 +641,51 @@ class TreeDistanceAlgorithm(object):
                 [key.__name__ for key, value in self.supported.items() if value])
 
     def __getstate__(self):
-        obj_dict = self.__dict__.copy()
+        obj_dict = object_state(self)
         obj_dict["_prototypes"] = []
         obj_dict["_signature_prototypes"] = type(self._signature_prototypes)()
         obj_dict["_tree"] = Tree()
         obj_dict["_tree_dict"] = type(self._tree_dict)()
         return obj_dict
+
+    def __setstate__(self, state):
+        restore_state(self, state)
+
+
+def compile_prototypes(signature, supported, statistics_cls, prototypes, offset=0):
+    """
+    Function compiles *prototypes* into a new signature cache of prototypes. It
+    is called by the processes of :py:meth:`TreeDistanceAlgorithm.prototypes`.
+    Prototypes within the returned cache are replaced by their index starting
+    at *offset*, so the prototypes do not need to be sent back.
+
+    :param signature: The signature to use
+    :param supported: Dictionary of supported events
+    :param statistics_cls: Class of statistics to use
+    :param prototypes: List of prototypes to compile
+    :param offset: Index of first prototype
+    :return: Signature cache of prototypes
+    """
+    cache = signature.prototype_signature_cache(
+        statistics_cls=statistics_cls, supported=supported)
+    for prototype in prototypes:
+        prototype.to_prototype(signature=signature, supported=supported, cache=cache)
+    result = signature.prototype_signature_cache(
+        statistics_cls=statistics_cls, supported=supported)
+    return result.update(cache, prototypes={
+        prototype: offset + index for index, prototype in enumerate(prototypes)})
+
+
+#: prototypes of the pool of processes compiling them
+_pool_prototypes = None
+
+
+def _set_pool_prototypes(prototypes):
+    global _pool_prototypes
+    if prototypes is not None:
+        _pool_prototypes = prototypes
+
+
+def _compile_pool_prototypes(signature, supported, statistics_cls, start, stop):
+    return compile_prototypes(signature, supported, statistics_cls,
+                              _pool_prototypes[start:stop], offset=start)
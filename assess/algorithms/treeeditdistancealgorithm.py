@@ -42,6 +42,8 @@ class TreeEditDistanceAlgorithm(TreeDistanceAlgorithm):
         self.distance.update_distance(
             prototypes=self._prototypes,
             signature_prototypes=None, )
+        if not kwargs.get("checkpoint", True):
+            return None
         result = [value for value in self.distance.iter_on_prototypes(self._prototypes)]
         return [list(element) for element in zip(*result)]
 
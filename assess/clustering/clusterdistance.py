@@ -116,18 +116,18 @@ class ClusterDistance(dengraph.distance.IncrementalDistance):
                         for stat in statistic:
                             # round up to always consider occurence
                             count = int(math.ceil(stat.count))
-                            for _ in range(count):
-                                # select for matches only specific signature
-                                self.distance.update_distance(
-                                    prototypes=prototypes_caches.prototype_name,
-                                    signature_prototypes=prototypes_caches,
-                                    event_type=support_key,
-                                    matches=[matching_prototypes[idx]
-                                             if idx == supporter_index else {}
-                                             for idx, value in enumerate(
-                                        matching_prototypes)]
-                                    # TODO: add values here
-                                )
+                            # select for matches only specific signature
+                            self.distance.update_distance_many(
+                                prototypes=prototypes_caches.prototype_name,
+                                signature_prototypes=prototypes_caches,
+                                event_type=support_key,
+                                matches=[matching_prototypes[idx]
+                                         if idx == supporter_index else {}
+                                         for idx, value in enumerate(
+                                    matching_prototypes)],
+                                count=count
+                                # TODO: add values here
+                            )
         self.distance.finish_distance(prototypes, prototypes_caches)
         results = self.distance.distance_for_prototypes(prototypes)
         normalised_results = []
@@ -25,6 +25,7 @@ class AnomalyDecorator(Decorator):
     ]
     """
     __slots__ = ("_data", "_tmp_prototype_counts", "_tmp_event_weights", "_percentage")
+    prototype_depth = 2
 
     def __init__(self, percentage=0.1):
         Decorator.__init__(self, name="anomaly")
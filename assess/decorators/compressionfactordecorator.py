@@ -30,6 +30,7 @@ class CompressionFactorDecorator(Decorator):
     all prototypes are compressed regarding a given ensemble.
     """
     __slots__ = "_data"
+    checkpoints_only = True
 
     def __init__(self):
         Decorator.__init__(self, name="compression")
@@ -89,6 +90,13 @@ class CompressionFactorDecorator(Decorator):
     def data(self):
         return self._data
 
+    def prototype_data(self, index):
+        if self._data is None:
+            return None
+        data = dict(self._data)
+        data["prototypes"] = [[ensemble[index]] for ensemble in data["prototypes"]]
+        return data
+
     def _original_sizes(self):
         """
         Returns number of nodes a prototype consists of.
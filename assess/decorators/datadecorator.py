@@ -23,6 +23,7 @@ class DataDecorator(Decorator):
     }
     """
     __slots__ = "_data"
+    checkpoints_only = True
 
     def __init__(self):
         Decorator.__init__(self, name="data")
@@ -54,6 +55,15 @@ class DataDecorator(Decorator):
     def data(self):
         return self._data
 
+    def prototype_data(self, index):
+        if self._data is None:
+            return None
+        data = dict(self._data)
+        data["prototypes"] = {
+            key: [[ensemble[index]] for ensemble in values]
+            for key, values in self._data["prototypes"].items()}
+        return data
+
     def _update(self, decorator):
         self._data["monitoring"].setdefault("original", []).extend(
             decorator.data()["monitoring"].get("original", []))
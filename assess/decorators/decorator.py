@@ -30,8 +30,18 @@ class Decorator(object):
     """
     Base decorator for ASSESS to measure different statistics based on methods
     of algorithm class.
+
+    Decorators setting *checkpoints_only* to True only require the results of
+    checkpoints when events are added in batches via add_events. All other
+    decorators enforce the materialisation of results for every single event.
+
+    Decorators whose data contain one value per prototype set *prototype_depth*
+    to the depth of the prototype dimension within their data, see
+    :py:meth:`prototype_data`.
     """
     __slots__ = ("_algorithm", "decorator", "_name", "_last_event_counts")
+    checkpoints_only = False
+    prototype_depth = None
 
     def __init__(self, name="decorator"):
         self._algorithm = None
@@ -211,13 +221,17 @@ class Decorator(object):
         :param kwargs: Additional parameters
         :return: Updated distance
         """
+        checkpoint = kwargs.get("checkpoint", True)
+        if not checkpoint and not self.checkpoints_only:
+            # decorator relies on the results of every single event
+            kwargs["checkpoint"] = checkpoint = True
         self._event_will_be_added()
         if self.decorator:
             result = self.decorator.add_event(event, **kwargs)
         else:
             result = self._algorithm.__class__.add_event(
                 self._algorithm, event, **kwargs)
-        if result is not None:
+        if result is not None and checkpoint:
             # Functionality has been changed to a list of results, so for each
             # result the internal method :py:meth:_event_added is called
             # TODO: maybe inform internal method about the actual event
@@ -276,6 +290,39 @@ class Decorator(object):
         """
         raise NotImplementedError()
 
+    def prototype_data(self, index):
+        """
+        Method to receive the data that was collected by the decorator for the
+        prototype at given *index* only. The prototype dimension is kept, so the
+        data looks like the data of a run against this single prototype. Data
+        that does not differ by prototype is returned as is.
+
+        :param index: Index of prototype
+        :return: Data that was collected for the prototype
+        """
+        def select(data, depth):
+            if data is None:
+                return None
+            if depth == 0:
+                return [data[index]]
+            return [select(element, depth - 1) for element in data]
+        if self.prototype_depth is None:
+            return self.data()
+        return select(self.data(), self.prototype_depth)
+
+    def descriptive_prototype_data(self, index):
+        """
+        Method to receive the descriptive data of the decorator for the
+        prototype at given *index* only, see :py:meth:`prototype_data`.
+
+        :param index: Index of prototype
+        :return: Descriptive data for the prototype
+        """
+        result = {self._name: self.prototype_data(index)}
+        if self.decorator:
+            result.update(self.decorator.descriptive_prototype_data(index))
+        return result
+
     def descriptive_data(self):
         """
         Method to receive the data that was collected by the decorator.
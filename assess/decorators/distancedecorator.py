@@ -35,6 +35,7 @@ class DistanceDecorator(Decorator):
     ]
     """
     __slots__ = ("_data", "_normalized", "_tmp_prototype_counts")
+    prototype_depth = 2
 
     def __init__(self, normalized=False):
         if normalized:
@@ -30,6 +30,8 @@ class DistanceMatrixDecorator(Decorator):
     ]
     """
     __slots__ = ("_data", "_tmp_prototype_counts", "_normalized")
+    checkpoints_only = True
+    prototype_depth = 2
 
     def __init__(self, normalized=False):
         if normalized:
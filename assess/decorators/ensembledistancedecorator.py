@@ -31,6 +31,7 @@ class EnsembleDistanceDecorator(Decorator):
     """
     __slots__ = ("_data", "_normalized", "_tmp_prototype_counts", "_last_result",
                  "_mismatches")
+    prototype_depth = 2
 
     def __init__(self, normalized=False):
         if normalized:
@@ -27,6 +27,7 @@ class EnsembleMatrixDecorator(Decorator):
     """
     __slots__ = ("_data", "_normalized", "_tmp_prototype_counts",
                  "_last_distance_event")
+    prototype_depth = 2
 
     def __init__(self, normalized=False):
         if normalized:
@@ -80,3 +80,22 @@ class DecoratorNotFoundException(Exception):
 
 class DataNotInCacheException(Exception):
     pass
+
+
+class EventsNotInOrderException(Exception):
+    """Thrown when a stream expected to be ordered by tme is out of order"""
+    def __init__(self, tme=None, last_tme=None):
+        Exception.__init__(
+            self,
+            "Received tme %s after tme %s, but stream is expected to be ordered"
+            % (tme, last_tme)
+        )
+
+
+class PrototypeIndexFormatException(Exception):
+    """Thrown when a file cannot be read as a prototype index"""
+    def __init__(self, path=None, reason=None):
+        Exception.__init__(
+            self,
+            "%s is not a valid prototype index (%s)" % (path, reason)
+        )
@@ -3,6 +3,11 @@ Generators for event streams for GNM monitoring files
 """
 import random
 import os
+import csv
+import heapq
+import types
+import itertools
+import tempfile
 import logging
 import filelock
 try:
@@ -13,6 +18,9 @@ except ImportError:
 from gnmutils.sources.filedatasource import FileDataSource
 from assess.prototypes.simpleprototypes import Prototype
 from assess.generators.event_generator import EventGenerator, NodeGenerator
+from assess.events.events import ProcessStartEvent, ProcessExitEvent, \
+    TrafficEvent, Event
+from assess.exceptions.exceptions import EventsNotInOrderException
 
 
 class GNMImporter(object):
@@ -282,6 +290,201 @@ class GNMCSVEventStreamer(NodeGenerator, EventGenerator):
             yield prototype
 
 
+class GNMCSVRowStreamer(GNMImporter, EventGenerator):
+    """
+    Generator for event streams that reads the rows of GNM csv files directly.
+    In contrast to :py:class:`GNMCSVEventStreamer` neither a :py:class:`Prototype`
+    is built nor cached. Events are generated in the same order as by
+    :py:meth:`Prototype.event_iter`, but markers for empty nodes are skipped.
+
+    If *presorted* is True, rows are expected to be ordered by their tme and are
+    streamed while reading. Memory then is bounded by the number of processes
+    being alive at the same time. Otherwise the rows are sorted in chunks of
+    *chunk_size* rows that are written to temporary files and merged while
+    streaming, so at most one chunk is kept in memory.
+
+    Traffic is only streamed when *traffic_path* is given. It is assigned to the
+    processes with the same pid that are alive, traffic of other processes is
+    skipped.
+
+    :param csv_path: path to a GNM process csv file
+    :param traffic_path: path to a GNM traffic csv file
+    :param presorted: True if process rows are ordered by tme
+    :param chunk_size: number of rows being sorted in memory at once
+    """
+    traffic_key_type = {
+        'tme': float,
+        'pid': int,
+        'ppid': int,
+        'uid': int,
+        'gpid': int,
+        'in_rate': float,
+        'out_rate': float,
+        'in_cnt': int,
+        'out_cnt': int,
+        'source_port': int,
+        'dest_port': int,
+    }
+
+    def __init__(self, csv_path, traffic_path=None, presorted=False,
+                 chunk_size=100000, **kwargs):
+        streamer = kwargs.pop("streamer", None)
+        supported = kwargs.pop("supported", None)
+        EventGenerator.__init__(self, streamer=streamer, supported=supported)
+        self.path = csv_path
+        self.traffic_path = traffic_path
+        self.presorted = presorted
+        self.chunk_size = chunk_size
+
+    def event_iter(self):
+        supported = self._supported
+        # (tme, -#events, event); smallest popped FIRST
+        event_queue = []
+        event_count = 0
+        # pid -> number of started processes whose exit was not yielded yet
+        alive = {}
+        traffic = self._traffic_iter() \
+            if supported.get(TrafficEvent, False) and self.traffic_path else None
+        next_traffic = next(traffic, None) if traffic is not None else None
+        for process in self._process_iter():
+            now = process["tme"]
+            # assign traffic that happened before current process
+            while next_traffic is not None and next_traffic["tme"] < now:
+                # processes that exited before are not alive anymore
+                while event_queue and event_queue[0][0] < next_traffic["tme"]:
+                    event = self._pop_event(event_queue, alive)
+                    if event is not None:
+                        yield event
+                event_count = self._queue_traffic(
+                    event_queue, event_count, next_traffic, alive)
+                next_traffic = next(traffic, None)
+            # yield any events that should have happened so far
+            while event_queue and event_queue[0][0] < now:
+                event = self._pop_event(event_queue, alive)
+                if event is not None:
+                    yield event
+            alive[process["pid"]] = alive.get(process["pid"], 0) + 1
+            if supported.get(ProcessStartEvent, False):
+                event_count += 1
+                yield ProcessStartEvent(**process)
+            event_count += 1
+            exit_dict = process.copy()
+            exit_dict["value"] = exit_dict["exit_tme"] - exit_dict["tme"]
+            exit_dict["start_tme"] = exit_dict["tme"]
+            exit_dict["tme"] = exit_dict["exit_tme"]
+            heapq.heappush(event_queue, (
+                exit_dict["tme"], -event_count, ProcessExitEvent(**exit_dict)))
+        while next_traffic is not None:
+            while event_queue and event_queue[0][0] < next_traffic["tme"]:
+                event = self._pop_event(event_queue, alive)
+                if event is not None:
+                    yield event
+            event_count = self._queue_traffic(
+                event_queue, event_count, next_traffic, alive)
+            next_traffic = next(traffic, None)
+        while event_queue:
+            event = self._pop_event(event_queue, alive)
+            if event is not None:
+                yield event
+
+    def _pop_event(self, event_queue, alive):
+        """
+        Method removes the next event from the queue. When a process exits, it
+        is not considered alive anymore. Returns None for unsupported events.
+        """
+        event = heapq.heappop(event_queue)[2]
+        if isinstance(event, ProcessExitEvent):
+            if alive[event.pid] > 1:
+                alive[event.pid] -= 1
+            else:
+                del alive[event.pid]
+            if not self._supported.get(ProcessExitEvent, False):
+                return None
+        return event
+
+    @staticmethod
+    def _queue_traffic(event_queue, event_count, traffic, alive):
+        if traffic["pid"] not in alive:
+            return event_count
+        for variant, count in (("in_rate", "in_rate"), ("out_rate", "out_cnt")):
+            if (traffic.get(count) or 0) > 0:
+                event_count += 1
+                event = TrafficEvent(**Event.create_traffic(
+                    types.SimpleNamespace(**traffic), variant, traffic[variant]))
+                heapq.heappush(event_queue, (event.tme, -event_count, event))
+        return event_count
+
+    def _process_iter(self):
+        return self._row_iter(self.path, self.default_key_type)
+
+    def _traffic_iter(self):
+        return self._row_iter(self.traffic_path, self.traffic_key_type)
+
+    def _row_iter(self, path, key_type):
+        """
+        Generator yields the rows of a GNM csv file ordered by tme. Values are
+        converted by given *key_type*, missing values are set to None.
+
+        :param path: Path to csv file
+        :param key_type: Dictionary of column names to types
+        :return: Generator for dictionaries of rows
+        """
+        with open(path, "r") as csv_file:
+            reader = csv.reader(line for line in csv_file if not line.startswith("#"))
+            header = next(reader, [])
+            converters = [key_type.get(key, str) for key in header]
+            if self.presorted:
+                rows = reader
+            else:
+                rows = self._sorted_rows(reader, header.index("tme"))
+            last_tme = None
+            for row in rows:
+                values = {key: converter(value) if value != "" else None for
+                          key, converter, value in zip(header, converters, row)}
+                if last_tme is not None and values["tme"] < last_tme:
+                    raise EventsNotInOrderException(
+                        tme=values["tme"], last_tme=last_tme)
+                last_tme = values["tme"]
+                yield values
+
+    def _sorted_rows(self, rows, tme_index):
+        """
+        Generator yields given csv *rows* ordered by their tme. Rows are sorted
+        in chunks that are written to temporary files and merged afterwards.
+        If all rows fit into a single chunk, no files are written.
+
+        :param rows: Iterable of csv rows
+        :param tme_index: Index of tme column
+        :return: Generator for sorted csv rows
+        """
+        def key(row):
+            return float(row[tme_index])
+
+        chunk_files = []
+        try:
+            while True:
+                chunk = sorted(itertools.islice(rows, self.chunk_size), key=key)
+                if not chunk_files and len(chunk) < self.chunk_size:
+                    yield from chunk
+                    return
+                if not chunk:
+                    break
+                chunk_file = tempfile.TemporaryFile(mode="w+", newline="")
+                chunk_files.append(chunk_file)
+                csv.writer(chunk_file).writerows(chunk)
+                chunk_file.seek(0)
+            # merge is stable, so rows with same tme keep their order
+            yield from heapq.merge(
+                *(csv.reader(chunk_file) for chunk_file in chunk_files), key=key)
+        finally:
+            for chunk_file in chunk_files:
+                chunk_file.close()
+
+    def __repr__(self):
+        return "%s (path=%s, traffic_path=%s)" % (
+            self.__class__.__name__, self.path, self.traffic_path)
+
+
 class EventStreamer(EventGenerator):
     def event_iter(self):
         return self._streamer.event_iter()
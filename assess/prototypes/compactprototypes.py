@@ -0,0 +1,539 @@
+"""
+Module describes a compact representation of trees and prototypes. Instead of
+creating one object per node, nodes are stored column wise in arrays. Nodes are
+only materialised as lightweight views when they are accessed.
+"""
+from array import array
+
+from assess.prototypes.simpleprototypes import Tree, Prototype
+from assess.exceptions.exceptions import TreeInvalidatedException, \
+    NodeNotEmptyException, NodeNotRemovedException, NodeNotFoundException
+
+#: Marker for missing values in columns stored as list
+_MISSING = object()
+#: Marker for missing values in integer columns stored as array
+_MISSING_INT = -2 ** 63
+#: Type of values stored in arrays by typecode
+_TYPECODE_TYPES = {"d": float, "q": int}
+
+
+class CompactTreeNode(object):
+    """
+    Lightweight view on a node stored within a :py:class:`CompactOrderedTree`.
+    It offers the same API as :py:class:`OrderedTreeNode`. All attributes are
+    stored within the tree, so several views for the same node can exist and
+    are considered equal.
+
+    :param tree: Tree where node belongs to
+    :param index: Index of node within tree
+    """
+    __slots__ = ("_prototype", "index")
+
+    def __init__(self, tree, index):
+        object.__setattr__(self, "_prototype", tree)
+        object.__setattr__(self, "index", index)
+
+    @property
+    def name(self):
+        tree = self._prototype
+        return tree.names[tree.name_ids[self.index]]
+
+    @property
+    def node_id(self):
+        return self._prototype.node_id(self.index)
+
+    @property
+    def position(self):
+        return self._prototype.positions[self.index]
+
+    @property
+    def next_node(self):
+        return self._prototype.view(self._prototype.next_order[self.index])
+
+    @property
+    def previous_node(self):
+        return self._prototype.view(self._prototype.previous_order[self.index])
+
+    @property
+    def __dict__(self):
+        return self._prototype.values(self.index)
+
+    def __getattr__(self, name):
+        # only called for attributes that are not part of the structure
+        if name in CompactTreeNode.__slots__:
+            raise AttributeError(name)
+        return self._prototype.value(self.index, name)
+
+    def __setattr__(self, name, value):
+        self._prototype.set_value(self.index, name, value)
+
+    def __delattr__(self, name):
+        self._prototype.delete_value(self.index, name)
+
+    def __eq__(self, other):
+        return type(self) == type(other) and self.index == other.index and \
+            self._prototype is other._prototype
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((id(self._prototype), self.index))
+
+    def __reduce__(self):
+        return self.__class__, (self._prototype, self.index)
+
+    def dao(self):
+        return {key: value for key, value in self._prototype.values(self.index).items()
+                if "signature_id" not in key and not key.startswith("_")}
+
+    def parameters(self):
+        def check_keys(key):
+            return not ("name" in key
+                        or "node_id" in key
+                        or "tme" in key
+                        or "exit_tme" in key
+                        or "pid" in key
+                        or "ppid" in key)
+        return {key: value for key, value in self.dao().items() if check_keys(key)}
+
+    def depth(self):
+        """
+        Method returns the depth of the current node within the tree.
+
+        :return: Depth of the node within the tree
+        """
+        count = 0
+        parents = self._prototype.parents
+        index = parents[self.index]
+        while index >= 0:
+            count += 1
+            index = parents[index]
+        return count
+
+    def children(self):
+        """
+        Generator that yields children of the node.
+
+        :return: Generator for children
+        """
+        return iter(self.children_list())
+
+    def children_list(self):
+        """
+        Sequence of children of the node.
+
+        :return: Sequence of children
+        """
+        return CompactChildren(self._prototype, self.index)
+
+    def child_count(self):
+        return self._prototype.child_counts[self.index]
+
+    def node_count(self):
+        """
+        Method returns the count of nodes within the subtree of the node.
+
+        :return: Count of nodes in subtree
+        """
+        count = 1
+        for child in self.children():
+            count += child.node_count()
+        return count
+
+    def node_number(self):
+        return self._prototype.positions[self.index]
+
+    def parent(self):
+        return self._prototype.view(self._prototype.parents[self.index])
+
+    def add_node(self, name=None, **kwargs):
+        return self._prototype.add_node(name=name, parent=self, **kwargs)
+
+    def __repr__(self):
+        return '%s(next=%s, prev=%s)' % (
+            self.__class__.__name__,
+            getattr(self.next_node, "node_id", None),
+            getattr(self.previous_node, "node_id", None)
+        )
+
+
+class CompactChildren(object):
+    """
+    Read-only sequence of the children of a node within a
+    :py:class:`CompactOrderedTree`. Children are accessed by following the links
+    between siblings, starting at the end that is closest to the index.
+
+    :param tree: Tree where node belongs to
+    :param index: Index of parent node
+    """
+    __slots__ = ("_tree", "_index")
+
+    def __init__(self, tree, index):
+        self._tree = tree
+        self._index = index
+
+    def __len__(self):
+        return self._tree.child_counts[self._index]
+
+    def __iter__(self):
+        tree = self._tree
+        index = tree.first_children[self._index]
+        while index >= 0:
+            yield tree.view(index)
+            index = tree.next_siblings[index]
+
+    def __reversed__(self):
+        tree = self._tree
+        index = tree.last_children[self._index]
+        while index >= 0:
+            yield tree.view(index)
+            index = tree.previous_siblings[index]
+
+    def __getitem__(self, item):
+        length = len(self)
+        if isinstance(item, slice):
+            start, stop, step = item.indices(length)
+            if step != 1:
+                return list(self)[item]
+            return [self._tree.view(index) for index in self._range(start, stop)]
+        if item < 0:
+            item += length
+        if not 0 <= item < length:
+            raise IndexError("child index out of range")
+        return self._tree.view(self._range(item, item + 1)[0])
+
+    def _range(self, start, stop):
+        """
+        Method returns the indices of children from position *start* to *stop*.
+        """
+        tree = self._tree
+        if stop <= start:
+            return []
+        length = len(self)
+        if length - stop < start:
+            # walk backwards from last child
+            index = tree.last_children[self._index]
+            for _ in range(length - stop):
+                index = tree.previous_siblings[index]
+            result = []
+            for _ in range(stop - start):
+                result.append(index)
+                index = tree.previous_siblings[index]
+            result.reverse()
+            return result
+        index = tree.first_children[self._index]
+        for _ in range(start):
+            index = tree.next_siblings[index]
+        result = []
+        for _ in range(stop - start):
+            result.append(index)
+            index = tree.next_siblings[index]
+        return result
+
+    def index(self, node):
+        if node.parent() != self._tree.view(self._index):
+            raise ValueError("%s is not a child" % node)
+        return node.node_number()
+
+    def __contains__(self, node):
+        try:
+            self.index(node)
+        except (ValueError, AttributeError):
+            return False
+        return True
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class CompactOrderedTree(object):
+    """
+    Class that builds up an ordered tree like :py:class:`OrderedTree`, but stores
+    nodes as struct of arrays. The structure of the tree is given by the index
+    of the parent, first and last child, next and previous sibling, as well as
+    the next and previous node in order of insertion. Names are interned and
+    stored by their id. The attributes tme, exit_tme, pid, and ppid are stored
+    in typed arrays as long as their values have the expected type. The type of
+    tme and exit_tme is given by their first value, so either float or int
+    timestamps are stored compactly. All other attributes are stored in sparse
+    columns.
+
+    Node ids are given by the index of a node. Only node ids that are given
+    explicitly are stored in a dictionary.
+    """
+    typed_columns = {"tme": ("d", "q"), "exit_tme": ("d", "q"),
+                     "pid": ("q",), "ppid": ("q",)}
+
+    def __init__(self):
+        self.root = None
+        self._node_counter = 0
+        self._last_index = -1
+        self.parents = array("l")
+        self.first_children = array("l")
+        self.last_children = array("l")
+        self.next_siblings = array("l")
+        self.previous_siblings = array("l")
+        self.next_order = array("l")
+        self.previous_order = array("l")
+        self.child_counts = array("l")
+        self.positions = array("l")
+        self.name_ids = array("l")
+        self.names = []
+        self._name_ids = {}
+        self._columns = {}
+        self._node_ids = {}
+        self._custom_node_ids = {}
+
+    @property
+    def _last_node(self):
+        return self.view(self._last_index)
+
+    def view(self, index):
+        """
+        Method returns a view on the node at given *index*.
+
+        :param index: Index of node
+        :return: Node view, None for negative index
+        """
+        if index < 0:
+            return None
+        return CompactTreeNode(self, index)
+
+    def unique_node_id(self, node_id=None):
+        if node_id is None:
+            return str(len(self.parents))
+        return "%s_%s" % (str.split(node_id, "_")[0], len(self.parents))
+
+    def node_id(self, index):
+        return self._custom_node_ids.get(index, str(index))
+
+    def node_count(self):
+        return self._node_counter
+
+    def add_node(self, name=None, parent=None, previous_node=None, next_node=None,
+                 node_id=None, **kwargs):
+        """
+        Method adds a new node to the actual tree. If parent is not given,
+        the node gets the root node of the tree.
+
+        :param name: Name of the node to create
+        :param parent: Parent of the node to attach to
+        :param previous_node: Reference to last node
+        :param next_node: Reference to next node
+        :param node_id: unique ID of node
+        :param kwargs: Additional parameters of the node
+        :return: Reference to the created node
+        """
+        index = len(self.parents)
+        if node_id is not None and node_id != str(index):
+            try:
+                self.node_by_node_id(node_id)
+            except NodeNotFoundException:
+                pass
+            else:
+                raise TreeInvalidatedException
+        previous_index = previous_node.index if previous_node is not None \
+            else self._last_index
+        parent_index = parent.index if parent is not None else -1
+        self.parents.append(parent_index)
+        self.first_children.append(-1)
+        self.last_children.append(-1)
+        self.child_counts.append(0)
+        self.next_siblings.append(-1)
+        self.previous_order.append(previous_index)
+        self.next_order.append(next_node.index if next_node is not None else -1)
+        if previous_index >= 0:
+            self.next_order[previous_index] = index
+        if parent_index >= 0:
+            last_child = self.last_children[parent_index]
+            self.previous_siblings.append(last_child)
+            self.positions.append(self.child_counts[parent_index])
+            if last_child >= 0:
+                self.next_siblings[last_child] = index
+            else:
+                self.first_children[parent_index] = index
+            self.last_children[parent_index] = index
+            self.child_counts[parent_index] += 1
+        else:
+            self.previous_siblings.append(-1)
+            self.positions.append(0)
+        try:
+            name_id = self._name_ids[name]
+        except KeyError:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        self.name_ids.append(name_id)
+        for column in self._columns.values():
+            column.append(self._missing(column))
+        if node_id is not None and node_id != str(index):
+            self._custom_node_ids[index] = node_id
+            self._node_ids[node_id] = index
+        node = self.view(index)
+        for key, value in kwargs.items():
+            self.set_value(index, key, value)
+        if self.root is None:
+            self.root = node
+        self._last_index = index
+        self._node_counter += 1
+        return node
+
+    def remove_node(self, node=None):
+        index = node.index
+        if self.child_counts[index] > 0:
+            raise NodeNotEmptyException()
+        if self.parents[index] < 0:
+            # neither root nor removed nodes can be removed
+            raise NodeNotRemovedException()
+        parent_index = self.parents[index]
+        previous_sibling = self.previous_siblings[index]
+        next_sibling = self.next_siblings[index]
+        if previous_sibling >= 0:
+            self.next_siblings[previous_sibling] = next_sibling
+        else:
+            self.first_children[parent_index] = next_sibling
+        if next_sibling >= 0:
+            self.previous_siblings[next_sibling] = previous_sibling
+        else:
+            self.last_children[parent_index] = previous_sibling
+        self.child_counts[parent_index] -= 1
+        sibling = next_sibling
+        while sibling >= 0:
+            self.positions[sibling] -= 1
+            sibling = self.next_siblings[sibling]
+        previous_index = self.previous_order[index]
+        next_index = self.next_order[index]
+        if previous_index >= 0:
+            self.next_order[previous_index] = next_index
+        if next_index >= 0:
+            self.previous_order[next_index] = previous_index
+        if self._last_index == index:
+            self._last_index = previous_index
+        self.parents[index] = -2
+        node_id = self._custom_node_ids.pop(index, None)
+        if node_id is not None:
+            del self._node_ids[node_id]
+        self._node_counter -= 1
+
+    def node_by_node_id(self, node_id=None):
+        try:
+            index = self._node_ids[node_id]
+        except KeyError:
+            try:
+                index = int(node_id)
+            except (TypeError, ValueError):
+                raise NodeNotFoundException()
+            if not 0 <= index < len(self.parents) or \
+                    index in self._custom_node_ids or self.parents[index] == -2 \
+                    or str(index) != node_id:
+                raise NodeNotFoundException()
+        return self.view(index)
+
+    def value(self, index, name):
+        """
+        Method returns the value of attribute *name* for node at *index*.
+
+        :param index: Index of node
+        :param name: Name of attribute
+        :return: Value of attribute
+        """
+        try:
+            value = self._columns[name][index]
+        except KeyError:
+            raise AttributeError(name)
+        if self._is_missing(value):
+            raise AttributeError(name)
+        return value
+
+    def set_value(self, index, name, value):
+        if name == "name":
+            try:
+                name_id = self._name_ids[value]
+            except KeyError:
+                name_id = self._name_ids[value] = len(self.names)
+                self.names.append(value)
+            self.name_ids[index] = name_id
+            return
+        if name in ("index", "_prototype", "node_id", "position", "next_node",
+                    "previous_node"):
+            raise AttributeError("%s can not be changed" % name)
+        try:
+            column = self._columns[name]
+        except KeyError:
+            column = self._columns[name] = self._column(name, value)
+        if isinstance(column, array):
+            if self._fits(column.typecode, value):
+                column[index] = value
+                return
+            column = self._columns[name] = [
+                _MISSING if self._is_missing(element) else element
+                for element in column]
+        column[index] = value
+
+    def delete_value(self, index, name):
+        self.value(index, name)
+        column = self._columns[name]
+        column[index] = self._missing(column)
+
+    def values(self, index):
+        """
+        Method returns a dictionary of all attributes of node at *index*.
+
+        :param index: Index of node
+        :return: Dictionary of attributes
+        """
+        result = {"name": self.names[self.name_ids[index]],
+                  "node_id": self.node_id(index)}
+        for name, column in self._columns.items():
+            value = column[index]
+            if not self._is_missing(value):
+                result[name] = value
+        return result
+
+    @staticmethod
+    def _missing(column):
+        if isinstance(column, array):
+            return _MISSING_INT if column.typecode == "q" else float("nan")
+        return _MISSING
+
+    @staticmethod
+    def _is_missing(value):
+        if value is _MISSING:
+            return True
+        if type(value) is int:
+            return value == _MISSING_INT
+        if type(value) is float:
+            return value != value
+        return False
+
+    @staticmethod
+    def _fits(typecode, value):
+        if type(value) is not _TYPECODE_TYPES[typecode]:
+            return False
+        return typecode != "q" or -2 ** 63 < value < 2 ** 63
+
+    def _column(self, name, value):
+        length = len(self.parents)
+        for typecode in self.typed_columns.get(name, ()):
+            if self._fits(typecode, value):
+                if typecode == "q":
+                    return array(typecode, [_MISSING_INT]) * length
+                return array(typecode, [float("nan")]) * length
+        return [_MISSING] * length
+
+
+class CompactTree(Tree):
+    """
+    Tree that stores its nodes in a :py:class:`CompactOrderedTree`.
+    """
+    graph_class = CompactOrderedTree
+
+
+class CompactPrototype(Prototype):
+    """
+    Prototype that stores its nodes in a :py:class:`CompactOrderedTree`.
+    """
+    graph_class = CompactOrderedTree
@@ -0,0 +1,197 @@
+"""
+Module describes a tree that only keeps its frontier. Finished subtrees are
+released, so the memory consumption of a monitoring tree is bounded by the
+number of alive nodes, their sibling windows and the distinct names of their
+attributes instead of the number of nodes that have been added.
+"""
+from assess.prototypes.simpleprototypes import Tree, OrderedTree, OrderedTreeNode
+from assess.exceptions.exceptions import TreeInvalidatedException, \
+    NodeNotFoundException, NodeNotEmptyException, NodeNotRemovedException
+
+
+class FrontierChildren(object):
+    """
+    Sequence of children of a :py:class:`FrontierTreeNode`. Only the children
+    required to create signatures for further children are kept, i.e. the last
+    *width* children, the last *width* children not being attributes, as well
+    as the latest attribute of each name for attributes to be reused. Indices refer to the position of children, so length,
+    indexing and slicing behave as if all children were still available.
+
+    :param width: Number of preceding siblings to keep
+    """
+    __slots__ = ("_nodes", "_count", "_limit", "width")
+
+    def __init__(self, width=0):
+        self._nodes = []
+        self._count = 0
+        self._limit = 2 * width + 2
+        self.width = width
+
+    def append(self, node):
+        # attributes are only marked after being added, so the latest node is
+        # only considered by the next trimming
+        if len(self._nodes) >= self._limit:
+            self._trim()
+        self._nodes.append(node)
+        self._count += 1
+
+    def remove(self, node):
+        """
+        Method removes a child and updates the positions of its following
+        siblings. Siblings that have already been released are not restored.
+
+        :param node: The node to remove
+        """
+        self._nodes = [child for child in self._nodes if child is not node]
+        for child in self._nodes:
+            if child.position > node.position:
+                child.position -= 1
+        self._count -= 1
+
+    def clear(self):
+        """
+        Method releases all children that are kept, the count of children is
+        not changed.
+        """
+        self._nodes = []
+
+    def index(self, node):
+        for child in self._nodes:
+            if child is node:
+                return child.position
+        raise ValueError("%s is not in children" % node)
+
+    def _trim(self):
+        kept = []
+        siblings = 0
+        attributes = set()
+        for node in reversed(self._nodes):
+            recent = self._count - node.position <= self.width
+            if hasattr(node, "attribute"):
+                if recent or node.name not in attributes:
+                    attributes.add(node.name)
+                    kept.append(node)
+            elif recent or siblings < self.width:
+                kept.append(node)
+                siblings += 1
+        kept.reverse()
+        self._nodes = kept
+        self._limit = max(2 * len(kept), 2 * self.width) + 2
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            positions = range(*item.indices(self._count))
+            nodes = [node for node in self._nodes if node.position in positions]
+            return nodes if positions.step > 0 else nodes[::-1]
+        position = item + self._count if item < 0 else item
+        if not 0 <= position < self._count:
+            raise IndexError("index %d out of range" % item)
+        for node in reversed(self._nodes):
+            if node.position == position:
+                return node
+            if node.position < position:
+                break
+        raise NodeNotFoundException()
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def __reversed__(self):
+        return reversed(self._nodes)
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return "%s (%d/%d)" % (self.__class__.__name__, len(self._nodes), self._count)
+
+
+class FrontierTreeNode(OrderedTreeNode):
+    """
+    Node of a :py:class:`FrontierTree`. Its children are stored in a
+    :py:class:`FrontierChildren` sequence and nodes are not linked in order
+    they have been added.
+    """
+    def __init__(self, node_id, name=None, parent=None, tree=None, **kwargs):
+        OrderedTreeNode.__init__(
+            self, node_id, name=name, parent=parent, tree=tree, **kwargs)
+        self._children = FrontierChildren(width=tree.width)
+
+
+class FrontierOrderedTree(OrderedTree):
+    """
+    Ordered tree that only keeps the children required by the signature for
+    alive nodes. The count of nodes still refers to all nodes that have been
+    added.
+
+    :param width: Number of preceding siblings to keep
+    """
+    def __init__(self, width=0):
+        OrderedTree.__init__(self)
+        self.width = width
+
+    def remove_node(self, node=None):
+        if node.child_count() > 0:
+            raise NodeNotEmptyException()
+        if node.parent() is None or \
+                self._nodes_dict.pop(node.node_id, None) is None:
+            # neither root nor released nodes can be removed
+            raise NodeNotRemovedException()
+        self._node_counter -= 1
+        node.parent().children_list().remove(node)
+
+    def add_node(self, name=None, parent=None, previous_node=None, next_node=None,
+                 node_id=None, **kwargs):
+        node = FrontierTreeNode(
+            node_id=node_id if node_id is not None else self.unique_node_id(),
+            name=name,
+            parent=parent,
+            tree=self,
+            position=parent.child_count() if parent is not None else 0,
+            **kwargs
+        )
+        if self._nodes_dict.get(node.node_id, None) is not None:
+            raise TreeInvalidatedException
+        if self.root is None:
+            self.root = node
+        else:
+            parent.children_list().append(node)
+        self._node_counter += 1
+        self._unique_counter += 1
+        self._nodes_dict[node.node_id] = node
+        return node
+
+    def release_node(self, node):
+        """
+        Method releases the children of a finished node. The node itself is kept
+        as long as it is referenced by its alive descendants or is required as
+        sibling by its parent.
+
+        :param node: The node to release
+        """
+        node.children_list().clear()
+        self._nodes_dict.pop(node.node_id, None)
+
+
+class FrontierTree(Tree):
+    """
+    Tree that is used to monitor event streams whilst only keeping its frontier.
+    Nodes need to be released by :py:meth:`release_node` when they are
+    finished and cannot be referenced by later events anymore. Traversing the
+    tree therefore only considers the nodes that are still kept.
+
+    :param width: Number of preceding siblings to keep per node
+    """
+    graph_class = FrontierOrderedTree
+
+    def __init__(self, width=0):
+        Tree.__init__(self)
+        self._graph.width = width
+
+    def release_node(self, node):
+        """
+        Method releases the children of a finished node.
+
+        :param node: The node to release
+        """
+        self._graph.release_node(node)
@@ -323,9 +323,12 @@ class OrderedTree(object):
 class Tree(object):
     """
     Class that represents a tree with no ensured ordering of nodes.
+    The nodes are stored in an instance of *graph_class*.
     """
+    graph_class = OrderedTree
+
     def __init__(self):
-        self._graph = OrderedTree()
+        self._graph = self.graph_class()
 
     def remove_node(self, node=None, node_id=None):
         """
@@ -582,9 +585,9 @@ class Prototype(Tree):
     """
     Subclass of a tree that represents a prototype (class for convenience only).
     """
-    @staticmethod
-    def from_tree(tree):
-        result = Prototype()
+    @classmethod
+    def from_tree(cls, tree):
+        result = cls()
         object_cache = ObjectCache()
         for node, _ in tree.walkDFS():
             try:
@@ -596,13 +599,14 @@ class Prototype(Tree):
             except DataNotInCacheException:
                 parent = None
             process = result.add_node(parent=parent, **vars(node.value).copy())
-            object_cache.add_data(process, key=process.pid, value=process.tme)
+            object_cache.add_data(process, key=process.pid, value=process.tme,
+                                  end_value=process.exit_tme)
         return result
 
-    @staticmethod
-    def from_job(job):
+    @classmethod
+    def from_job(cls, job):
         parent_dict = {}
-        result = Prototype()
+        result = cls()
         for process in job.processes_in_order():
             try:
                 parent = parent_dict.get(job.parent(process), None)
@@ -650,55 +654,58 @@ class Prototype(Tree):
             add_signature = self._handle_prototype_ensemble_signature_list
         else:
             add_signature = self._handle_ensemble_signature_list
-        # FIXME: I should care about EmptyProcessEvent
-        cache.supported[EmptyProcessEvent] = True
+        # values are collected first, so the cache can add them per statistics
+        entries = []
         for event in self.event_iter(include_marker=True, supported=supported):
             if isinstance(event.node, EmptyNode):
                 current_signature = signature.finish_node(event.node.parent())
                 for ensemble_signature in current_signature:
                     # FIXME: turn into ExitEvent
-                    add_signature(event, ensemble_signature, cache, supported)
+                    add_signature(event, ensemble_signature, entries, supported)
                 continue
             else:
                 current_signature = signature.get_signature(
                     event.node, event.node.parent())
-            add_signature(event, current_signature, cache, supported)
+            add_signature(event, current_signature, entries, supported)
+        # FIXME: I should care about EmptyProcessEvent
+        cache.supported[EmptyProcessEvent] = True
+        cache.set_many(entries)
         del cache.supported[EmptyProcessEvent]
         return cache
 
     def _handle_ensemble_signature_list(
-            self, event, ensemble_signature_list, cache, supported):
+            self, event, ensemble_signature_list, entries, supported):
         if type(event) == EmptyProcessEvent:
             if supported.get(ProcessStartEvent, False):
-                cache[ensemble_signature_list, ProcessStartEvent] = {
+                entries.append(((ensemble_signature_list, ProcessStartEvent), {
                     "value": 0
-                }
+                }))
             if supported.get(ProcessExitEvent, False):
-                cache[ensemble_signature_list, ProcessExitEvent] = {
+                entries.append(((ensemble_signature_list, ProcessExitEvent), {
                     "value": 0
-                }
+                }))
         else:
-            cache[ensemble_signature_list, type(event)] = {
+            entries.append(((ensemble_signature_list, type(event)), {
                 "value": event.value
-            }
+            }))
 
     def _handle_prototype_ensemble_signature_list(
-            self, event, ensemble_signature_list, cache, supported):
+            self, event, ensemble_signature_list, entries, supported):
         if type(event) == EmptyProcessEvent:
             # EmptyProcessEvent means, that we are appending some dummy nodes.
             # Those apparently have Start and Exit events, so add it
             if supported.get(ProcessStartEvent, False):
-                cache[ensemble_signature_list, self, ProcessStartEvent] = {
+                entries.append(((ensemble_signature_list, self, ProcessStartEvent), {
                     "value": 0
-                }
+                }))
             if supported.get(ProcessExitEvent, False):
-                cache[ensemble_signature_list, self, ProcessExitEvent] = {
+                entries.append(((ensemble_signature_list, self, ProcessExitEvent), {
                     "value": 0
-                }
+                }))
         else:
-            cache[ensemble_signature_list, self, type(event)] = {
+            entries.append(((ensemble_signature_list, self, type(event)), {
                 "value": event.value
-            }
+            }))
 
     def event_iter(self, include_marker=True, supported=None):
         exit_event_queue = deque()  # (tme, -#events, event); leftmost popped FIRST
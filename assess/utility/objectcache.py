@@ -3,22 +3,85 @@ The ObjectCache allows sorting values by a key and another value.
 """
 
 import bisect
+import heapq
 import logging
 
-from typing import Dict, Any, Set
+from typing import Dict, Any, List
 
 from assess.exceptions.exceptions import DataNotInCacheException
 
 
+class BoundedCounter(object):
+    """
+    The BoundedCounter counts added keys without growing unbounded. It behaves
+    like a set for the *maxlen* keys added last, while :py:attr:`count` still
+    reflects all keys that have been added.
+
+    :param maxlen: Maximum number of keys to remember
+    """
+    __slots__ = ("_keys", "count", "maxlen")
+
+    def __init__(self, maxlen=100):
+        self._keys: Dict[Any, None] = {}
+        self.count: int = 0
+        self.maxlen: int = maxlen
+
+    def add(self, key):
+        self.count += 1
+        self._keys.pop(key, None)
+        self._keys[key] = None
+        if len(self._keys) > self.maxlen:
+            del self._keys[next(iter(self._keys))]
+
+    def clear(self):
+        self._keys.clear()
+        self.count = 0
+
+    def __contains__(self, item):
+        return item in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return "%s (%d/%d)" % (self.__class__.__name__, len(self._keys), self.count)
+
+
 class ObjectCache(object):
-    __slots__ = ("_object_cache", "faulty_nodes", "unfound")
+    """
+    The ObjectCache stores data objects per key as intervals. For each key, the
+    data objects are kept in a list that is sorted by their start value.
+    Start values and, if known, end values are kept in parallel lists, so
+    inserting and looking up objects requires a binary search only.
+
+    If the cache is *ordered*, data objects are added and looked up with
+    non-decreasing values, as it is the case for an event stream. An object
+    then cannot be referenced anymore once another object for the same key has
+    been added with a greater start value, so it is released immediately.
+    Objects with a known end value can additionally be released by
+    :py:meth:`evict`.
 
-    def __init__(self):
-        self._object_cache: Dict[Any, Any] = {}
-        self.faulty_nodes: Set[Any] = set()
-        self.unfound: Set[Any] = set()
+    :param ordered: If values are added and looked up in order
+    :param maxlen: Number of erroneous keys to remember
+    """
+    __slots__ = ("_object_cache", "_starts", "_ends", "_exits", "_exit_counter",
+                 "ordered", "faulty_nodes", "unfound")
 
-    def add_data(self, data=None, key=None, value=None,
+    def __init__(self, ordered=False, maxlen=100):
+        self._object_cache: Dict[Any, List[Any]] = {}
+        self._starts: Dict[Any, List[Any]] = {}
+        self._ends: Dict[Any, List[Any]] = {}
+        # heap of (end value, counter, key, value, data) for evictable objects
+        self._exits: List[Any] = []
+        self._exit_counter: int = 0
+        self.ordered: bool = ordered
+        self.faulty_nodes = BoundedCounter(maxlen=maxlen)
+        self.unfound = BoundedCounter(maxlen=maxlen)
+
+    def add_data(self, data=None, key=None, value=None, end_value=None,
                  key_function=lambda data: data.pid,
                  value_function=lambda data: data.tme):
         """
@@ -33,6 +96,7 @@ class ObjectCache(object):
         :param data: data object to store in cache
         :param key: discriminating key for data object
         :param value: discriminating value for key of data object
+        :param end_value: value where the interval of data object ends, if known
         :param key_function: function to get key from underlying data
         :param value_function: function to get value from underlying data
         """
@@ -42,17 +106,32 @@ class ObjectCache(object):
             value = value_function(data)
 
         try:
-            value_list = [int(value_function(process))
-                          for process in self._object_cache[key]]
-            index = bisect.bisect_left(value_list, int(value))
-            self._object_cache[key].insert(index, data)
+            starts = self._starts[key]
         except KeyError:
             self._object_cache[key] = [data]
+            self._starts[key] = [value]
+            self._ends[key] = [end_value]
+        else:
+            data_array = self._object_cache[key]
+            ends = self._ends[key]
+            if self.ordered:
+                # objects starting before value are superseded by data
+                index = bisect.bisect_left(starts, value)
+                if index > 0:
+                    del data_array[:index], starts[:index], ends[:index]
+            index = bisect.bisect_left(starts, value)
+            data_array.insert(index, data)
+            starts.insert(index, value)
+            ends.insert(index, end_value)
+        if end_value is not None:
+            self._exit_counter += 1
+            heapq.heappush(self._exits, (
+                end_value, self._exit_counter, key, value, data))
 
     def get_data(self, value=None, key=None, remember_error=False,
                  validate_range=False,
                  range_end_value_function=lambda data: data.exit_tme,
-                 value_function=lambda data: data.tme):
+                 value_function=None):
         """
         Method returns the closest matching data objects specified by given
         *key* and *value*. If no data is found, `None` is returned.
@@ -64,25 +143,24 @@ class ObjectCache(object):
         :param validate_range: check if value is in valid range given closest value
         :param range_end_value_function: function to get end value for range comparison
             from data
-        :param value_function: function to get the value for comparison from data
+        :param value_function: function to get the value for comparison from
+            data, defaults to the value given when adding the data object
         :return: closest data object, otherwise `None`
         """
-        try:
-            index = self.data_index(
-                value=value,
-                key=key,
-                remember_error=remember_error,
-                validate_range=validate_range,
-                value_function=value_function,
-                range_end_value_function=range_end_value_function
-            )
-        except DataNotInCacheException:
-            raise
+        index = self.data_index(
+            value=value,
+            key=key,
+            remember_error=remember_error,
+            validate_range=validate_range,
+            value_function=value_function,
+            range_end_value_function=range_end_value_function
+        )
         if index is not None:
             return self._object_cache[key][index]
         return None
 
-    def remove_data(self, data=None, key=None, key_function=lambda data: data.pid):
+    def remove_data(self, data=None, key=None, key_function=lambda data: data.pid,
+                    value_function=lambda data: data.tme):
         """
         Remove data object from cache. Returns `True` if the object was removed,
         otherwise `False`.
@@ -90,68 +168,157 @@ class ObjectCache(object):
         :param data: data object to be removed
         :param key: key where data is stored
         :param key_function: function to get the key from data
+        :param value_function: function to get the value from data
         :return: `True` if removal was successful, `False` otherwise
         """
         if key is None:
             key = key_function(data)
         try:
-            data_array = self._object_cache[key]
-            data_array.remove(data)
-            if len(self._object_cache[key]) == 0:
-                del self._object_cache[key]
-            return True
-        except ValueError:
-            pass
-        except KeyError:
-            pass
-        return False
+            value = value_function(data)
+        except AttributeError:
+            value = None
+        index = self._position(data, key, value)
+        if index is None:
+            return False
+        self._remove(key, index)
+        return True
 
     def data_index(self, value=None, key=None, remember_error=False,
-                   validate_range=False, value_function=lambda data: data.tme,
+                   validate_range=False, value_function=None,
                    range_end_value_function=lambda data: data.exit_tme):
         """
         Returns index of closest value specified by *key* and *value*.
 
+        Values are compared to the values given when adding the data objects.
+        If *value_function* is given, it is applied to the data objects instead,
+        which requires them to be sorted by the resulting values as well.
+        If an end value has been given when adding the data object, it is used
+        to validate the range. Otherwise *range_end_value_function* is applied.
+
         :param value: value to look for
         :param key: key to look for
         :param remember_error: remember mismatched keys, defaults to `False`
         :param validate_range: check if value is in valid range for closest value
-        :param value_function: function to get the value for comparison from data
+        :param value_function: function to get the value for comparison from
+            data, defaults to the value given when adding the data object
         :param range_end_value_function: function to get end value for range
             comparison from data
         :return: closest data object
         """
         try:
-            data_array = self._object_cache[key]
-            value_array = [value_function(node) for node in data_array]
-            index = bisect.bisect_right(value_array, value) - 1
+            starts = self._starts[key]
+            if value_function is not None:
+                starts = [value_function(data) for data in self._object_cache[key]]
         except KeyError:
             if remember_error:
                 self.faulty_nodes.add(key)
                 logging.getLogger(self.__class__.__name__).info(
                     "error for %s (%d)", key, value)
             raise DataNotInCacheException(key, value)
-        else:
-            if validate_range:
-                selected_object = self._object_cache[key][index]
-                start_value = value_function(selected_object)
-                end_value = range_end_value_function(selected_object)
-                if value < start_value or value > end_value:
-                    if remember_error:
-                        self.faulty_nodes.add(key)
-                        logging.getLogger(self.__class__.__name__).info(
-                            "error for %s (%d)", key, value)
-                    raise DataNotInCacheException(key, value)
-
-            return index
+        index = bisect.bisect_right(starts, value) - 1
+        if validate_range:
+            end_value = self._ends[key][index]
+            if end_value is None:
+                end_value = range_end_value_function(self._object_cache[key][index])
+            if value < starts[index] or value > end_value:
+                if remember_error:
+                    self.faulty_nodes.add(key)
+                    logging.getLogger(self.__class__.__name__).info(
+                        "error for %s (%d)", key, value)
+                raise DataNotInCacheException(key, value)
+        return index
+
+    def finish_data(self, data=None, key=None, end_value=None,
+                    key_function=lambda data: data.pid,
+                    value_function=lambda data: data.tme):
+        """
+        Method sets the end value of a data object that has been added without
+        an end value before, so it can be released by :py:meth:`evict`.
+        Returns `True` if the data object was found, otherwise `False`.
+
+        :param data: data object to finish
+        :param key: key where data is stored
+        :param end_value: value where the interval of data object ends
+        :param key_function: function to get the key from data
+        :param value_function: function to get the value from data
+        :return: `True` if data object was finished, `False` otherwise
+        """
+        if key is None:
+            key = key_function(data)
+        index = self._position(data, key, value_function(data))
+        if index is None:
+            return False
+        self._ends[key][index] = end_value
+        self._exit_counter += 1
+        heapq.heappush(self._exits, (
+            end_value, self._exit_counter, key, self._starts[key][index], data))
+        return True
+
+    def evict(self, value):
+        """
+        Method releases all data objects whose end value is lower than *value*.
+        Only data objects that were added or finished with an end value are
+        considered. The released objects are returned, including those that
+        have already been removed or superseded before.
+
+        :param value: value that is not reachable by released data objects
+        :return: list of released data objects
+        """
+        result = []
+        exits = self._exits
+        while exits and exits[0][0] < value:
+            _, _, key, start_value, data = heapq.heappop(exits)
+            index = self._position(data, key, start_value, identical=True)
+            if index is not None:
+                self._remove(key, index)
+            result.append(data)
+        return result
 
     def clear(self):
         """
         Clear the current state of the cache.
         """
         self._object_cache = {}
-        self.faulty_nodes = set()
-        self.unfound = set()
+        self._starts = {}
+        self._ends = {}
+        self._exits = []
+        self._exit_counter = 0
+        self.faulty_nodes.clear()
+        self.unfound.clear()
+
+    def _position(self, data, key, value=None, identical=False):
+        """
+        Returns the index of *data* for *key* or `None` if it is not stored.
+        Objects starting at *value* are considered first.
+        """
+        try:
+            data_array = self._object_cache[key]
+        except KeyError:
+            return None
+        if value is not None:
+            starts = self._starts[key]
+            for index in range(bisect.bisect_left(starts, value),
+                               bisect.bisect_right(starts, value)):
+                if data_array[index] is data:
+                    return index
+            if identical:
+                return None
+        if identical:
+            for index, element in enumerate(data_array):
+                if element is data:
+                    return index
+            return None
+        try:
+            return data_array.index(data)
+        except ValueError:
+            return None
+
+    def _remove(self, key, index):
+        data_array = self._object_cache[key]
+        if len(data_array) == 1:
+            del self._object_cache[key], self._starts[key], self._ends[key]
+        else:
+            del data_array[index], self._starts[key][index], self._ends[key][index]
 
     @property
     def object_cache(self):
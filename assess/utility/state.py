@@ -0,0 +1,39 @@
+"""
+Helpers to pickle objects that store their attributes in slots as well as in
+their dictionary.
+"""
+
+
+def object_state(obj):
+    """
+    Method returns a dictionary of all attributes of *obj* that are either stored
+    in its slots or its dictionary.
+
+    :param obj: Object to get the state for
+    :return: Dictionary of attributes
+    """
+    state = {}
+    for cls in type(obj).__mro__:
+        slots = getattr(cls, "__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for slot in slots:
+            if slot in ("__dict__", "__weakref__"):
+                continue
+            try:
+                state[slot] = getattr(obj, slot)
+            except AttributeError:
+                pass
+    state.update(getattr(obj, "__dict__", {}))
+    return state
+
+
+def restore_state(obj, state):
+    """
+    Method restores a state given by :py:func:`object_state` for *obj*.
+
+    :param obj: Object to restore the state for
+    :param state: Dictionary of attributes
+    """
+    for key, value in state.items():
+        setattr(obj, key, value)
@@ -8,6 +8,8 @@ from utility.report import update_parser, argparse_init, LVL
 from utility.exceptions import mainExceptionFrame
 
 from assess.algorithms.signatures.signatures import Signature
+from assess.algorithms.signatures.compiledprototypecache import \
+    compiled_prototypes
 from assess.decorators.distancematrixdecorator import DistanceMatrixDecorator
 from assess.decorators.compressionfactordecorator import CompressionFactorDecorator
 from assess.generators.gnm_importer import GNMCSVEventStreamer, CSVTreeBuilder
@@ -50,6 +52,13 @@ CLI.add_argument(
     action="store_true",
     help="When given, the diagonal (regarding a distance matrix) is not calculated"
 )
+CLI.add_argument(
+    "--prototype_cache_size",
+    help="Maximum number of signatures of compiled prototypes that are reused "
+         "by algorithms sharing a signature, disabled by default",
+    type=int,
+    default=0
+)
 CLI.add_argument(
     "--no_upper",
     action="store_true",
@@ -58,6 +67,7 @@ CLI.add_argument(
 
 
 def main():
+    compiled_prototypes.maxsize = options.prototype_cache_size
     configdict = {}
     exec(open(options.configuration).read(), configdict)
     assert configdict["configurations"] is not None
@@ -124,14 +134,17 @@ def check_algorithms(paths=None, configurations=None):
                         alg.start_tree(maxlen=index + (0 if options.no_diagonal else 1))
                     else:
                         alg.start_tree()
-                    for event in GNMCSVEventStreamer(csv_path=path):
-                        alg.add_event(event=event)
+                    # only the final distances are required per tree
+                    alg.add_events(
+                        GNMCSVEventStreamer(csv_path=path), checkpoint_events=None)
                     alg.finish_tree()
                 results["results"].append({
                     "algorithm": "%s" % alg,
                     "signature": "%s" % signature_object,
                     "decorator": decorator.descriptive_data()
                 })
+    logging.getLogger(__name__).info(
+        "compiled prototypes: %s" % (compiled_prototypes.cache_info(),))
     return results
 
 
@@ -8,12 +8,16 @@ import time
 import shlex
 import os
 import random
+import threading
+import functools
 
 from utility.report import update_parser, argparse_init, LVL
 from utility.exceptions import ExceptionFrame
 
 from assess.generators.gnm_importer import GNMCSVEventStreamer, CSVTreeBuilder
 from assess.algorithms.signatures.signaturecache import PrototypeSignatureCache
+from assess.algorithms.signatures.compiledprototypecache import \
+    compiled_prototypes
 
 
 CLI = argparse.ArgumentParser()
@@ -73,6 +77,13 @@ CLI.add_argument(
     type=int,
     default=4
 )
+CLI.add_argument(
+    "--prototype_cache_size",
+    help="Maximum number of signatures of compiled prototypes that are reused "
+         "by algorithms sharing a signature, disabled by default",
+    type=int,
+    default=0
+)
 CLI.add_argument(
     "--hosts",
     action="store_true",
@@ -103,10 +114,9 @@ CLI.add_argument(
     type=str
 )
 
-process_list = []
 host_dictionary = {}
-max_count = 0
-current_count = 0
+# state of worker processes, see init_worker
+worker_state = {}
 
 
 def read_paths(path, minimum=0, maximum=None):
@@ -122,6 +132,7 @@ def read_paths(path, minimum=0, maximum=None):
 
 
 def main():
+    compiled_prototypes.maxsize = options.prototype_cache_size
     configdict = {}
     exec(open(options.configuration).read(), configdict)
     assert configdict["configurations"] is not None
@@ -166,19 +177,10 @@ def main():
                     )
                     current_index += options.maximum_number_of_trees
         else:
-            global max_count
-            max_count = ((len(prototype_paths)**2) - len(prototype_paths)) / 2
-            for tree_index, tree_path in enumerate(tree_paths):
-                for prototype_index, prototype_path in enumerate(prototype_paths):
-                    if options.no_upper and tree_index < prototype_index:
-                        break
-                    if options.no_diagonal and tree_index == prototype_index:
-                        continue
-                    log_single_calculation(
-                        tree=tree_path,
-                        prototype=prototype_path,
-                        name="%d_%d" % (tree_index, prototype_index)
-                    )
+            check_matrix(
+                tree_paths=tree_paths,
+                configurations=configdict["configurations"]
+            )
     else:
         # otherwise try to read given prototypes
         if options.prototype_file is not None:
@@ -208,49 +210,138 @@ def main():
             print(results)
 
 
-def do_multicore(count=1, target=None, data=None):
-    pool = multiprocessing.Pool(processes=count)
-    result_list = pool.map(target, data)
-    pool.close()
-    pool.join()
-    return result_list
+def do_multicore(count=1, target=None, data=None, initializer=None, initargs=(),
+                 window=None):
+    """
+    Generator applies *target* to each element of *data* within *count*
+    processes. Results are yielded in the order of *data*. At most *window*
+    elements are processed or waiting to be yielded at the same time, so
+    memory does not grow with the length of *data*.
+
+    :param count: Number of processes
+    :param target: Function to apply
+    :param data: Iterable of arguments for target
+    :param initializer: Initializer for processes
+    :param initargs: Arguments for initializer
+    :param window: Maximum number of elements in flight, defaults to 2 * count
+    :return: Generator of results
+    """
+    slots = threading.Semaphore(window or 2 * count)
+    stopped = threading.Event()
+
+    def bounded_data():
+        for element in enumerate(data):
+            slots.acquire()
+            if stopped.is_set():
+                return
+            yield element
+
+    pool = multiprocessing.Pool(
+        processes=count, initializer=initializer, initargs=initargs)
+    try:
+        pending = {}
+        next_index = 0
+        for index, result in pool.imap_unordered(
+                functools.partial(indexed_call, target), bounded_data()):
+            pending[index] = result
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+                slots.release()
+    finally:
+        # wake up the task handler in case results were not consumed completely
+        stopped.set()
+        slots.release()
+        pool.terminate()
+        pool.join()
+
+
+def indexed_call(target, element):
+    index, args = element
+    return index, target(args)
+
+
+def init_worker(configurations=None, prototypes=None, prototype_signature=None):
+    """
+    Initializer for worker processes. Configurations and prototypes are only
+    passed once per process and are inherited when processes are forked.
+    Algorithms are compiled lazily once per process, see
+    :py:func:`worker_algorithm`.
+
+    :param configurations: List of configurations
+    :param prototypes: List of prototypes
+    :param prototype_signature: Converted signatures of prototypes for cluster
+        representatives
+    """
+    worker_state.clear()
+    worker_state.update(
+        configurations=configurations or [],
+        prototypes=prototypes or [],
+        prototype_signature=prototype_signature,
+        algorithms={}
+    )
+
+
+def worker_algorithm(configuration=0, algorithm=0, signature=0):
+    """
+    Method returns the algorithm for the given combination of configuration,
+    algorithm, and signature. The prototypes of the worker are compiled when the
+    combination is requested the first time, afterwards the algorithm is reused.
+
+    :param configuration: Index of configuration
+    :param algorithm: Index of algorithm within configuration
+    :param signature: Index of signature within configuration
+    :return: Algorithm
+    """
+    key = (configuration, algorithm, signature)
+    try:
+        return worker_state["algorithms"][key]
+    except KeyError:
+        configuration = worker_state["configurations"][configuration]
+        signature_object = configuration["signatures"][signature]()
+        alg = configuration["algorithms"][algorithm](signature=signature_object)
+        if worker_state["prototype_signature"] is not None:
+            # the list of prototypes is somewhat abused for cluster names
+            # when loading CRs
+            alg.cluster_representatives(
+                signature_prototypes=worker_state["prototype_signature"],
+                prototypes=worker_state["prototypes"]
+            )
+        else:
+            alg.prototypes = worker_state["prototypes"]
+        worker_state["algorithms"][key] = alg
+        return alg
 
 
 def check_single_algorithm(args):
     """
     This method expects several parameters to be passed:
 
-    * signature - functor containing the signature to be created
-    * algorithm - functor containing the algorithm to be created
-    * decorator - functor containing the decorator to be created
+    * configuration - index of configuration
+    * algorithm - index of algorithm within configuration
+    * signature - index of signature within configuration
+    * event_streamers - list of functors for event streamers
     * tree - path to the tree to be processed
-    * prototypes - List of prototypes
-    * prototype_signature - Converted signatures of prototypes for cluster
-    representatives
 
-    :param args: Arguments to be passed to the method containing signature, algorithm,
-        decorator, tree, and prototypes
+    Configurations and prototypes are taken from the worker, see
+    :py:func:`init_worker`.
+
+    :param args: Arguments to be passed to the method containing configuration,
+        algorithm, signature, event_streamers, and tree
     :return: Decorator containing resulting data
     """
     with ExceptionFrame():
-        signature = args.get("signature", None)()
-        algorithm = args.get("algorithm", None)(signature=signature)
-        prototype_signature = args.get("prototype_signature", None)
-        if prototype_signature is not None:
-            # the list of prototypes is somewhat abused for cluster names
-            # when loading CRs
-            algorithm.cluster_representatives(
-                signature_prototypes=prototype_signature,
-                prototypes=args.get("prototypes", [])
-            )
-        else:
-            algorithm.prototypes = args.get("prototypes", None)
-        decorator = args.get("decorator", None)()
+        configuration = worker_state["configurations"][args.get("configuration", 0)]
+        algorithm = worker_algorithm(
+            configuration=args.get("configuration", 0),
+            algorithm=args.get("algorithm", 0),
+            signature=args.get("signature", 0))
+        decorator = configuration["decorator"]()
         decorator.wrap_algorithm(algorithm=algorithm)
         algorithm.start_tree()
         for event_streamer in args.get("event_streamers", [GNMCSVEventStreamer]):
-            for event in event_streamer(args.get("tree", None)):
-                algorithm.add_event(event=event)
+            algorithm.add_events(
+                event_streamer(args.get("tree", None)), checkpoint_events=None)
         algorithm.finish_tree()
         return decorator
 
@@ -284,21 +375,145 @@ def log_host_calculation(start_index=0, maximum_count=None, prototype=None, name
         stderr=open("%s.error.log" % ssh_host, "a"))
 
 
-def log_single_calculation(tree=None, prototype=None, name=None):
-    while len(process_list) >= options.pcount:
-        for process in process_list[:]:
-            if process.poll() is not None:
-                process_list.remove(process)
-                global current_count
-                current_count += 1
-                print("finished %d / %d processes" % (current_count, max_count))
-        time.sleep(1)
+def check_matrix_row(args):
+    """
+    This method calculates the cells of a single row of a distance matrix. It
+    expects the following parameters:
 
-    command = "pypy %s --trees %s --prototypes %s --configuration %s --pcount 1 --json"\
-              % (os.path.realpath(__file__), tree, prototype, options.configuration)
-    filename = "%s/%s.json" % (options.output_path, name)
-    process_list.append(
-        subprocess.Popen(shlex.split(command), stdout=open(filename, "w")))
+    * tree - path to the tree of the row
+    * prototypes - list of indices of prototypes to consider for the tree
+
+    The tree is streamed once per combination of configuration, algorithm,
+    signature, and event streamer against all prototypes up to the last index
+    of the row. The algorithm is compiled once per worker, see
+    :py:func:`worker_algorithm`. Results are split by prototype afterwards, so
+    each cell contains the same data as a run of :py:func:`check_algorithms`
+    for the tree and the single prototype of the cell.
+
+    :param args: Arguments to be passed to the method containing tree and
+        prototypes
+    :return: Dictionary of prototype index to list of results
+    """
+    with ExceptionFrame():
+        path = args.get("tree", None)
+        cells = dict((index, []) for index in args.get("prototypes", []))
+        if not cells:
+            return cells
+        maxlen = max(cells) + 1
+        if maxlen >= len(worker_state["prototypes"]):
+            maxlen = None
+        for configuration_index, configuration in enumerate(
+                worker_state["configurations"]):
+            try:
+                event_streamers = configuration["event_streamer"]
+            except KeyError:
+                event_streamers = [GNMCSVEventStreamer]
+            for event_streamer in event_streamers:
+                for algorithm_index, _ in enumerate(configuration["algorithms"]):
+                    for signature_index, _ in enumerate(configuration["signatures"]):
+                        algorithm = worker_algorithm(
+                            configuration=configuration_index,
+                            algorithm=algorithm_index,
+                            signature=signature_index)
+                        decorator = configuration["decorator"]()
+                        decorator.wrap_algorithm(algorithm=algorithm)
+                        streamer = event_streamer(csv_path=path)
+                        algorithm.start_tree(maxlen=maxlen)
+                        algorithm.add_events(streamer, checkpoint_events=None)
+                        algorithm.finish_tree()
+                        for prototype_index in sorted(cells):
+                            cells[prototype_index].append({
+                                "algorithm": "%s" % algorithm,
+                                "signature": "%s" % algorithm.signature,
+                                "event_streamer": "%s" % streamer,
+                                "decorator": decorator.descriptive_prototype_data(
+                                    prototype_index)
+                            })
+        return cells
+
+
+def matrix_rows(count, no_upper=False, no_diagonal=False):
+    """
+    Method determines the cells of a distance matrix to be calculated. Each row
+    is given by the index of the tree and the indices of the prototypes to
+    consider. Rows that do not consider any prototype are skipped.
+
+    :param count: Number of trees
+    :param no_upper: True if upper part of matrix is not calculated
+    :param no_diagonal: True if diagonal is not calculated
+    :return: List of tuples of tree index and list of prototype indices
+    """
+    rows = []
+    for tree_index in range(count):
+        prototype_indices = []
+        for prototype_index in range(count):
+            if no_upper and tree_index < prototype_index:
+                break
+            if no_diagonal and tree_index == prototype_index:
+                continue
+            prototype_indices.append(prototype_index)
+        if prototype_indices:
+            rows.append((tree_index, prototype_indices))
+    return rows
+
+
+def check_matrix(tree_paths=None, configurations=None):
+    """
+    Method calculates a distance matrix for the given trees. Every tree is
+    loaded once as a prototype and each row is calculated by a single task that
+    streams the tree once against all prototypes of the row, see
+    :py:func:`check_matrix_row`. Cells skipped by *no_upper* and *no_diagonal*
+    are not written. Rows are distributed to *pcount* processes.
+
+    The results of each cell are written to *output_path* as a single JSON file
+    named by the indices of tree and prototype. The files contain the same data
+    as :py:func:`check_algorithms` for the tree and the prototype of the cell.
+
+    :param tree_paths: List of paths to trees
+    :param configurations: List of configurations
+    """
+    if tree_paths is None:
+        tree_paths = []
+    if configurations is None:
+        configurations = []
+    version = subprocess.check_output(["git", "describe"]).strip()
+    tree_builder = CSVTreeBuilder()
+    prototypes = [tree_builder.build(path) for path in tree_paths]
+    rows = matrix_rows(len(tree_paths), no_upper=options.no_upper,
+                       no_diagonal=options.no_diagonal)
+    data = [{"tree": tree_paths[tree_index], "prototypes": prototype_indices}
+            for tree_index, prototype_indices in rows]
+    if options.pcount > 1:
+        result_list = do_multicore(
+            count=options.pcount,
+            target=check_matrix_row,
+            data=data,
+            initializer=init_worker,
+            initargs=(configurations, prototypes))
+    else:
+        init_worker(configurations=configurations, prototypes=prototypes)
+        result_list = (check_matrix_row(args) for args in data)
+    max_count = sum(len(prototype_indices) for _, prototype_indices in rows)
+    current_count = 0
+    for (tree_index, _), cells in zip(rows, result_list):
+        for prototype_index in sorted(cells):
+            dump = {
+                "meta": {
+                    "date": "%s" % datetime.datetime.now()
+                },
+                "data": {
+                    "files": [tree_paths[tree_index]],
+                    "prototypes": [tree_paths[prototype_index]],
+                    "version": version,
+                    "results": cells[prototype_index]
+                }
+            }
+            filename = "%s/%s.json" % (
+                options.output_path, "%d_%d" % (tree_index, prototype_index))
+            with open(filename, "w") as output_file:
+                print(json.dumps(dump, indent=2), file=output_file)
+        current_count += len(cells)
+        print("finished %d / %d cells" % (current_count, max_count))
 
 
 def check_algorithms(tree_paths=None, prototype_paths=None,
@@ -333,28 +548,30 @@ def check_algorithms(tree_paths=None, prototype_paths=None,
             prototypes.append(tree_builder.build(path))
 
     if options.pcount > 1:
-        for configuration in configurations:
+        for configuration_index, configuration in enumerate(configurations):
             data = []
             try:
                 event_streamers = configuration["event_streamer"]
             except KeyError:
                 event_streamers = [GNMCSVEventStreamer]
-            for algorithm in configuration["algorithms"]:
-                for signature in configuration["signatures"]:
+            for algorithm_index, _ in enumerate(configuration["algorithms"]):
+                for signature_index, _ in enumerate(configuration["signatures"]):
                     for path in tree_paths:
                         data.append({
-                            "algorithm": algorithm,  # TODO: CR contains algorithm
-                            "signature": signature,  # TODO: CR contains signature
-                            "decorator": configuration["decorator"],
+                            # TODO: CR contains algorithm and signature
+                            "configuration": configuration_index,
+                            "algorithm": algorithm_index,
+                            "signature": signature_index,
                             "tree": path,
-                            "prototypes": prototypes,
-                            "prototype_signature": prototype_signature,
                             "event_streamers": event_streamers
                         })
+            # prototypes are shipped to the workers only once
             result_list = do_multicore(
                 count=options.pcount,
                 target=check_single_algorithm,
-                data=data)
+                data=data,
+                initializer=init_worker,
+                initargs=(configurations, prototypes, prototype_signature))
             decorator = None
             for result in result_list:
                 if decorator is not None:
@@ -402,8 +619,7 @@ def check_algorithms(tree_paths=None, prototype_paths=None,
                         for path in tree_paths:
                             alg.start_tree()
                             streamer = event_streamer(csv_path=path)
-                            for event in streamer:
-                                alg.add_event(event=event)
+                            alg.add_events(streamer, checkpoint_events=None)
                             alg.finish_tree()
                         results["results"].append({
                             "algorithm": "%s" % alg,
@@ -412,6 +628,8 @@ def check_algorithms(tree_paths=None, prototype_paths=None,
                             else event_streamer(csv_path=None),
                             "decorator": decorator.descriptive_data()
                         })
+        logging.getLogger(__name__).info(
+            "compiled prototypes: %s" % (compiled_prototypes.cache_info(),))
 
     return results
 
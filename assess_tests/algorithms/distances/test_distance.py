@@ -1,13 +1,25 @@
 import unittest
 
 from assess.algorithms.distances.distance import Distance
+from assess.algorithms.distances.simpledistance import SimpleDistance, \
+    SimpleDistance2
+from assess.algorithms.distances.startexitdistance import StartExitDistance, \
+    StartExitDistanceWOAttributes
+from assess.algorithms.distances.startexitsimilarity import StartExitSimilarity
+from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
 from assess.algorithms.signatures.signatures import ParentChildByNameTopologySignature
-from assess.events.events import ProcessExitEvent
+from assess.algorithms.statistics.setstatistics import SetStatistics
+from assess.algorithms.statistics.splittedstatistics import SplittedStatistics
+from assess.decorators.distancematrixdecorator import DistanceMatrixDecorator
+from assess.events.events import ProcessExitEvent, ProcessStartEvent
+from assess.exceptions.exceptions import EventNotSupportedException
 from assess.prototypes.simpleprototypes import Prototype, Tree
 from assess.algorithms.signatures.ensemblesignaturecache import \
     EnsemblePrototypeSignatureCache
 from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
 
+from assess_tests.basedata import random_monitoring_tree
+
 
 def prototype():
     prototype_tree = Prototype()
@@ -65,6 +77,44 @@ def algorithm(signature):
     return test
 
 
+def assert_equal_distances(test_case, distances, prototypes, trees, signature,
+                           cache_statistics=SplittedStatistics):
+    """
+    Method runs an algorithm for each of the given *distances* on the events of
+    *trees* and asserts that results of all events, current distances, and the
+    resulting distance matrices are equal.
+
+    :param test_case: Test case to assert with
+    :param distances: Factories for distances to compare
+    :param prototypes: Prototypes to compare trees with
+    :param trees: Trees whose events are monitored
+    :param signature: Signature for the algorithms
+    :param cache_statistics: Statistics for the signature caches
+    """
+    results = []
+    for distance in distances:
+        algorithm = IncrementalDistanceAlgorithm(
+            signature=signature, distance=distance,
+            cache_statistics=cache_statistics)
+        decorator = DistanceMatrixDecorator(normalized=False)
+        decorator.wrap_algorithm(algorithm)
+        algorithm.prototypes = prototypes
+        result = []
+        for tree in trees:
+            algorithm.start_tree()
+            for event in tree.event_iter(supported=algorithm.supported):
+                try:
+                    result.append(algorithm.add_event(event))
+                except EventNotSupportedException:
+                    pass
+            result.append(algorithm.distance.current_distance())
+            algorithm.finish_tree()
+        result.append(decorator.data())
+        results.append(result)
+    for result in results[1:]:
+        test_case.assertEqual(results[0], result)
+
+
 class TestDistance(unittest.TestCase):
     def test_creation(self):
         test_algorithm = algorithm(ParentChildByNameTopologySignature())
@@ -108,3 +158,54 @@ class TestDistance(unittest.TestCase):
             distance._add_result_dicts([{"1": 2, "2": 0}], [{"1": -1, "3": -.5}]),
             [{"1": 1, "2": 0, "3": -.5}]
         )
+
+    def test_update_distance_many(self):
+        prototypes = [random_monitoring_tree(node_count=50, seed=seed, name_count=5)
+                      for seed in range(3)]
+        for distance_cls in [SimpleDistance, SimpleDistance2, StartExitDistance,
+                             StartExitDistanceWOAttributes, StartExitSimilarity]:
+            test_algorithm = IncrementalDistanceAlgorithm(
+                signature=ParentChildByNameTopologySignature(),
+                distance=distance_cls,
+                cache_statistics=SetStatistics
+            )
+            test_algorithm.prototypes = prototypes
+            signature_prototypes = test_algorithm.signature_prototypes
+            events = [(ProcessStartEvent, 0), (ProcessExitEvent, 2)]
+            if distance_cls not in (StartExitDistanceWOAttributes,
+                                    StartExitSimilarity):
+                # values of None can not be stored by SetStatistics
+                events.append((ProcessExitEvent, None))
+            for event_type, value in events:
+                single = distance_cls()
+                single.init_distance(prototypes, signature_prototypes)
+                many = distance_cls()
+                many.init_distance(prototypes, signature_prototypes)
+                for prototype_cache in signature_prototypes:
+                    for token in prototype_cache:
+                        matches = [{token: prototype_cache.get(signature=token)}]
+                        for count in [0, 1, 3, 2]:
+                            for _ in range(count):
+                                single.update_distance(
+                                    prototypes, signature_prototypes,
+                                    event_type=event_type, matches=matches,
+                                    value=value)
+                            many.update_distance_many(
+                                prototypes, signature_prototypes,
+                                event_type=event_type, matches=matches,
+                                count=count, value=value)
+                single.finish_distance(prototypes, signature_prototypes)
+                many.finish_distance(prototypes, signature_prototypes)
+                self.assertEqual(single.event_count(), many.event_count())
+                for expected, result in zip(
+                        single.distance_for_prototypes(prototypes),
+                        many.distance_for_prototypes(prototypes)):
+                    for expected_value, result_value in zip(expected, result):
+                        self.assertAlmostEqual(expected_value, result_value)
+
+    def test_lower_count(self):
+        self.assertEqual(0, Distance._lower_count(3, 3, count=5))
+        self.assertEqual(2, Distance._lower_count(1, 3, count=5))
+        self.assertEqual(3, Distance._lower_count(1, 3.5, count=5))
+        self.assertEqual(5, Distance._lower_count(1, 3, count=5, step=0))
+        self.assertEqual(1, Distance._lower_count(0, 3, count=1))
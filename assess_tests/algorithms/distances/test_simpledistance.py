@@ -1,8 +1,14 @@
 import unittest
+import functools
 
 from assess.algorithms.distances.simpledistance import SimpleDistance2, SimpleDistance
-from assess.algorithms.signatures.signatures import ParentChildByNameTopologySignature
-from assess_tests.algorithms.distances.test_distance import algorithm, monitoring_tree
+from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
+from assess.algorithms.signatures.signatures import ParentChildByNameTopologySignature, \
+    ParentSiblingSignature
+from assess_tests.algorithms.distances.test_distance import algorithm, \
+    monitoring_tree, assert_equal_distances
+from assess_tests.basedata import simple_prototype, simple_monitoring_tree, \
+    simple_additional_monitoring_tree, simple_unique_node_tree
 
 
 class TestSimpleDistance(unittest.TestCase):
@@ -79,3 +85,17 @@ class TestSimpleDistance(unittest.TestCase):
             prototypes=self.algorithm.prototypes,
             signature_prototypes=self.algorithm.signature_prototypes)
         self.assertEqual(result, distance._monitoring_results_dict)
+
+    def test_lazy(self):
+        prototypes = [
+            simple_prototype(), simple_monitoring_tree(),
+            simple_additional_monitoring_tree(), simple_unique_node_tree()]
+        assert_equal_distances(
+            self,
+            distances=[functools.partial(SimpleDistance, lazy=lazy)
+                       for lazy in [False, True]],
+            prototypes=prototypes,
+            trees=[simple_monitoring_tree(), simple_additional_monitoring_tree()],
+            signature=EnsembleSignature(signatures=[
+                ParentChildByNameTopologySignature(),
+                ParentSiblingSignature(width=2)]))
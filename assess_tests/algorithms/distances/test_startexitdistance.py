@@ -1,6 +1,8 @@
 import unittest
+import functools
 
-from assess.algorithms.distances.startexitdistance import StartExitDistance
+from assess.algorithms.distances.startexitdistance import StartExitDistance, \
+    StartExitDistanceWOAttributes
 from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
 from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
 from assess.algorithms.signatures.signatures import ParentSiblingSignature, \
@@ -13,7 +15,9 @@ from assess.events.events import TrafficEvent, ProcessStartEvent, ProcessExitEve
 from assess.exceptions.exceptions import EventNotSupportedException
 from assess.prototypes.simpleprototypes import Tree, Prototype
 
-from assess_tests.basedata import real_tree, simple_prototype, simple_monitoring_tree
+from assess_tests.basedata import real_tree, simple_prototype, simple_monitoring_tree, \
+    simple_additional_monitoring_tree, simple_unique_node_tree
+from assess_tests.algorithms.distances.test_distance import assert_equal_distances
 
 
 class TestStartExitDistance(unittest.TestCase):
@@ -128,3 +132,20 @@ class TestStartExitDistance(unittest.TestCase):
             algorithm.add_events(tree.event_iter(supported=algorithm.supported))
             algorithm.finish_tree()
             self.assertEqual(result, decorator.data()[0][0][0])
+
+    def test_vectorized(self):
+        prototypes = [
+            simple_prototype(), simple_monitoring_tree(),
+            simple_additional_monitoring_tree(), simple_unique_node_tree()]
+        for distance_cls, kwargs in [
+                (StartExitDistance, {"weight": 1}), (StartExitDistance, {"weight": .5}),
+                (StartExitDistance, {"weight": 0}), (StartExitDistanceWOAttributes, {})]:
+            assert_equal_distances(
+                self,
+                distances=[functools.partial(distance_cls, vectorized=vectorized, **kwargs)
+                           for vectorized in [False, True]],
+                prototypes=prototypes,
+                trees=[simple_monitoring_tree(), simple_prototype()],
+                signature=EnsembleSignature(signatures=[
+                    ParentChildByNameTopologySignature(),
+                    ParentSiblingSignature(width=2)]))
@@ -0,0 +1,201 @@
+import unittest
+
+from assess.algorithms.distances.simpledistance import SimpleDistance
+from assess.algorithms.distances.startexitdistance import StartExitDistance
+from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
+from assess.algorithms.signatures.columnarsignaturecache import \
+    ColumnarPrototypeSignatureCache
+from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
+from assess.algorithms.signatures.signaturecache import SignatureCache, \
+    PrototypeSignatureCache
+from assess.algorithms.signatures.signatures import ParentChildByNameTopologySignature, \
+    ParentSiblingSignature
+from assess.algorithms.statistics.setstatistics import SetStatistics
+from assess.events.events import ProcessStartEvent, ProcessExitEvent, TrafficEvent
+from assess.exceptions.exceptions import EventNotSupportedException
+
+from assess_tests.basedata import simple_prototype, simple_monitoring_tree, \
+    simple_additional_monitoring_tree, simple_unique_node_tree
+
+
+class TestColumnarPrototypeSignatureCache(unittest.TestCase):
+    def test_creation(self):
+        cache = ColumnarPrototypeSignatureCache()
+        self.assertIsNotNone(cache)
+        self.assertEqual(cache.multiplicity(), 0)
+        self.assertEqual(len(cache.internal()), 0)
+        self.assertEqual(cache.get(signature="test"), dict())
+
+    def test_count(self):
+        cache = ColumnarPrototypeSignatureCache(supported={object: True})
+        self.assertEqual(cache.node_count(), 0)
+        cache["test", "1", object] = {"value": 0}
+        self.assertEqual(cache.node_count(), 1)
+        self.assertEqual(cache.node_count(prototype="1"), 1)
+        self.assertEqual(cache.node_count(prototype="2"), 0)
+        cache["test", "2", object] = {"value": 0}
+        self.assertEqual(cache.node_count(prototype="1"), 1)
+        self.assertEqual(cache.node_count(prototype="2"), 1)
+        cache["hello", "1", object] = {"value": 0}
+        self.assertEqual(cache.node_count(), 2)
+        self.assertEqual(len(cache.get(signature="test")), 2)
+        self.assertEqual(cache.get(
+            signature="test")["1"][object]["value"].count(), 1)
+        self.assertEqual(cache.get(
+            signature="test")["2"][object]["value"].count(), 1)
+        self.assertEqual(len(cache.get(signature="muh")), 0)
+        # adding after reading
+        cache["test", "1", object] = {"value": 0}
+        self.assertEqual(cache.get(
+            signature="test")["1"][object]["value"].count(), 2)
+        self.assertEqual(cache.multiplicity(signature="test"), 3)
+
+    def test_frequency(self):
+        cache = ColumnarPrototypeSignatureCache(supported={
+            ProcessStartEvent: True, ProcessExitEvent: True})
+        cache["test", "1", ProcessStartEvent] = {"value": 0}
+        cache["test", "1", ProcessExitEvent] = {"value": 1}
+        cache["hello", "1", ProcessExitEvent] = {"value": 1}
+        cache["test", "2", ProcessStartEvent] = {"value": 0}
+        cache["test", "2", TrafficEvent] = {"value": 0}
+        self.assertEqual(4, cache.multiplicity())
+        self.assertEqual(2, cache.multiplicity(event_type=ProcessStartEvent))
+        self.assertEqual(3, cache.multiplicity(signature="test"))
+        self.assertEqual(
+            {ProcessStartEvent: 1, ProcessExitEvent: 2},
+            cache.multiplicity(prototype="1", by_event=True))
+        self.assertEqual(
+            1, cache.multiplicity(signature="test", prototype="2"))
+        self.assertEqual(
+            [ProcessStartEvent], list(cache.get(signature="test")["2"]))
+        self.assertEqual(1, cache.get_statistics(
+            signature="hello", key="value", event_type=ProcessExitEvent,
+            prototype="1").count())
+        self.assertEqual(0, cache.get_statistics(
+            signature="hello", key="value", event_type=ProcessStartEvent,
+            prototype="1").count())
+
+    def test_views(self):
+        cache = ColumnarPrototypeSignatureCache(supported={object: True})
+        cache["test", "1", object] = {"value": 0}
+        view = cache.get(signature="test")
+        self.assertIs(view, cache.get(signature="test"))
+        # views are dropped when values are added
+        cache["test", "2", object] = {"value": 0}
+        self.assertEqual(["1", "2"], list(cache.get(signature="test")))
+        self.assertEqual({}, cache.get(signature="muh"))
+
+        cache = ColumnarPrototypeSignatureCache(
+            supported={object: True}, view_cache_size=1)
+        cache["test", "1", object] = {"value": 0}
+        cache["hello", "1", object] = {"value": 0}
+        view = cache.get(signature="test")
+        cache.get(signature="hello")
+        self.assertIsNot(view, cache.get(signature="test"))
+        self.assertEqual(view, cache.get(signature="test"))
+
+        # views are bounded by default
+        cache = ColumnarPrototypeSignatureCache(supported={object: True})
+        for index in range(cache.view_cache_size + 10):
+            cache["test_%d" % index, "1", object] = {"value": 0}
+        for signature in cache:
+            cache.get(signature=signature)
+        self.assertEqual(cache.view_cache_size, len(cache._views))
+        cache = ColumnarPrototypeSignatureCache(
+            supported={object: True}, view_cache_size=None)
+        cache["test", "1", object] = {"value": 0}
+        cache["hello", "1", object] = {"value": 0}
+        for signature in cache:
+            cache.get(signature=signature)
+        self.assertEqual(2, len(cache._views))
+
+    def test_from_signature_caches(self):
+        supported = {ProcessStartEvent: True, ProcessExitEvent: True}
+        signature = ParentChildByNameTopologySignature()
+        signature_caches = [
+            tree.to_index(signature, cache=SignatureCache(
+                supported=supported, statistics_cls=SetStatistics))
+            for tree in [simple_prototype(), simple_monitoring_tree(),
+                         simple_additional_monitoring_tree()]]
+        expected = PrototypeSignatureCache.from_signature_caches(
+            signature_caches, prototype=1, threshold=.5)
+        cache = ColumnarPrototypeSignatureCache.from_signature_caches(
+            signature_caches, prototype=1, threshold=.5)
+        self.assertEqual(3, cache.signature_cache_count)
+        self.assertEqual(expected.node_count(prototype=1), cache.node_count(prototype=1))
+        # averaged multiplicities are not integers
+        self.assertNotEqual(
+            int(cache.multiplicity(prototype=1)), cache.multiplicity(prototype=1))
+        self.assertAlmostEqual(
+            expected.multiplicity(prototype=1), cache.multiplicity(prototype=1))
+        for token in expected:
+            self.assertAlmostEqual(
+                expected.multiplicity(signature=token, prototype=1),
+                cache.multiplicity(signature=token, prototype=1))
+            self.assertEqual(
+                expected.get(signature=token)[1]["probability"],
+                cache.get(signature=token)[1]["probability"])
+        self.assertEqual(sorted(expected), sorted(cache))
+
+        # averaged caches can be merged
+        merged = ColumnarPrototypeSignatureCache(
+            supported=supported, statistics_cls=SetStatistics)
+        merged += cache
+        self.assertEqual(sorted(cache), sorted(merged))
+        self.assertAlmostEqual(
+            cache.multiplicity(prototype=1), merged.multiplicity(prototype=1))
+        for token in cache:
+            self.assertEqual(
+                cache.get(signature=token)[1]["probability"],
+                merged.get(signature=token)[1]["probability"])
+
+    def test_merging(self):
+        cache = ColumnarPrototypeSignatureCache(supported={object: True})
+        cache["test", "1", object] = {"value": 0}
+        other = ColumnarPrototypeSignatureCache(supported={object: True})
+        other["test", "1", object] = {"value": 0}
+        other["test", "2", object] = {"value": 0}
+        other["hello", "2", object] = {"value": 0}
+        cache += other
+        self.assertEqual(3, cache.multiplicity())
+        self.assertEqual(2, cache.node_count(prototype="2"))
+        self.assertEqual(["1", "2"], list(cache.get(signature="test")))
+
+    def test_distances(self):
+        class ColumnarSignature(ParentChildByNameTopologySignature):
+            prototype_signature_cache_class = ColumnarPrototypeSignatureCache
+
+        def distance(**kwargs):
+            return StartExitDistance(weight=.5, **kwargs)
+
+        prototypes = [
+            simple_prototype(), simple_monitoring_tree(),
+            simple_additional_monitoring_tree(), simple_unique_node_tree()]
+        for distance_cls, statistics_cls in [
+                (SimpleDistance, SetStatistics), (distance, SetStatistics)]:
+            results = []
+            for signatures in [
+                    [ParentChildByNameTopologySignature(),
+                     ParentSiblingSignature(width=2)],
+                    [ColumnarSignature(), ParentSiblingSignature(width=2)]]:
+                algorithm = IncrementalDistanceAlgorithm(
+                    signature=EnsembleSignature(signatures=signatures),
+                    distance=distance_cls,
+                    cache_statistics=statistics_cls
+                )
+                algorithm.prototypes = prototypes
+                result = [algorithm.prototype_event_counts(by_event=True),
+                          algorithm.prototype_node_counts(signature=True)]
+                for tree in [simple_monitoring_tree(), simple_prototype()]:
+                    algorithm.start_tree()
+                    for event in tree.event_iter(supported=algorithm.supported):
+                        try:
+                            result.append(algorithm.add_event(event))
+                        except EventNotSupportedException:
+                            pass
+                    algorithm.finish_tree()
+                results.append(result)
+            self.assertEqual(results[0], results[1])
+            self.assertIsInstance(
+                algorithm.signature_prototypes._prototype_dict[0],
+                ColumnarPrototypeSignatureCache)
@@ -0,0 +1,113 @@
+import unittest
+
+from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
+from assess.algorithms.treedistancealgorithm import TreeDistanceAlgorithm
+from assess.algorithms.distances.startexitdistance import StartExitDistance
+from assess.algorithms.signatures.compiledprototypecache import \
+    CompiledPrototypeCache, compiled_prototypes
+from assess.algorithms.signatures.signatures import \
+    ParentChildByNameTopologySignature, ParentChildOrderTopologySignature
+from assess.algorithms.signatures.symboltable import SymbolTable
+from assess.events.events import ProcessStartEvent, ProcessExitEvent, TrafficEvent
+
+from assess_tests.basedata import simple_prototype, simple_monitoring_tree
+
+
+class TestCompiledPrototypeCache(unittest.TestCase):
+    def setUp(self):
+        compiled_prototypes.clear()
+        compiled_prototypes.maxsize = 1000
+
+    def tearDown(self):
+        compiled_prototypes.clear()
+        compiled_prototypes.maxsize = 0
+
+    @staticmethod
+    def _compile(prototypes, signature):
+        algorithm = TreeDistanceAlgorithm(signature=signature)
+        algorithm.prototypes = prototypes
+        return algorithm.signature_prototypes
+
+    def test_lru(self):
+        supported = {ProcessStartEvent: True, TrafficEvent: False}
+        prototypes = [[simple_prototype()] for _ in range(3)]
+        caches = [self._compile(prototype, ParentChildByNameTopologySignature())
+                  for prototype in prototypes]
+        cache = CompiledPrototypeCache(maxsize=8)
+        self.assertIsNone(cache.get(
+            prototypes[0], ParentChildByNameTopologySignature(), supported, None))
+        cache.put(prototypes[0], ParentChildByNameTopologySignature(), supported,
+                  None, caches[0])
+        self.assertEqual(3, cache.cache_info().currsize)
+        self.assertIs(caches[0], cache.get(
+            prototypes[0], ParentChildByNameTopologySignature(),
+            {ProcessStartEvent: True}, None))
+        self.assertIsNone(cache.get(
+            prototypes[0], ParentChildOrderTopologySignature(), supported, None))
+        self.assertIsNone(cache.get(
+            prototypes[0], ParentChildByNameTopologySignature(),
+            {ProcessStartEvent: True, ProcessExitEvent: True}, None))
+        self.assertIsNone(cache.get(
+            prototypes[1], ParentChildByNameTopologySignature(), supported, None))
+        cache.put(prototypes[1], ParentChildByNameTopologySignature(), supported,
+                  None, caches[1])
+        # first entry is used most recently, so second one is evicted
+        cache.get(prototypes[0], ParentChildByNameTopologySignature(), supported,
+                  None)
+        cache.put(prototypes[2], ParentChildByNameTopologySignature(), supported,
+                  None, caches[2])
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get(
+            prototypes[1], ParentChildByNameTopologySignature(), supported, None))
+        self.assertIs(caches[2], cache.get(
+            prototypes[2], ParentChildByNameTopologySignature(), supported, None))
+        self.assertEqual((3, 5, 1, 8, 6), cache.cache_info())
+
+        # caches exceeding the maximum size are not stored
+        cache.maxsize = 2
+        cache.put(prototypes[1], ParentChildByNameTopologySignature(), supported,
+                  None, caches[1])
+        self.assertIsNone(cache.get(
+            prototypes[1], ParentChildByNameTopologySignature(), supported, None))
+        cache.clear()
+        self.assertEqual((0, 0, 0, 2, 0), cache.cache_info())
+
+    def test_algorithms(self):
+        prototypes = [simple_prototype(), simple_monitoring_tree()]
+        cache = self._compile(prototypes, ParentChildByNameTopologySignature())
+        self.assertIs(cache, self._compile(
+            prototypes, ParentChildByNameTopologySignature()))
+        self.assertIsNot(cache, self._compile(
+            prototypes, ParentChildOrderTopologySignature()))
+        self.assertIsNot(cache, self._compile(
+            prototypes[:1], ParentChildByNameTopologySignature()))
+        self.assertEqual((1, 3), compiled_prototypes.cache_info()[:2])
+
+        # supported events of distance differ
+        event_counts = []
+        for maxsize in [0, 1000]:
+            compiled_prototypes.maxsize = maxsize
+            algorithm = IncrementalDistanceAlgorithm(
+                signature=ParentChildByNameTopologySignature(),
+                distance=StartExitDistance)
+            algorithm.prototypes = prototypes
+            self.assertIsNot(cache, algorithm.signature_prototypes)
+            event_counts.append(algorithm.prototype_event_counts())
+        self.assertEqual(event_counts[0], event_counts[1])
+
+        # tokens of symbol tables differ
+        symbol_table = SymbolTable()
+        cache = self._compile(prototypes, ParentChildByNameTopologySignature(
+            symbol_table=symbol_table))
+        self.assertIsNot(cache, self._compile(
+            prototypes, ParentChildByNameTopologySignature(
+                symbol_table=symbol_table)))
+        self.assertEqual((1, 4), compiled_prototypes.cache_info()[:2])
+
+    def test_disabled(self):
+        compiled_prototypes.maxsize = 0
+        prototypes = [simple_prototype()]
+        self.assertIsNot(
+            self._compile(prototypes, ParentChildByNameTopologySignature()),
+            self._compile(prototypes, ParentChildByNameTopologySignature()))
+        self.assertEqual(0, len(compiled_prototypes))
@@ -149,3 +149,37 @@ class TestEnsembleSignatureCache(unittest.TestCase):
             }
         self.assertEqual([3, 4], cache.node_count())
         self.assertEqual([4, 4], cache.multiplicity())
+
+    def test_update_prototype_ensembles(self):
+        signature = EnsembleSignature(
+            signatures=[ParentChildByNameTopologySignature(),
+                        ParentChildOrderTopologySignature()])
+        prototypes = [simple_monitoring_tree(), simple_unique_node_tree()]
+        sequential = signature.prototype_signature_cache_class()
+        caches = []
+        for prototype in prototypes:
+            cache = signature.prototype_signature_cache_class()
+            for node in prototype.nodes():
+                tokens = signature.get_signature(node, parent=node.parent())
+                for current in [cache, sequential]:
+                    current[tokens, prototype, ProcessStartEvent] = {"value": 1}
+            caches.append(cache)
+
+        merged = signature.prototype_signature_cache_class()
+        for cache in caches:
+            merged.update(cache)
+        self.assertEqual(sequential.node_count(), merged.node_count())
+        self.assertEqual(sequential.multiplicity(), merged.multiplicity())
+        for prototype in prototypes:
+            self.assertEqual(sequential.node_count(prototype=prototype),
+                             merged.node_count(prototype=prototype))
+            self.assertEqual(sequential.multiplicity(prototype=prototype),
+                             merged.multiplicity(prototype=prototype))
+        # entries of existing prototypes are skipped
+        merged.update(caches[0])
+        self.assertEqual(sequential.multiplicity(), merged.multiplicity())
+
+        summed = signature.prototype_signature_cache_class()
+        summed += caches[0]
+        self.assertEqual(caches[0].node_count(), summed.node_count())
+        self.assertEqual(caches[0].multiplicity(), summed.multiplicity())
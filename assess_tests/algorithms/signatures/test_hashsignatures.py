@@ -0,0 +1,119 @@
+import unittest
+
+from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
+from assess.algorithms.signatures.hashsignatures import hash64, \
+    HashCollisionCounter, HashParentChildByNameTopologySignature, \
+    HashParentChildOrderTopologySignature, \
+    HashParentChildOrderByNameTopologySignature, \
+    HashParentCountedChildrenByNameTopologySignature, HashParentSiblingSignature
+from assess.algorithms.signatures.signatures import \
+    ParentChildByNameTopologySignature, ParentChildOrderTopologySignature, \
+    ParentChildOrderByNameTopologySignature, \
+    ParentCountedChildrenByNameTopologySignature, ParentSiblingSignature
+from assess.algorithms.signatures.symboltable import SymbolTable
+from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
+from assess.algorithms.distances.simpledistance import SimpleDistance
+from assess.decorators.distancematrixdecorator import DistanceMatrixDecorator
+from assess.exceptions.exceptions import EventNotSupportedException
+
+from assess_tests.basedata import simple_prototype, random_monitoring_tree
+
+
+class TestHashSignatures(unittest.TestCase):
+    signatures = [
+        (ParentChildByNameTopologySignature,
+         HashParentChildByNameTopologySignature, {}),
+        (ParentChildOrderTopologySignature,
+         HashParentChildOrderTopologySignature, {}),
+        (ParentChildOrderByNameTopologySignature,
+         HashParentChildOrderByNameTopologySignature, {}),
+        (ParentCountedChildrenByNameTopologySignature,
+         HashParentCountedChildrenByNameTopologySignature, {"count": 2}),
+        (ParentSiblingSignature, HashParentSiblingSignature, {"width": 2})]
+
+    def test_hash64(self):
+        token = hash64(None, "root")
+        self.assertEqual(token, hash64(None, "root"))
+        self.assertTrue(0 <= token < 2 ** 64)
+        self.assertNotEqual(token, hash64(token, "root"))
+        self.assertNotEqual(hash64(token, "child", ("order", 0)),
+                            hash64(token, "child", ("order", 1)))
+        self.assertEqual(hash64(token, "child", ("order", 1)),
+                         hash64(token, "child", ("order", 1)))
+
+    def test_symbols(self):
+        for signature_cls, hash_signature_cls, kwargs in self.signatures:
+            string_signature = signature_cls(**kwargs)
+            hash_signature = hash_signature_cls(
+                collisions=HashCollisionCounter(), **kwargs)
+            for node in simple_prototype().nodes(include_marker=True):
+                try:
+                    expected = string_signature.get_signature(node, node.parent())
+                    token = hash_signature.get_signature(node, node.parent())
+                    self.assertIsInstance(token, int)
+                    self.assertEqual(expected, hash_signature.symbol(token))
+                except AttributeError:
+                    expected = string_signature.finish_node(node.parent())
+                    tokens = hash_signature.finish_node(node.parent())
+                    self.assertEqual(
+                        expected, [hash_signature.symbol(token) for token in tokens])
+            self.assertEqual(0, hash_signature.collisions)
+
+    def test_partition(self):
+        # nodes sharing a transition must share a hash and vice versa
+        for signature_cls, hash_signature_cls, kwargs in self.signatures:
+            string_signature = signature_cls(symbol_table=SymbolTable(), **kwargs)
+            hash_signature = hash_signature_cls(**kwargs)
+            self.assertIsNone(hash_signature.collisions)
+            self.assertTrue(hash_signature.stateless)
+            mapping = {}
+            for node in random_monitoring_tree(node_count=300, seed=1).nodes():
+                expected = string_signature.get_signature(node, node.parent())
+                token = hash_signature.get_signature(node, node.parent())
+                self.assertEqual(token, hash_signature.symbol(token))
+                self.assertEqual(token, mapping.setdefault(expected, token))
+            self.assertEqual(len(mapping), len(set(mapping.values())))
+
+    def test_collisions(self):
+        class CollidingSignature(HashParentChildOrderTopologySignature):
+            @staticmethod
+            def _hash(parent_token, name, extra):
+                return hash64(parent_token, name, extra) % 4
+
+        counter = HashCollisionCounter()
+        signature = CollidingSignature(collisions=counter)
+        tree = simple_prototype()
+        for node in tree.nodes():
+            signature.get_signature(node, node.parent())
+        self.assertEqual(signature.collisions, counter.collisions)
+        self.assertFalse(signature.stateless)
+        self.assertGreater(counter.collisions, 0)
+        self.assertLessEqual(len(counter), 4)
+
+    def test_ensemble(self):
+        # the string representation might collide as well, so compare to the
+        # tokens of a symbol table that are unique per transition
+        results = []
+        symbol_table = SymbolTable()
+        for signatures in [
+                [ParentChildByNameTopologySignature(symbol_table=symbol_table),
+                 ParentCountedChildrenByNameTopologySignature(
+                     count=3, symbol_table=symbol_table)],
+                [HashParentChildByNameTopologySignature(),
+                 HashParentCountedChildrenByNameTopologySignature(count=3)]]:
+            algorithm = IncrementalDistanceAlgorithm(
+                signature=EnsembleSignature(signatures=signatures),
+                distance=SimpleDistance)
+            decorator = DistanceMatrixDecorator(normalized=False)
+            decorator.wrap_algorithm(algorithm)
+            algorithm.prototypes = [simple_prototype()]
+            algorithm.start_tree()
+            for event in random_monitoring_tree(seed=2).event_iter(
+                    supported=algorithm.supported):
+                try:
+                    algorithm.add_event(event)
+                except EventNotSupportedException:
+                    pass
+            algorithm.finish_tree()
+            results.append(decorator.data())
+        self.assertEqual(results[0], results[1])
@@ -2,6 +2,8 @@ import unittest
 
 from assess.algorithms.signatures.pqgramsignature import PQGramSignature
 
+from assess.prototypes.simpleprototypes import Prototype
+
 from assess_tests.basedata import simple_prototype
 
 
@@ -46,3 +48,22 @@ class TestPQGramSignatureFunctionalities(unittest.TestCase):
         self.assertEqual(
             {'__root__', 'root__test__', 'root__muh_test_', 'root__test_muh_test',
              'root__muh_test_muh', 'root___muh_test', 'root___muh'}, signatures)
+
+    def test_ancestor_part(self):
+        tree = Prototype()
+        node = tree.add_node("0", tme=0, exit_tme=10, pid=1, ppid=0)
+        for index in range(1, 5):
+            node = node.add_node(
+                str(index), tme=index, exit_tme=10, pid=index + 1, ppid=index)
+        self.assertEqual("4_3_2", PQGramSignature.ancestor_part(node, 3))
+        self.assertEqual("3_2_1", PQGramSignature.ancestor_part(node.parent(), 3))
+        self.assertEqual("1_0_", PQGramSignature.ancestor_part(
+            tree.root().children_list()[0], 3))
+        self.assertEqual("__", PQGramSignature.ancestor_part(None, 3))
+        self.assertEqual("", PQGramSignature.ancestor_part(node, 0))
+
+        signature = PQGramSignature(height=3, width=1)
+        self.assertEqual("3_2_1_4_", signature.get_signature(node, node.parent()))
+        self.assertEqual(["3_2_1__4"], signature.finish_node(node.parent()))
+        self.assertEqual(["3__4"], PQGramSignature(height=0, width=1).finish_node(
+            node.parent()))
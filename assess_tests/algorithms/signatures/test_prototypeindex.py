@@ -0,0 +1,153 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
+from assess.algorithms.distances.simpledistance import SimpleDistance
+from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
+from assess.algorithms.signatures.hashsignatures import \
+    HashParentChildOrderTopologySignature
+from assess.algorithms.signatures.prototypeindex import PrototypeIndex, \
+    IndexedPrototype
+from assess.algorithms.signatures.signatures import \
+    ParentChildByNameTopologySignature, \
+    ParentCountedChildrenByNameTopologySignature
+from assess.decorators.distancematrixdecorator import DistanceMatrixDecorator
+from assess.events.events import ProcessStartEvent, ProcessExitEvent
+from assess.exceptions.exceptions import EventNotSupportedException, \
+    PrototypeIndexFormatException
+
+from assess_tests.basedata import simple_prototype, random_monitoring_tree
+
+
+class TestPrototypeIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "prototypes.index")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @staticmethod
+    def _signatures():
+        return [ParentChildByNameTopologySignature(),
+                ParentCountedChildrenByNameTopologySignature(count=2),
+                HashParentChildOrderTopologySignature()]
+
+    def _algorithm(self, prototypes):
+        algorithm = IncrementalDistanceAlgorithm(
+            signature=EnsembleSignature(signatures=self._signatures()),
+            distance=SimpleDistance)
+        algorithm.prototypes = prototypes
+        return algorithm
+
+    def test_write(self):
+        prototypes = [simple_prototype()] + [
+            random_monitoring_tree(node_count=100, seed=seed) for seed in range(3)]
+        algorithm = self._algorithm(prototypes)
+        with PrototypeIndex.write(
+                self.path, algorithm.signature_prototypes, algorithm.prototypes,
+                names=["simple", "a", "b", "c"]) as index:
+            self.assertEqual(["simple", "a", "b", "c"],
+                             [prototype.name for prototype in index.prototypes])
+            self.assertEqual([prototype.node_count() for prototype in prototypes],
+                             [prototype.node_count() for prototype in
+                              index.prototypes])
+            self.assertEqual(3, len(index.caches))
+            for cache, index_cache in zip(
+                    algorithm.signature_prototypes, index.caches):
+                self.assertEqual(list(cache), list(index_cache))
+                self.assertEqual(len(cache), len(index_cache))
+                self.assertEqual(cache.node_count(), index_cache.node_count())
+                for event_type in [None, ProcessStartEvent, ProcessExitEvent]:
+                    self.assertEqual(cache.multiplicity(event_type=event_type),
+                                     index_cache.multiplicity(event_type=event_type))
+                for prototype, index_prototype in zip(
+                        prototypes, index.prototypes):
+                    self.assertEqual(
+                        cache.node_count(prototype=prototype),
+                        index_cache.node_count(prototype=index_prototype))
+                    self.assertEqual(
+                        cache.multiplicity(prototype=prototype, by_event=True),
+                        index_cache.multiplicity(
+                            prototype=index_prototype, by_event=True))
+                for signature in cache:
+                    self.assertTrue(signature in index_cache)
+                    self.assertEqual(cache.multiplicity(signature=signature),
+                                     index_cache.multiplicity(signature=signature))
+                    values = cache.get(signature)
+                    index_values = index_cache.get(signature)
+                    self.assertEqual(len(values), len(index_values))
+                    for prototype, index_prototype in zip(
+                            prototypes, index.prototypes):
+                        self.assertEqual(
+                            prototype in values, index_prototype in index_values)
+                        self.assertEqual(
+                            pickle.dumps(values.get(prototype)),
+                            pickle.dumps(index_values.get(index_prototype)))
+                        self.assertEqual(
+                            cache.multiplicity(
+                                signature=signature, prototype=prototype,
+                                event_type=ProcessExitEvent),
+                            index_cache.multiplicity(
+                                signature=signature, prototype=index_prototype,
+                                event_type=ProcessExitEvent))
+                self.assertFalse("unknown" in index_cache)
+                self.assertEqual({}, index_cache.get("unknown"))
+                self.assertEqual(0, index_cache.multiplicity(signature="unknown"))
+
+    def test_distances(self):
+        prototypes = [simple_prototype()] + [
+            random_monitoring_tree(node_count=100, seed=seed) for seed in range(3)]
+        PrototypeIndex.write(
+            self.path, self._algorithm(prototypes).signature_prototypes,
+            prototypes).close()
+        results = []
+        for value in [prototypes, PrototypeIndex(self.path)]:
+            algorithm = IncrementalDistanceAlgorithm(
+                signature=EnsembleSignature(signatures=self._signatures()),
+                distance=SimpleDistance)
+            decorator = DistanceMatrixDecorator(normalized=False)
+            decorator.wrap_algorithm(algorithm)
+            algorithm.prototypes = value
+            for seed in range(10, 12):
+                algorithm.start_tree()
+                for event in random_monitoring_tree(seed=seed).event_iter(
+                        supported=algorithm.supported):
+                    try:
+                        algorithm.add_event(event)
+                    except EventNotSupportedException:
+                        pass
+                algorithm.finish_tree()
+            results.append(decorator.data())
+        self.assertEqual(results[0], results[1])
+
+    def test_pickle(self):
+        prototypes = [simple_prototype()]
+        with PrototypeIndex.write(
+                self.path, self._algorithm(prototypes).signature_prototypes,
+                prototypes) as index:
+            with pickle.loads(pickle.dumps(index)) as loaded:
+                self.assertEqual(index.prototypes, loaded.prototypes)
+                for cache, loaded_cache in zip(index.caches, loaded.caches):
+                    self.assertEqual(list(cache), list(loaded_cache))
+            loaded_cache = pickle.loads(pickle.dumps(index.caches[1]))
+            self.assertEqual(list(index.caches[1]), list(loaded_cache))
+            self.assertEqual(IndexedPrototype("0", 0, 9), index.prototypes[0])
+
+    def test_invalid(self):
+        for data in [b"", b"ASSESSPI", b"ASSESSXX" + b"\0" * 40]:
+            with open(self.path, "wb") as index_file:
+                index_file.write(data)
+            self.assertRaises(
+                PrototypeIndexFormatException, PrototypeIndex, self.path)
+        prototypes = [simple_prototype()]
+        PrototypeIndex.write(
+            self.path, self._algorithm(prototypes).signature_prototypes,
+            prototypes).close()
+        algorithm = IncrementalDistanceAlgorithm(
+            signature=ParentChildByNameTopologySignature())
+        with PrototypeIndex(self.path) as index:
+            with self.assertRaises(ValueError):
+                algorithm.prototypes = index
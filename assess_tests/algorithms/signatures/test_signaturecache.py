@@ -9,7 +9,7 @@ from assess.algorithms.signatures.signatures import ParentChildByNameTopologySig
 from assess.algorithms.statistics.setstatistics import SetStatistics
 from assess.events.events import ProcessStartEvent, ProcessExitEvent, TrafficEvent
 from assess_tests.basedata import simple_additional_monitoring_tree, \
-    simple_prototype, real_tree
+    simple_prototype, real_tree, random_monitoring_tree
 
 from assess.algorithms.statistics.statistics import MeanVariance
 
@@ -43,6 +43,22 @@ class TestSignatureCache(unittest.TestCase):
         cache["hello", object] = {"value": 0}
         self.assertEqual(cache.multiplicity(), 3)
 
+    def test_frequency_by_event(self):
+        cache = SignatureCache(supported={
+            ProcessStartEvent: True, ProcessExitEvent: True})
+        self.assertEqual(
+            {ProcessStartEvent: 0, ProcessExitEvent: 0},
+            cache.multiplicity(by_event=True))
+        cache["test", ProcessStartEvent] = {"value": 0}
+        cache["test", ProcessExitEvent] = {"value": 1}
+        cache["hello", ProcessExitEvent] = {"value": 2}
+        self.assertEqual(
+            {ProcessStartEvent: 1, ProcessExitEvent: 2},
+            cache.multiplicity(by_event=True))
+        self.assertEqual(3, cache.multiplicity())
+        self.assertEqual(2, cache.multiplicity(event_type=ProcessExitEvent))
+        self.assertEqual(2, cache.multiplicity(signature="test"))
+
     def test_none(self):
         cache = SignatureCache(supported={object: True})
         cache[None, object] = {"value": 0}
@@ -92,6 +108,99 @@ class TestPrototypeSignatureCache(unittest.TestCase):
         self.assertEqual(cache.multiplicity(prototype="1"), 3)
         self.assertEqual(cache.multiplicity(prototype="2"), 1)
 
+    def test_frequency_by_event(self):
+        cache = PrototypeSignatureCache(supported={
+            ProcessStartEvent: True, ProcessExitEvent: True})
+        cache["test", "1", ProcessStartEvent] = {"value": 0}
+        cache["test", "1", ProcessExitEvent] = {"value": 1}
+        cache["hello", "1", ProcessExitEvent] = {"value": 1}
+        cache["test", "2", ProcessStartEvent] = {"value": 0}
+        cache["test", "2", TrafficEvent] = {"value": 0}
+        self.assertEqual(4, cache.multiplicity())
+        self.assertEqual(2, cache.multiplicity(event_type=ProcessStartEvent))
+        self.assertEqual(
+            {ProcessStartEvent: 1, ProcessExitEvent: 2},
+            cache.multiplicity(prototype="1", by_event=True))
+        self.assertEqual(
+            {ProcessStartEvent: 1, ProcessExitEvent: 0},
+            cache.multiplicity(prototype="2", by_event=True))
+        self.assertEqual(
+            1, cache.multiplicity(prototype="1", event_type=ProcessStartEvent))
+
+        other = PrototypeSignatureCache(supported={
+            ProcessStartEvent: True, ProcessExitEvent: True})
+        other["test", "3", ProcessStartEvent] = {"value": 0}
+        other["test", "3", ProcessStartEvent] = {"value": 0}
+        cache += other
+        self.assertEqual(6, cache.multiplicity())
+        self.assertEqual(2, cache.multiplicity(prototype="3"))
+
+    def test_node_count_by_prototype(self):
+        def scanned(cache, prototype):
+            return sum(1 for value in cache.internal().values() if prototype in value)
+
+        supported = {ProcessStartEvent: True, ProcessExitEvent: True}
+        cache = PrototypeSignatureCache(supported=supported)
+        cache["test", "1", ProcessStartEvent] = {"value": 0}
+        cache["test", "1", ProcessExitEvent] = {"value": 1}
+        cache["hello", "1", ProcessExitEvent] = {"value": 1}
+        cache["test", "2", ProcessStartEvent] = {"value": 0}
+        other = PrototypeSignatureCache(supported=supported)
+        other["test", "2", ProcessStartEvent] = {"value": 0}
+        other["test", "3", ProcessStartEvent] = {"value": 0}
+        other["hello", "3", ProcessExitEvent] = {"value": 0}
+        cache += other
+        self.assertEqual([2, 1, 2], [cache.node_count(prototype=prototype) for
+                                     prototype in ["1", "2", "3"]])
+        updated = PrototypeSignatureCache(supported=supported).update(
+            cache, prototypes={"1": "4", "2": "2", "3": "3"})
+        signature_caches = [SignatureCache(
+            supported=supported, statistics_cls=SetStatistics) for _ in range(2)]
+        signature_caches[0]["test", ProcessStartEvent] = {"value": 0}
+        signature_caches[1]["hello", ProcessExitEvent] = {"value": 1}
+        combined = PrototypeSignatureCache.from_signature_caches(
+            signature_caches, prototype="5", threshold=0)
+        self.assertEqual(2, combined.node_count(prototype="5"))
+        for current in [cache, updated, combined]:
+            for prototype in ["1", "2", "3", "4", "5"]:
+                self.assertEqual(scanned(current, prototype),
+                                 current.node_count(prototype=prototype))
+
+    def test_set_many(self):
+        class RecordingCache(PrototypeSignatureCache):
+            entries = []
+
+            def set_many(self, entries):
+                entries = list(entries)
+                self.entries.extend(entries)
+                PrototypeSignatureCache.set_many(self, entries)
+
+        def summary(cache):
+            return {signature: {prototype: {
+                event_type: [(statistic.mean, statistic.variance, statistic.count)
+                             for statistic in statistics["value"]]
+                for event_type, statistics in events.items()}
+                for prototype, events in value.items()}
+                for signature, value in cache.internal().items()}
+
+        supported = {ProcessStartEvent: True, ProcessExitEvent: True}
+        cache = RecordingCache(supported=supported)
+        for seed in range(3):
+            random_monitoring_tree(node_count=300, seed=seed).to_prototype(
+                signature=ParentChildByNameTopologySignature(), cache=cache,
+                supported=supported)
+        sequential = PrototypeSignatureCache(supported=supported)
+        for key, value in cache.entries:
+            sequential[key] = value
+        self.assertEqual(list(sequential), list(cache))
+        self.assertEqual(summary(sequential), summary(cache))
+        for event_type in [ProcessStartEvent, ProcessExitEvent]:
+            self.assertEqual(sequential.multiplicity(event_type=event_type),
+                             cache.multiplicity(event_type=event_type))
+        self.assertEqual(
+            sequential.node_count(prototype=cache.entries[0][0][1]),
+            cache.node_count(prototype=cache.entries[0][0][1]))
+
     def test_distance(self):
         statistic = MeanVariance()
         self.assertEqual(statistic.count, 0)
@@ -4,7 +4,10 @@ from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
 from assess.algorithms.signatures.signatures import Signature, \
     ParentChildByNameTopologySignature, ParentChildOrderTopologySignature, \
     ParentChildOrderByNameTopologySignature, \
-    ParentCountedChildrenByNameTopologySignature
+    ParentCountedChildrenByNameTopologySignature, ParentSiblingSignature
+from assess.algorithms.signatures.pqgramsignature import PQGramSignature
+from assess.algorithms.signatures.pqordersignature import PQOrderSignature
+from assess.algorithms.signatures.symboltable import SymbolTable
 from assess.prototypes.simpleprototypes import Prototype
 from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
 from assess.decorators.distancematrixdecorator import DistanceMatrixDecorator
@@ -12,7 +15,8 @@ from assess.decorators.datadecorator import DataDecorator
 from assess.exceptions.exceptions import EventNotSupportedException
 from assess.algorithms.distances.simpledistance import SimpleDistance
 
-from assess_tests.basedata import simple_prototype, real_tree
+from assess_tests.basedata import simple_prototype, real_tree, \
+    random_monitoring_tree
 
 
 class TestSignatureFunctionalities(unittest.TestCase):
@@ -211,3 +215,133 @@ class TestSignatureFunctionalities(unittest.TestCase):
             "prototypes", {}).get("converted", []) for tree_value in values],
             [tree_value for values in data_decorator.data().get(
              "monitoring", {}).get("converted", []) for tree_value in values])
+
+    def test_symbol_table(self):
+        for signature_cls, kwargs in [
+                (ParentChildByNameTopologySignature, {}),
+                (ParentChildOrderTopologySignature, {}),
+                (ParentChildOrderByNameTopologySignature, {}),
+                (ParentCountedChildrenByNameTopologySignature, {"count": 2}),
+                (ParentSiblingSignature, {"width": 2})]:
+            string_signature = signature_cls(**kwargs)
+            token_signature = signature_cls(symbol_table=SymbolTable(), **kwargs)
+            for node in simple_prototype().nodes(include_marker=True):
+                try:
+                    expected = string_signature.get_signature(node, node.parent())
+                    token = token_signature.get_signature(node, node.parent())
+                    self.assertIsInstance(token, int)
+                    self.assertEqual(expected, token_signature.symbol(token))
+                except AttributeError:
+                    expected = string_signature.finish_node(node.parent())
+                    tokens = token_signature.finish_node(node.parent())
+                    self.assertEqual(
+                        expected, [token_signature.symbol(token) for token in tokens])
+
+    def test_sibling_window(self):
+        def wide_tree():
+            tree = Prototype()
+            root = tree.add_node("root", pid=1, ppid=0, tme=0, exit_tme=5)
+            for index in range(50):
+                node = root.add_node("name_%d" % (index % 3), pid=index + 2,
+                                     ppid=1, tme=0, exit_tme=1)
+                if index % 7 == 3:
+                    node.attribute = True
+            return tree
+
+        for signature_cls, kwargs in [
+                (ParentCountedChildrenByNameTopologySignature, {"count": 4}),
+                (ParentSiblingSignature, {"width": 4})]:
+            results = []
+            # rolling the window in order must give the same signatures as
+            # looking at the children again in reverse order
+            for reverse in [False, True]:
+                tree = wide_tree()
+                nodes = list(tree.nodes())
+                signature = signature_cls(**kwargs)
+                results.append(
+                    {node.node_id: signature.get_signature(node, node.parent())
+                     for node in (nodes[::-1] if reverse else nodes)})
+                results.append(signature.finish_node(tree.root()))
+                if not reverse:
+                    window = tree.root()._sibling_windows[4]
+                    self.assertEqual(50, window.position)
+                    self.assertEqual(["name_1", "name_2", "name_0", "name_1"],
+                                     list(window.siblings))
+            self.assertEqual(results[0], results[2])
+            self.assertEqual(results[1], results[3])
+
+    def test_fused_ensemble(self):
+        def tree():
+            result = random_monitoring_tree(node_count=300, seed=1234)
+            for node in result.nodes():
+                if node.tme % 7 == 3 and not node.children_list():
+                    node.attribute = True
+            return result
+
+        def signatures(symbol_table=None):
+            return [
+                ParentChildByNameTopologySignature(symbol_table=symbol_table),
+                ParentChildOrderTopologySignature(symbol_table=symbol_table),
+                ParentChildOrderByNameTopologySignature(symbol_table=symbol_table),
+                ParentCountedChildrenByNameTopologySignature(
+                    count=3, symbol_table=symbol_table),
+                ParentCountedChildrenByNameTopologySignature(
+                    count=4, symbol_table=symbol_table),
+                ParentSiblingSignature(width=2, symbol_table=symbol_table)
+            ] + ([PQGramSignature(height=2, width=3), PQOrderSignature(width=2)]
+                 if symbol_table is None else [])
+
+        def create_signatures(signature, tree, index=None):
+            # compare the string representation as integer tokens depend on
+            # the order they have been created in
+            def symbol(token):
+                return signature.symbol(token) if index is None else \
+                    signature.symbol(token)[index]
+
+            nodes = list(tree.nodes())
+            return [symbol(signature.get_signature(node, node.parent()))
+                    for node in nodes] + \
+                [[symbol(token) for token in signature.finish_node(node)]
+                 for node in nodes]
+
+        for symbol_table_cls in [lambda: None, SymbolTable]:
+            single_signatures = signatures(symbol_table_cls())
+            ensemble_signature = EnsembleSignature(
+                signatures=signatures(symbol_table_cls()))
+            self.assertEqual(4, ensemble_signature.sibling_width)
+            for index, signature in enumerate(single_signatures):
+                self.assertEqual(
+                    create_signatures(signature, tree()),
+                    [token if not isinstance(token, list) else
+                     [element for element in token if element is not None]
+                     for token in create_signatures(
+                        ensemble_signature, tree(), index)])
+
+    def test_symbol_table_distance(self):
+        tree = Prototype()
+        root = tree.add_node("root", pid=1, ppid=0, tme=0, exit_tme=5)
+        for index, name in enumerate(["test", "muh", "test", "test"]):
+            root.add_node(name, pid=index + 2, ppid=1, tme=index, exit_tme=index + 1)
+        results = []
+        for symbol_table in [None, SymbolTable()]:
+            signature = EnsembleSignature(signatures=[
+                ParentChildByNameTopologySignature(symbol_table=symbol_table),
+                ParentCountedChildrenByNameTopologySignature(
+                    count=3, symbol_table=symbol_table)])
+            algorithm = IncrementalDistanceAlgorithm(
+                signature=signature, distance=SimpleDistance)
+            decorator = DistanceMatrixDecorator(normalized=False)
+            decorator.wrap_algorithm(algorithm)
+            algorithm.prototypes = [tree, simple_prototype()]
+            for monitoring_tree in [simple_prototype(), tree]:
+                algorithm.start_tree()
+                for event in monitoring_tree.event_iter(
+                        include_marker=True, supported=algorithm.supported):
+                    try:
+                        algorithm.add_event(event)
+                    except EventNotSupportedException:
+                        pass
+                algorithm.finish_tree()
+            results.append(decorator.data())
+        self.assertEqual(results[0], results[1])
+        self.assertNotEqual([[[0, 0]], [[0, 0]]], results[0])
@@ -0,0 +1,122 @@
+import unittest
+import pickle
+import random
+
+from assess.algorithms.distances.startexitdistance import StartExitDistance
+from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
+from assess.algorithms.signatures.signatures import \
+    ParentChildByNameTopologySignature
+from assess.algorithms.statistics.sketchstatistics import SketchStatistics
+from assess.decorators.distancematrixdecorator import DistanceMatrixDecorator
+from assess.exceptions.exceptions import EventNotSupportedException
+
+from assess_tests.basedata import random_monitoring_tree
+
+
+class TestSketchStatistics(unittest.TestCase):
+    def test_relative_accuracy(self):
+        random.seed(1234)
+        values = sorted(random.lognormvariate(5, 2) for _ in range(1000))
+        statistics = SketchStatistics(relative_accuracy=.01, max_buckets=1000)
+        for value in values:
+            statistics.add(value)
+        self.assertEqual(1000, statistics.count())
+        for quantile in [0, .1, .5, .9, .99, 1]:
+            expected = values[int(quantile * (len(values) - 1))]
+            self.assertLessEqual(
+                abs(statistics.quantile(quantile) - expected) / expected, .01)
+        for value in values:
+            self.assertTrue(statistics.count(value) > 0)
+            self.assertEqual(0, statistics.distance(value))
+            self.assertEqual(
+                1, statistics.distance(value, count=statistics.count(value)))
+        self.assertIsNone(statistics.distance(None))
+        self.assertIsNone(SketchStatistics().quantile(.5))
+
+    def test_zero(self):
+        statistics = SketchStatistics()
+        statistics.add(0)
+        statistics.add(0)
+        statistics.add(10)
+        self.assertEqual(2, statistics.count(0))
+        self.assertEqual(1, statistics.count(10))
+        self.assertEqual(0, statistics.count(5))
+        self.assertEqual(0, statistics.quantile(.5))
+        self.assertEqual([0, 2], [[statistic.value, statistic.count]
+                                  for statistic in statistics][0])
+
+    def test_bounded_buckets(self):
+        statistics = SketchStatistics(max_buckets=10)
+        for value in range(1, 10000):
+            statistics.add(value)
+        self.assertEqual(10, len(list(statistics)))
+        self.assertEqual(9999, statistics.count())
+        # lowest values are collapsed into lowest bucket
+        self.assertEqual(statistics.count(1), statistics.count(2))
+        self.assertLessEqual(abs(statistics.quantile(1) - 9999) / 9999, .05)
+
+    def test_add_many(self):
+        random.seed(1234)
+        values = [random.expovariate(.01) for _ in range(1000)] + [0, 0]
+        for max_buckets in [10, 128]:
+            statistics = SketchStatistics(max_buckets=max_buckets)
+            statistics.add_many(values[:500])
+            statistics.add_many(values[500:])
+            sequential = SketchStatistics(max_buckets=max_buckets)
+            for value in values:
+                sequential.add(value)
+            self.assertEqual(
+                [(statistic.value, statistic.count) for statistic in sequential],
+                [(statistic.value, statistic.count) for statistic in statistics])
+
+    def test_merge(self):
+        random.seed(1234)
+        first = SketchStatistics(max_buckets=20)
+        second = SketchStatistics(max_buckets=20)
+        merged = SketchStatistics(max_buckets=20)
+        for _ in range(1000):
+            value = random.expovariate(.01)
+            merged.add(value)
+            first.add(value)
+            value = random.lognormvariate(3, 3)
+            merged.add(value)
+            second.add(value)
+        self.assertEqual(2000, (first + second).count())
+        first += second
+        self.assertLessEqual(len(list(first)), 20)
+        self.assertEqual(merged.count(), first.count())
+        for quantile in [.25, .5, .75, 1]:
+            self.assertEqual(merged.quantile(quantile), first.quantile(quantile))
+        self.assertRaises(
+            TypeError, first.__iadd__, SketchStatistics(relative_accuracy=.1))
+
+        mean = SketchStatistics.mean([first, second])
+        self.assertEqual(3000 / 2, mean.count())
+        self.assertEqual(2000, first.count())
+        mean = SketchStatistics.mean([second], length=4)
+        self.assertEqual(1000 / 4, mean.count())
+        self.assertEqual(1000, second.count())
+
+        loaded = pickle.loads(pickle.dumps(first))
+        self.assertEqual(list((statistic.value, statistic.count)
+                              for statistic in first),
+                         list((statistic.value, statistic.count)
+                              for statistic in loaded))
+
+    def test_algorithm(self):
+        algorithm = IncrementalDistanceAlgorithm(
+            signature=ParentChildByNameTopologySignature(),
+            distance=lambda **kwargs: StartExitDistance(weight=.5, **kwargs),
+            cache_statistics=SketchStatistics)
+        decorator = DistanceMatrixDecorator(normalized=False)
+        decorator.wrap_algorithm(algorithm)
+        prototype = random_monitoring_tree(seed=1)
+        algorithm.prototypes = [prototype]
+        algorithm.start_tree()
+        for event in prototype.event_iter(supported=algorithm.supported):
+            try:
+                algorithm.add_event(event)
+            except EventNotSupportedException:
+                pass
+        algorithm.finish_tree()
+        self.assertEqual([[[0]]], decorator.data())
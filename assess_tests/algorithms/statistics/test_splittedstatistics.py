@@ -1,4 +1,5 @@
 import unittest
+import pickle
 import random
 
 from assess.algorithms.statistics.splittedstatistics import SplittedStatistics
@@ -60,3 +61,37 @@ class TestSplittedStatistics(unittest.TestCase):
         # number of clusters wo attraction
         self.assertEqual(len(statistics._statistics), 841)
         # TODO: introduce a test that is independent from random
+
+    def test_means(self):
+        random.seed(1234)
+        statistics = SplittedStatistics(statistics_type=MeanVariance)
+        other = SplittedStatistics(statistics_type=MeanVariance)
+        for _ in range(500):
+            statistics.add(int(random.lognormvariate(5, 2)))
+            other.add(int(random.expovariate(0.01)) + 1)
+        self.assertEqual([statistic.mean for statistic in statistics._statistics],
+                         list(statistics._means))
+        statistics += other
+        self.assertEqual([statistic.mean for statistic in statistics._statistics],
+                         list(statistics._means))
+        loaded = pickle.loads(pickle.dumps(statistics))
+        self.assertEqual(list(statistics._means), list(loaded._means))
+        for value in [0, 1, 150, 10000]:
+            self.assertEqual(statistics.distance(value), loaded.distance(value))
+
+    def test_add_many(self):
+        random.seed(1234)
+        values = [int(random.lognormvariate(5, 2)) for _ in range(500)]
+        values[::7] = [0] * len(values[::7])
+        for batch in [values, values + [-3]]:
+            statistics = SplittedStatistics(statistics_type=MeanVariance)
+            statistics.add_many(batch)
+            sequential = SplittedStatistics(statistics_type=MeanVariance)
+            for value in batch:
+                sequential.add(value)
+            self.assertEqual(
+                [(statistic.mean, statistic.variance, statistic.count)
+                 for statistic in sequential],
+                [(statistic.mean, statistic.variance, statistic.count)
+                 for statistic in statistics])
+            self.assertEqual(list(sequential._means), list(statistics._means))
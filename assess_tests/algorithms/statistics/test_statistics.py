@@ -0,0 +1,35 @@
+import unittest
+import random
+
+from assess.algorithms.statistics.setstatistics import SetStatistics
+from assess.algorithms.statistics.statistics import MeanVariance
+
+
+class TestStatistics(unittest.TestCase):
+    def test_mean_variance_add_many(self):
+        random.seed(1234)
+        values = [random.lognormvariate(5, 2) for _ in range(1000)]
+        for batches in [[values], [values[:1], values[1:2], values[2:]],
+                        [values[:500], [], values[500:]]]:
+            statistic = MeanVariance()
+            for batch in batches:
+                statistic.add_many(batch)
+            sequential = MeanVariance()
+            for value in values:
+                sequential.add(value)
+            self.assertEqual(sequential.count, statistic.count)
+            self.assertAlmostEqual(1, statistic.mean / sequential.mean, 9)
+            self.assertAlmostEqual(1, statistic.variance / sequential.variance, 9)
+        statistic = MeanVariance()
+        statistic.add_many([3])
+        self.assertEqual((1, 3, 0), (statistic.count, statistic.mean,
+                                     statistic.variance))
+
+    def test_set_statistics_add_many(self):
+        values = [0, 1, 4, 4, 9, 100, 101]
+        statistics = SetStatistics()
+        statistics.add_many(values)
+        sequential = SetStatistics()
+        for value in values:
+            sequential.add(value)
+        self.assertEqual(sequential._data, statistics._data)
@@ -0,0 +1,67 @@
+import unittest
+import random
+import functools
+
+from assess.algorithms.distances.startexitdistance import StartExitDistance
+from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
+from assess.algorithms.signatures.signatures import \
+    ParentChildByNameTopologySignature, ParentChildOrderTopologySignature
+from assess.algorithms.statistics.setstatistics import SetStatistics
+from assess.algorithms.statistics.splittedstatistics import SplittedStatistics
+from assess.algorithms.statistics.statisticscolumns import StatisticsColumns
+
+from assess_tests.basedata import random_monitoring_tree
+from assess_tests.algorithms.distances.test_distance import assert_equal_distances
+
+
+class StatisticsDistance(StartExitDistance):
+    """
+    StartExitDistance that determines distances per statistics.
+    """
+    __slots__ = ()
+
+    def _column_distances(self, *args, **kwargs):
+        return None
+
+
+class TestStatisticsColumns(unittest.TestCase):
+    def test_distances(self):
+        random.seed(1234)
+        statistics = []
+        for size in [1, 2, 5, 50, 500]:
+            statistic = SplittedStatistics()
+            for _ in range(size):
+                statistic.add(random.choice([0, int(random.lognormvariate(4, 2))]))
+            statistics.append(statistic)
+        prototypes = list(range(len(statistics)))
+        columns = StatisticsColumns.from_statistics(prototypes, statistics)
+        values = [0, 1, 2, 10, 55, 10**6] + [
+            component.mean for statistic in statistics for component in statistic]
+        for value in values:
+            for count in [0, 1, 3]:
+                self.assertEqual(
+                    [statistic.distance(value=value, count=count)
+                     for statistic in statistics],
+                    columns.distances(value, count))
+        self.assertEqual([None] * 5, columns.distances(None))
+        self.assertIsNone(StatisticsColumns.from_statistics(
+            [0, 1], [SplittedStatistics(), SetStatistics()]))
+
+        # statistics without values fail the same way
+        columns = StatisticsColumns.from_statistics([0], [SplittedStatistics()])
+        self.assertRaises(ZeroDivisionError, SplittedStatistics().distance, 10)
+        self.assertRaises(ZeroDivisionError, columns.distances, 10)
+
+    def test_start_exit_distance(self):
+        prototypes = [random_monitoring_tree(node_count=100, seed=seed)
+                      for seed in range(4)]
+        assert_equal_distances(
+            self,
+            distances=[functools.partial(distance_cls, weight=.2)
+                       for distance_cls in [StatisticsDistance, StartExitDistance]],
+            prototypes=prototypes,
+            trees=[random_monitoring_tree(node_count=100, seed=seed)
+                   for seed in [1, 10, 11]],
+            signature=EnsembleSignature(signatures=[
+                ParentChildByNameTopologySignature(),
+                ParentChildOrderTopologySignature()]))
@@ -5,13 +5,18 @@ from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
 from assess.algorithms.distances.simpledistance import SimpleDistance
 from assess.algorithms.signatures.signatures import ParentChildOrderTopologySignature, \
     ParentChildOrderByNameTopologySignature, \
-    ParentCountedChildrenByNameTopologySignature, ParentChildByNameTopologySignature
+    ParentCountedChildrenByNameTopologySignature, ParentChildByNameTopologySignature, \
+    ParentSiblingSignature
+from assess.algorithms.signatures.pqgramsignature import PQGramSignature
+from assess.algorithms.signatures.pqordersignature import PQOrderSignature
 from assess.prototypes.simpleprototypes import Prototype
-from assess.events.events import Event, TrafficEvent, ProcessStartEvent
+from assess.events.events import Event, TrafficEvent, ProcessStartEvent, \
+    ProcessExitEvent
 from assess.exceptions.exceptions import EventNotSupportedException,\
     TreeNotStartedException
 
-from assess_tests.basedata import simple_prototype, simple_monitoring_tree
+from assess_tests.basedata import simple_prototype, simple_monitoring_tree, \
+    random_monitoring_tree
 
 
 class TestIncrementalDistanceAlgorithmFunctionality(unittest.TestCase):
@@ -1220,6 +1225,33 @@ class TestIncrementalDistanceAlgorithmFunctionality(unittest.TestCase):
         self.assertRaises(EventNotSupportedException, algorithm.add_event, None)
         algorithm.finish_tree()
 
+    def test_add_events_checkpoints(self):
+        signature = ParentChildByNameTopologySignature()
+        algorithm = IncrementalDistanceAlgorithm(
+            signature=signature, distance=SimpleDistance)
+        algorithm.prototypes = [simple_prototype()]
+
+        algorithm.start_tree()
+        results = [algorithm.add_event(event) for event in Event.from_tree(
+            simple_monitoring_tree(), supported={ProcessStartEvent: True})]
+        self.assertEqual([[[[0]]]], results[-1:])
+
+        algorithm.start_tree()
+        self.assertIsNone(algorithm.add_events(Event.from_tree(
+            simple_monitoring_tree(), supported={ProcessStartEvent: True}),
+            checkpoint_events=None))
+        self.assertEqual([[0]], algorithm.distance.distance_for_prototypes(
+            algorithm.prototypes))
+
+        algorithm.start_tree()
+        self.assertEqual(results[3], algorithm.add_events(Event.from_tree(
+            simple_monitoring_tree(), supported={ProcessStartEvent: True}),
+            checkpoint_events=2))
+        algorithm.start_tree()
+        self.assertEqual(results[2], algorithm.add_events(Event.from_tree(
+            simple_monitoring_tree(), supported={ProcessStartEvent: True}),
+            checkpoint_events=None, checkpoint_tme=1))
+
     def test_format_tree_node_counts(self):
         signature = ParentChildByNameTopologySignature()
         algorithm = IncrementalDistanceAlgorithm(
@@ -1373,3 +1405,52 @@ class TestIncrementalDistanceAlgorithmFunctionality(unittest.TestCase):
             algorithm.add_event(event)
         algorithm.finish_tree()
         self.assertEqual([[3, 3], [5, 5]], algorithm.event_counts())
+
+    def test_frontier(self):
+        tree = random_monitoring_tree(node_count=500, seed=1)
+        prototypes = [random_monitoring_tree(node_count=100, seed=2),
+                      random_monitoring_tree(node_count=100, seed=3)]
+        for signature in [
+                ParentChildByNameTopologySignature(),
+                ParentChildOrderTopologySignature(),
+                ParentChildOrderByNameTopologySignature(),
+                ParentCountedChildrenByNameTopologySignature(count=3),
+                ParentSiblingSignature(width=2),
+                PQGramSignature(height=2, width=2),
+                PQOrderSignature(width=2),
+                EnsembleSignature(signatures=[
+                    ParentChildByNameTopologySignature(),
+                    ParentSiblingSignature(width=3)])]:
+            results = []
+            for frontier in [False, True]:
+                algorithm = IncrementalDistanceAlgorithm(signature=signature)
+                algorithm.supported[ProcessExitEvent] = True
+                algorithm.frontier = frontier
+                algorithm.prototypes = prototypes
+                algorithm.start_tree()
+                result = []
+                for event in tree.event_iter(supported=algorithm.supported):
+                    try:
+                        result.append(algorithm.add_event(event))
+                    except EventNotSupportedException:
+                        pass
+                results.append(result)
+                self.assertEqual(500, algorithm.tree.node_count())
+            self.assertEqual(results[0], results[1])
+            # only nodes required for alive processes are left in the tree
+            self.assertLess(len(list(algorithm.tree.nodes())), 100)
+
+    def test_unordered_events(self):
+        # a pid is reused before an event referencing its first process
+        events = [ProcessStartEvent(0, 1, 0, name="root"),
+                  ProcessStartEvent(1, 2, 1, name="first"),
+                  ProcessStartEvent(5, 2, 1, name="second"),
+                  ProcessStartEvent(2, 3, 2, name="child")]
+        algorithm = IncrementalDistanceAlgorithm()
+        algorithm.prototypes = [simple_prototype()]
+        algorithm.start_tree()
+        for event in events:
+            algorithm.add_event(event)
+        first = algorithm.tree.root().children_list()[0]
+        self.assertEqual("first", first.name)
+        self.assertEqual(["child"], [child.name for child in first.children()])
@@ -1,11 +1,25 @@
+import pickle
 import unittest
 
 from assess.algorithms.treedistancealgorithm import TreeDistanceAlgorithm
-from assess.events.events import TrafficEvent
+from assess.algorithms.signatures.columnarsignaturecache import \
+    ColumnarPrototypeSignatureCache
+from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
+from assess.algorithms.signatures.signatures import \
+    ParentChildByNameTopologySignature, \
+    ParentCountedChildrenByNameTopologySignature
+from assess.algorithms.signatures.symboltable import SymbolTable
+from assess.events.events import TrafficEvent, ProcessExitEvent
 from assess.prototypes.simpleprototypes import Prototype
 from assess.exceptions.exceptions import EventNotSupportedException
 
-from assess_tests.basedata import simple_prototype, simple_monitoring_tree
+from assess_tests.basedata import simple_prototype, simple_monitoring_tree, \
+    random_monitoring_tree
+
+
+class ColumnarSignature(ParentCountedChildrenByNameTopologySignature):
+    # defined on module level to be picklable for the process pool
+    prototype_signature_cache_class = ColumnarPrototypeSignatureCache
 
 
 class TestTreeDistanceAlgorithm(unittest.TestCase):
@@ -52,3 +66,38 @@ class TestTreeDistanceAlgorithm(unittest.TestCase):
         algorithm = TreeDistanceAlgorithm()
         algorithm.prototypes = [simple_prototype()]
         self.assertEqual([[5]], algorithm.prototype_event_counts())
+
+    def test_parallel_prototypes(self):
+        def cache_state(algorithm):
+            # prototypes are replaced by their index to compare both caches
+            indices = {prototype: index for index, prototype in
+                       enumerate(algorithm.prototypes)}
+            result = []
+            for cache in algorithm.signature_prototypes:
+                result.append([(signature, [
+                    (indices[prototype], pickle.dumps(values)) for
+                    prototype, values in cache.get(signature).items()])
+                    for signature in cache])
+                result.append([
+                    (cache.multiplicity(prototype=prototype),
+                     cache.node_count(prototype=prototype)) for prototype in
+                    algorithm.prototypes])
+            return result
+
+        for symbol_table in [None, SymbolTable()]:
+            results = []
+            for processes in [None, 2]:
+                algorithm = TreeDistanceAlgorithm(signature=EnsembleSignature(
+                    signatures=[
+                        ParentChildByNameTopologySignature(
+                            symbol_table=symbol_table),
+                        ParentCountedChildrenByNameTopologySignature(
+                            count=2, symbol_table=symbol_table),
+                        ColumnarSignature(count=3, symbol_table=symbol_table)]))
+                algorithm.supported[ProcessExitEvent] = True
+                algorithm.processes = processes
+                algorithm.prototypes = [
+                    random_monitoring_tree(node_count=50, seed=seed) for seed in
+                    range(10)]
+                results.append(cache_state(algorithm))
+            self.assertEqual(results[0], results[1])
@@ -1,4 +1,5 @@
 import os
+import random
 
 import assess_tests
 
@@ -57,6 +58,33 @@ def simple_additional_monitoring_tree():
     return test_tree
 
 
+def random_monitoring_tree(node_count=200, seed=None, name_count=5):
+    """
+    Creates a random tree whose processes are started one after another. The
+    parent of a process is alive when the process starts, but might exit before
+    its children. Process IDs of exited processes are reused afterwards.
+    """
+    rnd = random.Random(seed)
+    test_tree = Prototype()
+    alive = []
+    for tme in range(node_count):
+        alive = [node for node in alive if node.exit_tme >= tme]
+        pids = set(node.pid for node in alive)
+        pid = min(set(range(1, len(pids) + 2)) - pids)
+        exit_tme = tme + rnd.randint(1, 30)
+        name = "name_%d" % rnd.randrange(name_count)
+        parents = [node for node in alive if node.exit_tme > tme]
+        if parents:
+            parent = rnd.choice(parents)
+            node = parent.add_node(
+                name, tme=tme, exit_tme=exit_tme, pid=pid, ppid=parent.pid)
+        else:
+            node = test_tree.add_node(
+                "root", tme=tme, exit_tme=node_count + 30, pid=pid, ppid=0)
+        alive.append(node)
+    return test_tree
+
+
 def real_tree(path=None, absolute=False):
     if path is None:
         path = "data/c01-007-102/1/1-process.csv"
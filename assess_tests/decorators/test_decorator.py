@@ -5,6 +5,10 @@ from assess.decorators.compressionfactordecorator import CompressionFactorDecora
 from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
 from assess.exceptions.exceptions import DecoratorNotFoundException
 from assess.decorators.distancematrixdecorator import DistanceMatrixDecorator
+from assess.decorators.distancedecorator import DistanceDecorator
+from assess.events.events import Event, ProcessStartEvent
+
+from assess_tests.basedata import simple_prototype, simple_monitoring_tree
 
 
 class TestDecorator(unittest.TestCase):
@@ -37,6 +41,23 @@ class TestDecorator(unittest.TestCase):
         decorator.start_tree()
         decorator.finish_tree()
 
+    def test_checkpoints(self):
+        results = []
+        for checkpoint_events in [1, None]:
+            decorator = DistanceMatrixDecorator(normalized=False)
+            decorator.decorator = DistanceDecorator(normalized=False)
+            algorithm = IncrementalDistanceAlgorithm()
+            algorithm.prototypes = [simple_prototype(), simple_monitoring_tree()]
+            decorator.wrap_algorithm(algorithm)
+            algorithm.start_tree()
+            algorithm.add_events(Event.from_tree(
+                simple_monitoring_tree(), supported={ProcessStartEvent: True}),
+                checkpoint_events=checkpoint_events)
+            algorithm.finish_tree()
+            results.append(decorator.descriptive_data())
+        self.assertEqual(results[0], results[1])
+        self.assertEqual([[[[2, 1, 1, 0], [2, 1, 1, 0]]]], results[1]["distances"])
+
     def test_update(self):
         decorator = Decorator()
         second_decorator = Decorator()
@@ -58,6 +58,9 @@ class TestDistanceMatrixDecorator(unittest.TestCase):
         decorator.finish_tree()
         self.assertEqual({"matrix": [[[0, 2]], [[2, 0]]]}, decorator.descriptive_data())
         self.assertRaises(MatrixDoesNotMatchBounds, decorator.start_tree)
+        self.assertEqual(
+            {"matrix": [[[2]], [[0]]]}, decorator.descriptive_prototype_data(1))
+        self.assertEqual([[[0]], [[2]]], decorator.prototype_data(0))
 
     def test_simple_normalized_matrix(self):
         decorator = DistanceMatrixDecorator(normalized=True)
@@ -1,15 +1,59 @@
 import unittest
 import os
+import csv
+import types
 import assess_tests
 import random
 
 from assess.algorithms.signatures.signatures import ParentChildByNameTopologySignature
 from assess.generators.gnm_importer import CSVTreeBuilder, GNMCSVEventStreamer, \
-    EventStreamer, EventStreamPruner, EventStreamBranchPruner, EventStreamRelabeler, \
+    GNMCSVRowStreamer, EventStreamer, EventStreamPruner, EventStreamBranchPruner, EventStreamRelabeler, \
     EventStreamBranchRelabeler, EventStreamDuplicator
 from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
-from assess.events.events import TrafficEvent, EmptyProcessEvent
-from assess.exceptions.exceptions import EventNotSupportedException
+from assess.prototypes.simpleprototypes import Prototype
+from assess.events.events import TrafficEvent, EmptyProcessEvent, \
+    ProcessStartEvent, ProcessExitEvent
+from assess.exceptions.exceptions import EventNotSupportedException, \
+    EventsNotInOrderException
+
+
+def event_key(event):
+    return type(event), event.tme, event.pid, event.ppid, event.name, event.value
+
+
+def csv_rows(path, key_type):
+    with open(path, "r") as csv_file:
+        for row in csv.DictReader(
+                line for line in csv_file if not line.startswith("#")):
+            yield {key: key_type.get(key, str)(value) if value != "" else None
+                   for key, value in row.items()}
+
+
+def traffic_prototype(process_path, traffic_path):
+    """
+    Builds a prototype from GNM csv files where traffic is assigned to the
+    latest started process with the same pid that is alive at its tme.
+    """
+    prototype = Prototype()
+    nodes = {}  # pid -> nodes ordered by tme
+    for process in sorted(csv_rows(process_path, GNMCSVRowStreamer.default_key_type),
+                          key=lambda row: row["tme"]):
+        parent = None
+        for node in reversed(nodes.get(process["ppid"], [])):
+            if node.tme <= process["tme"] <= node.exit_tme:
+                parent = node
+                break
+        if parent is None and prototype.root() is not None:
+            parent = prototype.root()
+        node = prototype.add_node(parent=parent, **process)
+        node.traffic = []
+        nodes.setdefault(process["pid"], []).append(node)
+    for traffic in csv_rows(traffic_path, GNMCSVRowStreamer.traffic_key_type):
+        for node in reversed(nodes.get(traffic["pid"], [])):
+            if node.tme <= traffic["tme"] <= node.exit_tme:
+                node.traffic.append(types.SimpleNamespace(**traffic))
+                break
+    return prototype
 
 
 class TestGNMImporter(unittest.TestCase):
@@ -88,6 +132,62 @@ class TestGNMImporter(unittest.TestCase):
             )
             last_tme = event.tme
 
+    def test_csv_row_streamer(self):
+        for path in [self.file_path, self.small_file, self.old_file_path]:
+            expected = [event_key(event) for event in GNMCSVEventStreamer(path)
+                        if type(event) != EmptyProcessEvent]
+            self.assertEqual(
+                expected, [event_key(event) for event in GNMCSVRowStreamer(path)])
+
+    def test_csv_row_streamer_order(self):
+        supported = {ProcessStartEvent: True, ProcessExitEvent: False}
+        last_tme = 0
+        count = 0
+        for event in GNMCSVRowStreamer(self.file_path, supported=supported):
+            self.assertIsInstance(event, ProcessStartEvent)
+            self.assertTrue(last_tme <= event.tme)
+            last_tme = event.tme
+            count += 1
+        self.assertEqual(9109, count)
+        with self.assertRaises(EventsNotInOrderException):
+            list(GNMCSVRowStreamer(self.file_path, presorted=True))
+
+    def test_csv_row_streamer_chunks(self):
+        expected = [event_key(event) for event in GNMCSVRowStreamer(self.file_path)]
+        for chunk_size in [1, 1000, 9109, 9110]:
+            self.assertEqual(expected, [event_key(event) for event in
+                                        GNMCSVRowStreamer(self.file_path,
+                                                          chunk_size=chunk_size)])
+
+    def test_csv_row_streamer_traffic(self):
+        supported = {ProcessStartEvent: True, ProcessExitEvent: True,
+                     TrafficEvent: True}
+        data_path = os.path.dirname(self.old_file_path)
+        for process_path, traffic_path in [
+                ("gnm-process.csv", "gnm-traffic.csv"),
+                ("c01-007-102/1/1-process.csv", "c01-007-102/1/1-traffic.csv"),
+                ("c01-007-102/2/1129-2-process.csv",
+                 "c01-007-102/2/1129-2-traffic.csv"),
+                ("c01-007-102/2/1136-3-process.csv",
+                 "c01-007-102/2/1136-3-traffic.csv")]:
+            process_path = os.path.join(data_path, process_path)
+            traffic_path = os.path.join(data_path, traffic_path)
+            expected = sorted(
+                event_key(event) for event in traffic_prototype(
+                    process_path, traffic_path).event_iter(supported=supported)
+                if type(event) == TrafficEvent)
+            self.assertTrue(expected)
+            last_tme = 0
+            traffic = []
+            for event in GNMCSVRowStreamer(
+                    process_path, traffic_path=traffic_path, supported=supported,
+                    chunk_size=1000):
+                self.assertTrue(last_tme <= event.tme)
+                last_tme = event.tme
+                if type(event) == TrafficEvent:
+                    traffic.append(event_key(event))
+            self.assertEqual(expected, sorted(traffic))
+
     def test_event_stream_pruner(self):
         random.seed(815)
         csv_event_streamer = GNMCSVEventStreamer(csv_path=self.file_path)
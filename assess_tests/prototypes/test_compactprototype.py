@@ -0,0 +1,103 @@
+import pickle
+from array import array
+
+from assess.algorithms.signatures.signatures import \
+    ParentChildByNameTopologySignature, ParentChildOrderByNameTopologySignature, \
+    ParentCountedChildrenByNameTopologySignature, ParentSiblingSignature
+from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
+from assess.events.events import ProcessStartEvent, ProcessExitEvent, \
+    EmptyProcessEvent
+from assess.prototypes.simpleprototypes import Prototype
+from assess.prototypes.compactprototypes import CompactPrototype
+
+from assess_tests.prototypes import test_prototype
+
+
+class TestCompactPrototypeFunctions(test_prototype.TestPrototypeFunctions):
+    prototype_cls = CompactPrototype
+
+    def _trees(self):
+        trees = []
+        for prototype_cls in [Prototype, CompactPrototype]:
+            tree = prototype_cls()
+            root = tree.add_node("root", tme=0., exit_tme=10., pid=1, ppid=0)
+            for index in range(5):
+                child = root.add_node(
+                    "child_%d" % (index % 2), tme=float(index), exit_tme=index + 2.,
+                    pid=index + 2, ppid=1)
+                for grand_index in range(index):
+                    child.add_node(
+                        "grand_child", tme=index + .5, exit_tme=index + 1.,
+                        pid=10 * (index + 2) + grand_index, ppid=index + 2)
+            trees.append(tree)
+        return trees
+
+    def test_compact_event_iter(self):
+        def event_key(event):
+            if isinstance(event, EmptyProcessEvent):
+                return "empty", event.node.parent().node_id
+            return type(event), event.tme, event.pid, event.ppid, event.name, \
+                event.value
+
+        supported = {ProcessStartEvent: True, ProcessExitEvent: True}
+        tree, compact_tree = self._trees()
+        self.assertEqual(
+            [event_key(event) for event in tree.event_iter(supported=supported)],
+            [event_key(event) for event in compact_tree.event_iter(
+                supported=supported)])
+
+    def test_compact_to_prototype(self):
+        tree, compact_tree = self._trees()
+        for signature in [ParentChildByNameTopologySignature(),
+                          ParentChildOrderByNameTopologySignature(),
+                          ParentCountedChildrenByNameTopologySignature(count=2),
+                          ParentSiblingSignature(width=2)]:
+            cache = tree.to_prototype(EnsembleSignature(signatures=[signature]))
+            compact_cache = compact_tree.to_prototype(
+                EnsembleSignature(signatures=[signature]))
+            self.assertEqual(
+                sorted((str(token), cache.multiplicity(signature=token))
+                       for token in cache),
+                sorted((str(token), compact_cache.multiplicity(signature=token))
+                       for token in compact_cache))
+
+    def test_compact_storage(self):
+        _, compact_tree = self._trees()
+        root = compact_tree.root()
+        self.assertEqual(root.tme, 0.)
+        self.assertEqual(root.exit_tme, 10.)
+        # integers are kept as they are
+        self.assertIs(type(root.pid), int)
+        root.tme = 1
+        self.assertIs(type(root.tme), int)
+        self.assertEqual(root.children_list()[-1].name, "child_0")
+        self.assertEqual(
+            [child.pid for child in root.children_list()[1:3]], [3, 4])
+        self.assertEqual(
+            [child.pid for child in reversed(root.children_list())], [6, 5, 4, 3, 2])
+        with self.assertRaises(AttributeError):
+            root.unknown_attribute
+
+    def test_compact_int_tme(self):
+        tree = CompactPrototype()
+        root = tree.add_node("root", tme=0, exit_tme=10, pid=1, ppid=0)
+        child = root.add_node("child", tme=1, exit_tme=2, pid=2, ppid=1)
+        columns = tree._graph._columns
+        for name in ["tme", "exit_tme"]:
+            self.assertIsInstance(columns[name], array)
+            self.assertEqual("q", columns[name].typecode)
+        self.assertIs(type(child.tme), int)
+        self.assertEqual((1, 2), (child.tme, child.exit_tme))
+        # mixing types keeps the values as they are
+        child.exit_tme = 2.5
+        self.assertNotIsInstance(columns["exit_tme"], array)
+        self.assertIs(type(child.exit_tme), float)
+        self.assertIs(type(root.exit_tme), int)
+
+    def test_compact_pickle(self):
+        _, compact_tree = self._trees()
+        loaded = pickle.loads(pickle.dumps(compact_tree))
+        self.assertEqual(compact_tree.tree_repr(), loaded.tree_repr())
+        self.assertEqual(
+            [node.node_id for node in compact_tree.nodes(order_first=True)],
+            [node.node_id for node in loaded.nodes(order_first=True)])
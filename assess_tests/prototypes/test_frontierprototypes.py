@@ -0,0 +1,76 @@
+import unittest
+
+from assess.prototypes.frontierprototypes import FrontierTree
+from assess.exceptions.exceptions import NodeNotEmptyException, \
+    NodeNotRemovedException
+
+
+class TestFrontierPrototypeFunctions(unittest.TestCase):
+    def _tree(self, width=2, children=6):
+        tree = FrontierTree(width=width)
+        root = tree.add_node("root", tme=0, exit_tme=10, pid=1, ppid=0)
+        for index in range(children):
+            root.add_node("child_%d" % index, tme=index, exit_tme=index + 1,
+                          pid=index + 2, ppid=1)
+        return tree, root
+
+    def test_slicing(self):
+        tree, root = self._tree(width=10)
+        children = root.children_list()
+        names = ["child_%d" % index for index in range(6)]
+        for item in [slice(None), slice(1, 5), slice(None, None, 2),
+                     slice(5, 0, -2), slice(None, None, -1), slice(-2, None)]:
+            self.assertEqual(
+                names[item], [child.name for child in children[item]])
+
+        tree, root = self._tree(width=2, children=12)
+        children = root.children_list()
+        self.assertEqual(12, len(children))
+        self.assertEqual(["child_11", "child_10"],
+                         [child.name for child in children[-1:-3:-1]])
+        self.assertEqual(
+            [child for child in reversed(children) if child.position % 2],
+            children[::-2])
+
+    def test_remove_node(self):
+        tree, root = self._tree(width=10)
+        children = root.children_list()
+        tree.remove_node(node=children[2])
+        self.assertEqual(6, tree.node_count())
+        self.assertEqual(5, root.child_count())
+        self.assertEqual(["child_0", "child_1", "child_3", "child_4", "child_5"],
+                         [child.name for child in children[:]])
+        self.assertEqual(list(range(5)), [child.position for child in children])
+        self.assertEqual("child_3", children[2].name)
+
+        with self.assertRaises(NodeNotEmptyException):
+            tree.remove_node(node=root)
+        children[0].add_node("grand_child", tme=.5, exit_tme=.7, pid=20, ppid=2)
+        with self.assertRaises(NodeNotEmptyException):
+            tree.remove_node(node=children[0])
+        released = children[1]
+        tree.release_node(released)
+        with self.assertRaises(NodeNotRemovedException):
+            tree.remove_node(node=released)
+        for child in list(children)[2:]:
+            tree.remove_node(node=child)
+        self.assertEqual(2, root.child_count())
+        self.assertEqual([0, 1], [child.position for child in children])
+        with self.assertRaises(NodeNotRemovedException):
+            FrontierTree().remove_node(
+                node=FrontierTree().add_node("root", tme=0, pid=1, ppid=0))
+
+    def test_attributes(self):
+        tree = FrontierTree(width=2)
+        root = tree.add_node("root", tme=0, exit_tme=10, pid=1, ppid=0)
+        for index in range(100):
+            node = root.add_node("attribute_%d" % (index % 3), tme=index,
+                                 pid=index + 2, ppid=1)
+            node.attribute = True
+        children = root.children_list()
+        self.assertEqual(100, len(children))
+        self.assertTrue(len(children._nodes) <= 2 * (2 + 3) + 2)
+        names = set(child.name for child in children[:])
+        self.assertEqual(set(["attribute_0", "attribute_1", "attribute_2"]),
+                         names)
+        self.assertEqual([98, 99], [child.position for child in children[-2:]])
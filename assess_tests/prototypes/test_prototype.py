@@ -13,27 +13,29 @@ from assess.events.events import ProcessExitEvent, ProcessStartEvent, Event, \
 
 
 class TestPrototypeFunctions(unittest.TestCase):
+    prototype_cls = Prototype
+
     def setUp(self):
         pass
 
     def test_empty_tree(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         self.assertEqual(prototype.node_count(), 0,
                          "The node count for an empty prototype should be 0")
 
     def test_empty_tree_root(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         self.assertEqual(prototype.root(), None,
                          "The root of an empty prototype should be None")
 
     def test_invalid_tree(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         prototype.add_node("test1")
         self.assertRaises(TreeInvalidatedException, prototype.add_node, "test2")
 
     def test_nodes_depth_first(self):
         nodes = []
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("root", pid=1, ppid=0)
         one = root.add_node("1")
         one_one = one.add_node("1.1")
@@ -56,7 +58,7 @@ class TestPrototypeFunctions(unittest.TestCase):
 
     def test_nodes_width_first(self):
         nodes = []
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("root", pid=1, ppid=0)
         one = root.add_node("1")
         one_one = one.add_node("1.1")
@@ -78,7 +80,7 @@ class TestPrototypeFunctions(unittest.TestCase):
         self.assertEqual(len(nodes), 0)
 
     def test_tree_creation(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         node_1 = prototype.add_node("node_1")
         self.assertEqual(
             node_1.name, "node_1", "The name of created node should be node_1")
@@ -113,7 +115,7 @@ class TestPrototypeFunctions(unittest.TestCase):
         self.assertEqual(prototype.node_count(), 4)
 
     def test_node_properties(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("root")
         first = prototype.add_node("first", root)
         second = prototype.add_node("second", first)
@@ -148,7 +150,7 @@ class TestPrototypeFunctions(unittest.TestCase):
         self.assertEqual(third.node_number(), 0)
 
     def test_node_order(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("root")
         for i in range(20):
             prototype.add_node(name=i, parent=root)
@@ -161,7 +163,7 @@ class TestPrototypeFunctions(unittest.TestCase):
                 "Number of node does not match")
 
     def test_creation_via_node(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("root", pid=1, ppid=0)
         for i in range(20):
             root.add_node(i)
@@ -171,7 +173,7 @@ class TestPrototypeFunctions(unittest.TestCase):
             self.assertEqual(node.node_number(), int(node.name))
 
     def test_unique_tree_ids(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("node", pid=1, ppid=0)
         for _ in range(20):
             root.add_node("node")
@@ -182,7 +184,7 @@ class TestPrototypeFunctions(unittest.TestCase):
         self.assertEqual(prototype.node_count(), 41)
 
     def test_parent(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("root", pid=1, ppid=0)
         sub_root = root.add_node("sub_root", pid=2, ppid=1)
         sub_sub_root = sub_root.add_node("sub_sub_root", pid=3, ppid=2)
@@ -222,7 +224,7 @@ class TestPrototypeFunctions(unittest.TestCase):
         )
 
     def test_global_order(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("root")
         node_1 = prototype.add_node("node_1", parent=root)
         node_2 = prototype.add_node("node_2", parent=root)
@@ -261,7 +263,7 @@ class TestPrototypeFunctions(unittest.TestCase):
             last_tme = node.tme
 
     def test_node_removal(self):
-        tree = Prototype()
+        tree = self.prototype_cls()
         root = tree.add_node("root")
         node_1 = root.add_node("node_1")
         node_2 = root.add_node("node_2")
@@ -323,7 +325,7 @@ class TestPrototypeFunctions(unittest.TestCase):
         self.assertEqual(2, index.multiplicity(signature="muh_149160533"))
 
     def test_parent_child_event_iter(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("root", pid=1, ppid=0, tme=0, exit_tme=3, traffic=[])
         one = root.add_node("one", pid=2, ppid=1, tme=0, exit_tme=2, traffic=[])
         one.add_node("one.one", pid=3, ppid=2, tme=1, exit_tme=2, traffic=[])
@@ -346,7 +348,7 @@ class TestPrototypeFunctions(unittest.TestCase):
                 finished.add(event.pid)
 
     def test_streaming_order(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("root", pid=2, ppid=1, tme=1, exit_tme=5)
         nodes = [root,
                  root.add_node("one", pid=3, ppid=2, tme=1, exit_tme=2),
@@ -362,12 +364,12 @@ class TestPrototypeFunctions(unittest.TestCase):
         self.assertEquals(index, len(nodes))
 
     def test_parameter(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("root", pid=1, test=2, muh=3, tme=3)
         self.assertEqual({"test": 2, "muh": 3}, root.parameters())
 
     def test_parameter_event_generation(self):
-        prototype = Prototype()
+        prototype = self.prototype_cls()
         root = prototype.add_node("root", pid=1, ppid=0, test=2, muh=3, tme=3, exit_tme=3)
         events = 0
         matches = 0
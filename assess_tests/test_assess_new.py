@@ -0,0 +1,86 @@
+import unittest
+
+import assess_new
+from assess.algorithms.distances.startexitdistance import StartExitDistance
+from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
+from assess.algorithms.signatures.signatures import ParentChildByNameTopologySignature
+from assess.decorators.distancematrixdecorator import DistanceMatrixDecorator
+from assess.events.events import ProcessStartEvent, ProcessExitEvent
+
+from assess_tests.basedata import simple_prototype, simple_monitoring_tree
+
+
+class TreeStreamer(object):
+    """
+    Event streamer that takes the name of a tree from basedata as path.
+    """
+    trees = {
+        "simple_prototype": simple_prototype,
+        "simple_monitoring_tree": simple_monitoring_tree
+    }
+
+    def __init__(self, csv_path):
+        self.path = csv_path
+
+    def __iter__(self):
+        return self.trees[self.path]().event_iter(supported={
+            ProcessStartEvent: True, ProcessExitEvent: True})
+
+    def __repr__(self):
+        return self.__class__.__name__
+
+
+def configurations():
+    return [{
+        "algorithms": [lambda **kwargs: IncrementalDistanceAlgorithm(
+            distance=lambda **distance_kwargs: StartExitDistance(
+                weight=1, **distance_kwargs),
+            **kwargs)],
+        "signatures": [ParentChildByNameTopologySignature],
+        "decorator": lambda: DistanceMatrixDecorator(normalized=False),
+        "event_streamer": [TreeStreamer]
+    }]
+
+
+class TestAssessNew(unittest.TestCase):
+    def test_matrix_rows(self):
+        self.assertEqual(
+            [(0, [0, 1, 2]), (1, [0, 1, 2]), (2, [0, 1, 2])],
+            assess_new.matrix_rows(3))
+        self.assertEqual(
+            [(0, [1, 2]), (1, [0, 2]), (2, [0, 1])],
+            assess_new.matrix_rows(3, no_diagonal=True))
+        self.assertEqual(
+            [(0, [0]), (1, [0, 1]), (2, [0, 1, 2])],
+            assess_new.matrix_rows(3, no_upper=True))
+        self.assertEqual(
+            [(1, [0]), (2, [0, 1])],
+            assess_new.matrix_rows(3, no_upper=True, no_diagonal=True))
+        self.assertEqual([], assess_new.matrix_rows(1, no_diagonal=True))
+
+    def test_check_matrix_row(self):
+        paths = ["simple_prototype", "simple_monitoring_tree"]
+        prototypes = [TreeStreamer.trees[path]() for path in paths]
+        assess_new.init_worker(
+            configurations=configurations(), prototypes=prototypes)
+        for row in [[0, 1], [0], [1]]:
+            cells = assess_new.check_matrix_row({"tree": paths[1], "prototypes": row})
+            self.assertEqual(row, sorted(cells))
+            for prototype_index, results in cells.items():
+                # each cell equals a run against the prototype of the cell only
+                algorithm = configurations()[0]["algorithms"][0](
+                    signature=ParentChildByNameTopologySignature())
+                algorithm.prototypes = [prototypes[prototype_index]]
+                decorator = DistanceMatrixDecorator(normalized=False)
+                decorator.wrap_algorithm(algorithm)
+                algorithm.start_tree()
+                algorithm.add_events(TreeStreamer(paths[1]), checkpoint_events=None)
+                algorithm.finish_tree()
+                self.assertEqual(1, len(results))
+                self.assertEqual("TreeStreamer", results[0]["event_streamer"])
+                self.assertEqual(
+                    decorator.descriptive_data(), results[0]["decorator"])
+        # the tree is streamed once per row against all of its prototypes
+        self.assertEqual(1, len(assess_new.worker_state["algorithms"]))
+        self.assertNotEqual(cells[1][0]["decorator"], assess_new.check_matrix_row(
+            {"tree": paths[1], "prototypes": [0]})[0][0]["decorator"])
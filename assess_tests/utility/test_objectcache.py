@@ -1,16 +1,17 @@
 import unittest
 
-from assess.utility.objectcache import ObjectCache
+from assess.utility.objectcache import ObjectCache, BoundedCounter
 from assess.exceptions.exceptions import DataNotInCacheException
 
 
 class Process(object):
-    __slots__ = "tme", "pid", "name",
+    __slots__ = "tme", "pid", "name", "exit_tme"
 
-    def __init__(self, tme=None, pid=None, name=None):
+    def __init__(self, tme=None, pid=None, name=None, exit_tme=None):
         self.tme = tme
         self.pid = pid
         self.name = name
+        self.exit_tme = exit_tme
 
 
 class TestObjectCacheFunctions(unittest.TestCase):
@@ -126,6 +127,91 @@ class TestObjectCacheFunctions(unittest.TestCase):
         with self.assertRaises(DataNotInCacheException):
             self.object_cache.get_data(value=1, key=1)
 
+    def test_pidReuse(self):
+        processes = [Process(tme=tme, pid=2, exit_tme=tme + 5)
+                     for tme in range(100, 0, -10)]
+        for process in processes:
+            self.object_cache.add_data(data=process)
+        self.assertEqual(len(self.object_cache.object_cache[2]), 10)
+        for process in processes:
+            for tme in range(process.tme, process.tme + 10):
+                self.assertEqual(
+                    process, self.object_cache.get_data(value=tme, key=2))
+            self.assertEqual(process, self.object_cache.get_data(
+                value=process.exit_tme, key=2, validate_range=True))
+            with self.assertRaises(DataNotInCacheException):
+                self.object_cache.get_data(
+                    value=process.exit_tme + 1, key=2, validate_range=True,
+                    remember_error=True)
+        self.assertEqual(len(self.object_cache.faulty_nodes), 1)
+        self.assertEqual(self.object_cache.faulty_nodes.count, 10)
+
+        self.assertTrue(self.object_cache.remove_data(data=processes[3]))
+        self.assertFalse(self.object_cache.remove_data(data=processes[3]))
+        self.assertEqual(processes[4], self.object_cache.get_data(
+            value=processes[3].tme, key=2))
+
+    def test_endValue(self):
+        process = Process(tme=1, pid=2, exit_tme=None)
+        self.object_cache.add_data(data=process, end_value=5)
+        self.assertEqual(process, self.object_cache.get_data(
+            value=5, key=2, validate_range=True))
+        with self.assertRaises(DataNotInCacheException):
+            self.object_cache.get_data(value=6, key=2, validate_range=True)
+
+    def test_evict(self):
+        process = Process(tme=1, pid=2)
+        process2 = Process(tme=3, pid=2)
+        process3 = Process(tme=2, pid=3)
+        self.object_cache.add_data(data=process, end_value=2)
+        self.object_cache.add_data(data=process2, end_value=10)
+        self.object_cache.add_data(data=process3)
+        self.assertEqual([], self.object_cache.evict(2))
+        self.assertEqual([process], self.object_cache.evict(5))
+        self.assertEqual(
+            [process2], self.object_cache.object_cache[process2.pid])
+        self.assertEqual([process2], self.object_cache.evict(11))
+        self.assertEqual(1, len(self.object_cache.object_cache))
+        self.assertEqual(process3, self.object_cache.get_data(value=11, key=3))
+        self.assertTrue(self.object_cache.finish_data(data=process3, end_value=12))
+        self.assertEqual(process3, self.object_cache.get_data(
+            value=12, key=3, validate_range=True))
+        self.assertEqual([process3], self.object_cache.evict(13))
+        self.assertEqual(0, len(self.object_cache.object_cache))
+
+    def test_ordered(self):
+        object_cache = ObjectCache(ordered=True)
+        process = Process(tme=1, pid=2)
+        process2 = Process(tme=1, pid=2)
+        process3 = Process(tme=3, pid=2)
+        object_cache.add_data(data=process)
+        object_cache.add_data(data=process2)
+        self.assertEqual(2, len(object_cache.object_cache[2]))
+        self.assertEqual(process, object_cache.get_data(value=2, key=2))
+        object_cache.add_data(data=process3)
+        self.assertEqual([process3], object_cache.object_cache[2])
+        self.assertEqual(process3, object_cache.get_data(value=3, key=2))
+
+    def test_value_function(self):
+        process = Process(tme=1, pid=2)
+        process2 = Process(tme=3, pid=2)
+        self.object_cache.add_data(data=process, value=10)
+        self.object_cache.add_data(data=process2, value=20)
+        self.assertEqual(process, self.object_cache.get_data(value=15, key=2))
+        self.assertEqual(process, self.object_cache.get_data(
+            value=2, key=2, value_function=lambda data: data.tme))
+
+    def test_boundedCounter(self):
+        counter = BoundedCounter(maxlen=3)
+        for key in [1, 2, 3, 1, 4, 5]:
+            counter.add(key)
+        self.assertEqual(6, counter.count)
+        self.assertEqual([1, 4, 5], list(counter))
+        self.assertNotIn(2, counter)
+        counter.clear()
+        self.assertEqual(0, counter.count)
+        self.assertEqual(0, len(counter))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+import pickle
+
+from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
+from assess.algorithms.distances.startexitdistance import StartExitDistance
+from assess.algorithms.signatures.signatures import ParentChildByNameTopologySignature
+from assess.exceptions.exceptions import EventNotSupportedException
+
+from assess_tests.basedata import simple_prototype
+
+
+class TestStateFunctions(unittest.TestCase):
+    def test_pickle_algorithm(self):
+        algorithm = IncrementalDistanceAlgorithm(
+            signature=ParentChildByNameTopologySignature(),
+            distance=StartExitDistance)
+        algorithm.prototypes = [simple_prototype()]
+        algorithm.start_tree()
+        for event in simple_prototype().event_iter(supported=algorithm.supported):
+            try:
+                algorithm.add_event(event)
+            except EventNotSupportedException:
+                pass
+        algorithm.finish_tree()
+
+        loaded = pickle.loads(pickle.dumps(algorithm))
+        self.assertEqual(repr(algorithm), repr(loaded))
+        self.assertEqual(repr(algorithm.signature), repr(loaded.signature))
+        self.assertEqual(algorithm.supported, loaded.supported)
+        # prototypes are not pickled
+        self.assertEqual([], loaded.prototypes)
+        self.assertEqual(
+            algorithm.distance.signature_count, loaded.distance.signature_count)
@@ -0,0 +1,62 @@
+"""
+Benchmark measures the runtime of an anomaly run for monitoring trees of
+increasing size. As the multiplicities of signature caches are maintained
+incrementally, the time per event should stay constant, i.e. the overall
+runtime scales linearly with the size of the tree.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.anomaly_scaling
+"""
+import argparse
+
+from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
+from assess.algorithms.distances.startexitdistance import StartExitDistance
+from assess.algorithms.signatures.signatures import ParentChildByNameTopologySignature
+from assess.decorators.anomalydecorator import AnomalyDecorator
+from assess.exceptions.exceptions import EventNotSupportedException
+
+from benchmarks.utility import random_prototype, timed, print_table
+
+
+def anomaly_run(prototypes, tree):
+    algorithm = IncrementalDistanceAlgorithm(
+        signature=ParentChildByNameTopologySignature(),
+        distance=StartExitDistance
+    )
+    decorator = AnomalyDecorator()
+    decorator.wrap_algorithm(algorithm)
+    algorithm.prototypes = prototypes
+    algorithm.start_tree()
+    event_count = 0
+    for event in tree.event_iter(supported=algorithm.supported):
+        try:
+            algorithm.add_event(event)
+        except EventNotSupportedException:
+            continue
+        event_count += 1
+    algorithm.finish_tree()
+    return event_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[500, 1000, 2000, 4000, 8000])
+    parser.add_argument("--prototypes", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    prototypes = [random_prototype(1000, seed=seed)
+                  for seed in range(options.prototypes)]
+    rows = []
+    for size in options.sizes:
+        tree = random_prototype(size, seed=size)
+        event_count, duration = timed(
+            anomaly_run, prototypes, tree, repeat=options.repeat)
+        rows.append([size, event_count, duration, duration / event_count * 1e6])
+    print_table(["nodes", "events", "seconds", "us/event"], rows)
+
+
+if __name__ == '__main__':
+    main()
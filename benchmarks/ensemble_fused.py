@@ -0,0 +1,86 @@
+"""
+Benchmark compares the time to create the signatures of an
+:py:class:`EnsembleSignature` of the signatures given in ``configuration.py``
+with a reference implementation that evaluates each member on its own. The
+ensemble shares the tokens of the parent, the position of a node, and its
+preceding siblings between its members. Both create the same signatures.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.ensemble_fused
+"""
+import argparse
+from itertools import zip_longest
+
+from assess.algorithms.signatures.ensemblesignature import EnsembleSignature, \
+    EnsembleSignatureList
+
+from benchmarks.utility import random_prototype, deep_prototype, timed, \
+    print_table
+from configuration import configurations
+
+
+class MemberEnsembleSignature(EnsembleSignature):
+    """
+    Reference implementation evaluating each member on its own.
+    """
+    def get_signature(self, node, parent):
+        result = EnsembleSignatureList()
+        for signature in self._signatures:
+            result.append(signature.get_signature(node, parent))
+        return result
+
+    def finish_node(self, node, context=None):
+        result = EnsembleSignatureList()
+        for signature in self._signatures:
+            result.append(signature.finish_node(node))
+        return [EnsembleSignatureList(element) for element in zip_longest(*result)]
+
+
+def create_signatures(signature, tree):
+    result = []
+    for node in tree.nodes(order_first=True):
+        result.append(signature.get_signature(node, node.parent()))
+    for node in tree.nodes(order_first=True):
+        result.append(signature.finish_node(node))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--leaves", type=int, nargs="+", default=[5, 50])
+    parser.add_argument("--repeat", type=int, default=10)
+    options = parser.parse_args()
+
+    trees = [("random", lambda: random_prototype(
+        options.nodes, seed=options.nodes, name_count=20))]
+    for leaves in options.leaves:
+        trees.append(("%d leaves" % leaves, lambda leaves=leaves: deep_prototype(
+            options.nodes // (leaves + 1), width=leaves, seed=leaves,
+            name_count=20)))
+    rows = []
+    for tree_name, tree_function in trees:
+        timings = {}
+        results = []
+        # alternate both implementations to be less sensitive to the load
+        for _ in range(options.repeat):
+            for signature_cls in [MemberEnsembleSignature, EnsembleSignature]:
+                # signatures are cached at the nodes, so each run gets its tree
+                tree = tree_function()
+                result, duration = timed(
+                    create_signatures, signature_cls(signatures=[
+                        signature() for signature in
+                        configurations[0]["signatures"]]), tree)
+                results.append(result)
+                timings[signature_cls] = min(
+                    duration, timings.get(signature_cls, duration))
+        assert all(result == results[0] for result in results)
+        members = timings[MemberEnsembleSignature]
+        fused = timings[EnsembleSignature]
+        rows.append([tree_name, members, fused, members / fused])
+    print_table(["tree", "members s", "fused s", "speedup"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark compares the time to create the signatures and the memory of the
+tokens of the string based order signatures with their hash based variants for
+trees of growing depth.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.hash_signatures
+"""
+import argparse
+
+from assess.algorithms.signatures.hashsignatures import \
+    HashParentChildOrderTopologySignature, \
+    HashParentChildOrderByNameTopologySignature
+from assess.algorithms.signatures.signatures import \
+    ParentChildOrderTopologySignature, ParentChildOrderByNameTopologySignature
+
+from benchmarks.utility import deep_prototype, deep_sizeof, timed, print_table
+
+
+def create_signatures(signature, tree):
+    return [signature.get_signature(node, node.parent())
+            for node in tree.nodes(order_first=True)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[50, 200, 800])
+    parser.add_argument("--leaves", type=int, default=5)
+    options = parser.parse_args()
+
+    rows = []
+    for depth in options.depths:
+        for signature_cls in [ParentChildOrderTopologySignature,
+                              HashParentChildOrderTopologySignature,
+                              ParentChildOrderByNameTopologySignature,
+                              HashParentChildOrderByNameTopologySignature]:
+            # signatures are cached at the nodes, so each run gets its tree
+            trees = iter([deep_prototype(depth, width=options.leaves, seed=depth)
+                          for _ in range(5)])
+            tokens, duration = timed(
+                lambda: create_signatures(signature_cls(), next(trees)), repeat=5)
+            rows.append([depth, signature_cls.__name__, duration,
+                         deep_sizeof(tokens) // 1024])
+    print_table(["depth", "signature", "s", "tokens KiB"], rows)
+
+
+if __name__ == '__main__':
+    main()
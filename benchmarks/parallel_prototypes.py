@@ -0,0 +1,55 @@
+"""
+Benchmark compares the time to compile prototypes into the signature cache of
+a :py:class:`TreeDistanceAlgorithm` sequentially with compiling them in a pool
+of processes. Both create the same cache.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.parallel_prototypes
+"""
+import argparse
+
+from assess.algorithms.treedistancealgorithm import TreeDistanceAlgorithm
+from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
+from assess.algorithms.signatures.hashsignatures import \
+    HashParentChildByNameTopologySignature, \
+    HashParentChildOrderTopologySignature, \
+    HashParentCountedChildrenByNameTopologySignature
+
+from benchmarks.utility import random_prototype, timed, print_table
+
+
+def compile_prototypes(prototypes, processes):
+    algorithm = TreeDistanceAlgorithm(signature=EnsembleSignature(signatures=[
+        HashParentChildByNameTopologySignature(),
+        HashParentChildOrderTopologySignature(),
+        HashParentCountedChildrenByNameTopologySignature(count=3)]))
+    algorithm.processes = processes
+    algorithm.prototypes = prototypes
+    return algorithm.signature_prototypes.multiplicity()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--prototypes", type=int, default=16)
+    parser.add_argument("--nodes", type=int, default=5000)
+    parser.add_argument("--processes", type=int, nargs="+", default=[2, 4])
+    options = parser.parse_args()
+
+    rows = []
+    reference = None
+    for processes in [None] + options.processes:
+        # signatures are cached at the nodes, so each run gets its prototypes
+        prototypes = iter([[random_prototype(options.nodes, seed=seed)
+                            for seed in range(options.prototypes)]
+                           for _ in range(3)])
+        result, duration = timed(
+            lambda: compile_prototypes(next(prototypes), processes), repeat=3)
+        reference = reference or (result, duration)
+        assert result == reference[0]
+        rows.append([processes or 1, duration, reference[1] / duration])
+    print_table(["processes", "s", "speedup"], rows)
+
+
+if __name__ == '__main__':
+    main()
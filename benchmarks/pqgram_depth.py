@@ -0,0 +1,86 @@
+"""
+Benchmark compares the time to create the signatures of the
+:py:class:`PQGramSignature` for deep trees with a reference implementation
+that walks the parent chain for every node instead of using the cached ancestor
+names. Both implementations create the same signatures.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.pqgram_depth
+"""
+import argparse
+
+from assess.algorithms.signatures.pqgramsignature import PQGramSignature
+
+from benchmarks.utility import deep_prototype, timed, print_table
+
+
+class ParentChainPQGramSignature(PQGramSignature):
+    """
+    Reference implementation walking the parent chain for every node.
+    """
+    def prepare_signature(self, node, parent, context=None):
+        parents = self.parent_generator(node)
+        siblings = self.sibling_generator(node, self._width, context)
+        algorithm_id = "_".join(str(next(parents)) for _ in range(self._height)) + \
+                       ("_%s_" % node.name) + \
+                       "_".join(str(next(siblings)) for _ in range(self._width))
+        self._prepare_signature(node, algorithm_id)
+
+    def finish_node(self, node, context=None):
+        result = []
+        if node.children_list():
+            parent_generator = self.parent_generator(node)
+            parents = [node.name] + [next(parent_generator) for _ in
+                                     range(self._height - 1)]
+            siblings = list(self.sibling_finish_generator(
+                node, self._width, context))
+            while siblings:
+                algorithm_id = "_".join(parents) + \
+                               ("_%s_" % "") + \
+                               "_".join(siblings)
+                result.append(algorithm_id)
+                siblings.pop()
+        return result
+
+
+def create_signatures(signature, tree):
+    result = []
+    for node in tree.nodes(order_first=True):
+        result.append(signature.get_signature(node, node.parent()))
+    for node in tree.nodes(order_first=True):
+        result.extend(signature.finish_node(node))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[50, 200, 800])
+    parser.add_argument("--heights", type=int, nargs="+", default=[3, 10, 25])
+    parser.add_argument("--width", type=int, default=2)
+    parser.add_argument("--leaves", type=int, default=5)
+    options = parser.parse_args()
+
+    rows = []
+    for depth in options.depths:
+        for height in options.heights:
+            timings = []
+            results = []
+            for signature_cls in [ParentChainPQGramSignature, PQGramSignature]:
+                # signatures are cached at the nodes, so each run gets its tree
+                trees = iter([deep_prototype(depth, width=options.leaves, seed=depth)
+                              for _ in range(5)])
+                result, duration = timed(
+                    lambda: create_signatures(
+                        signature_cls(height=height, width=options.width),
+                        next(trees)),
+                    repeat=5)
+                results.append(result)
+                timings.append(duration)
+            assert results[0] == results[1]
+            rows.append([depth, height] + timings + [timings[0] / timings[1]])
+    print_table(["depth", "p", "chain s", "cached s", "speedup"], rows)
+
+
+if __name__ == '__main__':
+    main()
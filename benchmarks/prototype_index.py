@@ -0,0 +1,76 @@
+"""
+Benchmark compares the time to get the signature caches of prototypes by
+compiling the prototypes, by loading a pickled signature cache, and by opening
+a :py:class:`PrototypeIndex`. Afterwards, it measures the time to look up all
+signatures once.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.prototype_index
+"""
+import argparse
+import os
+import pickle
+import tempfile
+
+from assess.algorithms.treedistancealgorithm import TreeDistanceAlgorithm
+from assess.algorithms.signatures.ensemblesignature import EnsembleSignature
+from assess.algorithms.signatures.prototypeindex import PrototypeIndex
+
+from benchmarks.utility import random_prototype, timed, print_table
+from configuration import configurations
+
+
+def compile_prototypes(prototypes):
+    algorithm = TreeDistanceAlgorithm(signature=EnsembleSignature(signatures=[
+        signature() for signature in configurations[0]["signatures"]]))
+    algorithm.prototypes = prototypes
+    return algorithm
+
+
+def lookup(caches, signatures):
+    for cache, cache_signatures in zip(caches, signatures):
+        for signature in cache_signatures:
+            cache.get(signature)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--prototypes", type=int, default=20)
+    parser.add_argument("--nodes", type=int, default=5000)
+    options = parser.parse_args()
+
+    # signatures are cached at the nodes, so each run gets its prototypes
+    prototypes = iter([[random_prototype(options.nodes, seed=seed)
+                        for seed in range(options.prototypes)] for _ in range(3)])
+    algorithm, compile_duration = timed(
+        lambda: compile_prototypes(next(prototypes)), repeat=3)
+    # prototypes are replaced by their index to not pickle the trees
+    cache = algorithm.signature.prototype_signature_cache().update(
+        algorithm.signature_prototypes, prototypes={
+            prototype: index for index, prototype in
+            enumerate(algorithm.prototypes)})
+    signatures = [list(member) for member in cache]
+    with tempfile.TemporaryDirectory() as directory:
+        pickle_path = os.path.join(directory, "prototypes.pickle")
+        with open(pickle_path, "wb") as pickle_file:
+            pickle.dump(cache, pickle_file)
+        index_path = os.path.join(directory, "prototypes.index")
+        PrototypeIndex.write(index_path, cache, list(range(
+            options.prototypes))).close()
+
+        def load_pickle():
+            with open(pickle_path, "rb") as pickle_file:
+                return list(pickle.load(pickle_file))
+
+        rows = [["compile", compile_duration, 0]]
+        for name, function in [("pickle", load_pickle),
+                               ("index", lambda: PrototypeIndex(index_path).caches)]:
+            caches, load_duration = timed(function, repeat=3)
+            _, lookup_duration = timed(lookup, caches, signatures)
+            rows.append([name, load_duration, lookup_duration])
+        print_table(["source", "load s", "lookup s"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark compares the memory footprint and the lookup performance of the
+dictionary based :py:class:`PrototypeSignatureCache` and the
+:py:class:`ColumnarPrototypeSignatureCache` for a growing number of prototypes.
+The prototypes themselves are not part of the reported size. The size is
+given after building the cache and after looking up every signature, as the
+columnar cache keeps views of the rows that have been read, see
+*--view_cache_size*. Lookups are measured for a sweep over all signatures as
+well as for repeated lookups of a working set of *--hot* signatures.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.signaturecache_memory
+"""
+import argparse
+import functools
+import random
+
+from assess.algorithms.signatures.columnarsignaturecache import \
+    ColumnarPrototypeSignatureCache
+from assess.algorithms.signatures.signaturecache import PrototypeSignatureCache
+from assess.algorithms.signatures.signatures import ParentChildByNameTopologySignature
+from assess.algorithms.statistics.setstatistics import SetStatistics
+from assess.events.events import ProcessStartEvent, ProcessExitEvent
+from assess.prototypes.simpleprototypes import Prototype
+
+from benchmarks.utility import random_prototype, deep_sizeof, timed, print_table
+
+
+def build_cache(cache_cls, prototypes):
+    supported = {ProcessStartEvent: True, ProcessExitEvent: True}
+    cache = cache_cls(supported=supported, statistics_cls=SetStatistics)
+    signature = ParentChildByNameTopologySignature()
+    for prototype in prototypes:
+        prototype.to_prototype(signature=signature, supported=supported, cache=cache)
+    # trigger lazy preparation of data structures
+    cache.get(signature=None)
+    return cache
+
+
+def lookup(cache, signatures):
+    count = 0
+    for signature in signatures:
+        count += len(cache.get(signature=signature))
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--prototypes", type=int, nargs="+",
+                        default=[10, 50, 200])
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--view_cache_size", type=int, default=None,
+                        help="size of view cache, default of cache if not given")
+    parser.add_argument("--unbounded", action="store_true",
+                        help="keep all views of columnar cache")
+    parser.add_argument("--hot", type=int, default=1000)
+    options = parser.parse_args()
+    columnar_kwargs = {}
+    if options.unbounded:
+        columnar_kwargs["view_cache_size"] = None
+    elif options.view_cache_size is not None:
+        columnar_kwargs["view_cache_size"] = options.view_cache_size
+
+    rows = []
+    for count in options.prototypes:
+        prototypes = [random_prototype(options.nodes, seed=seed, name_count=50)
+                      for seed in range(count)]
+        for name, cache_cls in [
+                ("PrototypeSignatureCache", PrototypeSignatureCache),
+                ("ColumnarPrototypeSignatureCache", functools.partial(
+                    ColumnarPrototypeSignatureCache, **columnar_kwargs))]:
+            cache, build_time = timed(build_cache, cache_cls, prototypes)
+            size = deep_sizeof(cache, ignore=(type, Prototype))
+            signatures = list(cache)
+            _, lookup_time = timed(lookup, cache, signatures, repeat=3)
+            read_size = deep_sizeof(cache, ignore=(type, Prototype))
+            hot = random.Random(count).sample(
+                signatures, min(options.hot, len(signatures))) * 10
+            _, hot_time = timed(lookup, cache, hot, repeat=3)
+            rows.append([
+                count, name, size // 1024, read_size // 1024, build_time,
+                lookup_time / len(signatures) * 1e6, hot_time / len(hot) * 1e6])
+    print_table(["prototypes", "cache", "KiB", "KiB read", "build s", "us/lookup",
+                 "us/hot lookup"], rows)
+
+
+if __name__ == '__main__':
+    main()
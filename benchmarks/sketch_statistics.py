@@ -0,0 +1,107 @@
+"""
+Benchmark compares memory and accuracy of SketchStatistics with
+SplittedStatistics and SetStatistics on the process durations of the test data.
+Durations are collected per process name, as signature caches collect them per
+signature.
+
+Accuracy is given as the share of durations that match the statistics they
+have been added to and the share of durations scaled by *--scale* that do not
+match anymore. For SketchStatistics the maximum relative error of the median
+is given as well.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.sketch_statistics
+"""
+import argparse
+import csv
+import glob
+import os
+
+import assess_tests
+from assess.algorithms.statistics.setstatistics import SetStatistics
+from assess.algorithms.statistics.sketchstatistics import SketchStatistics
+from assess.algorithms.statistics.splittedstatistics import SplittedStatistics
+
+from benchmarks.utility import deep_sizeof, print_table
+
+
+def durations_by_name(paths):
+    result = {}
+    for path in paths:
+        with open(path) as csv_file:
+            rows = (line for line in csv_file if not line.startswith("#"))
+            for row in csv.DictReader(rows):
+                try:
+                    duration = int(row["exit_tme"]) - int(row["tme"])
+                except ValueError:
+                    continue
+                result.setdefault(row["name"], []).append(duration)
+    return result
+
+
+def matches(statistics, value):
+    return statistics.distance(value=value) == 0
+
+
+def median_error(statistics, values):
+    values = sorted(values)
+    expected = values[(len(values) - 1) // 2]
+    estimate = statistics.quantile(.5)
+    if expected == 0:
+        return 0 if estimate == 0 else 1
+    return abs(estimate - expected) / expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=float, default=1.5)
+    parser.add_argument("--max_buckets", type=int, default=128)
+    parser.add_argument("--relative_accuracy", type=float, default=.05)
+    options = parser.parse_args()
+
+    data = os.path.join(os.path.dirname(assess_tests.__file__), "data")
+    paths = sorted(glob.glob(os.path.join(data, "*-process.csv")) +
+                   glob.glob(os.path.join(data, "*", "*", "*-process.csv")))
+    durations = durations_by_name(paths)
+    print("%d durations of %d names in %d files" % (
+        sum(len(values) for values in durations.values()), len(durations),
+        len(paths)))
+
+    rows = []
+    for name, factory in [
+            ("SplittedStatistics", SplittedStatistics),
+            ("SetStatistics", SetStatistics),
+            ("SketchStatistics", lambda: SketchStatistics(
+                relative_accuracy=options.relative_accuracy,
+                max_buckets=options.max_buckets))]:
+        statistics = {}
+        for process_name, values in durations.items():
+            statistic = statistics[process_name] = factory()
+            for value in values:
+                statistic.add(value)
+        size = deep_sizeof(list(statistics.values()),
+                           ignore=(type, type(lambda: None)))
+        largest = max(deep_sizeof(statistic, ignore=(type, type(lambda: None)))
+                      for statistic in statistics.values())
+        total = sum(len(values) for values in durations.values())
+        matched = sum(matches(statistics[process_name], value)
+                      for process_name, values in durations.items()
+                      for value in values)
+        rejected = sum(not matches(statistics[process_name],
+                                   int(value * options.scale))
+                       for process_name, values in durations.items()
+                       for value in values if value > 0)
+        positive = sum(1 for values in durations.values()
+                       for value in values if value > 0)
+        error = max(median_error(statistics[process_name], values)
+                    for process_name, values in durations.items()) \
+            if name == "SketchStatistics" else "-"
+        rows.append([name, size // 1024, largest // 1024, matched / total,
+                     rejected / positive, error])
+    print_table(["statistics", "KiB", "max KiB/name", "matched",
+                 "scaled rejected", "median error"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark measures the time per add of SplittedStatistics while the number of
+components grows. Durations are drawn from a mixture of log-normally distributed
+modes with a small spread each, as processes of the same kind within monitored
+process trees take similar time. The reference looks up the closest component
+by collecting the means of all components for each add. Both implementations
+see the same stream of durations, so they hold the same components.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.splitted_statistics
+"""
+import argparse
+import bisect
+import random
+
+from assess.algorithms.statistics.splittedstatistics import SplittedStatistics
+from assess.algorithms.statistics.statistics import MeanVariance
+
+from benchmarks.utility import timed, print_table
+
+
+class ListSplittedStatistics(SplittedStatistics):
+    """
+    Reference collecting the means of all components for each lookup.
+    """
+    __slots__ = ()
+
+    def _closest_value_and_index(self, value):
+        index = bisect.bisect_left([statistic.mean for
+                                    statistic in self._statistics], value)
+        left_distance = self._statistics[index - 1].distance(value=value) \
+            if index > 1 else float("inf")
+        right_distance = self._statistics[index].distance(value=value) \
+            if index < len(self._statistics) else float("inf")
+        if left_distance is None or right_distance is None:
+            return None, index
+        return min(left_distance, right_distance), index \
+            if right_distance < left_distance else index - 1
+
+
+def add_all(statistics, values):
+    for value in values:
+        statistics.add(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modes", type=int, default=2000)
+    parser.add_argument("--values", type=int, default=6000)
+    parser.add_argument("--step", type=int, default=1000)
+    parser.add_argument("--spread", type=float, default=.01)
+    parser.add_argument("--seed", type=int, default=1000)
+    options = parser.parse_args()
+
+    rnd = random.Random(options.seed)
+    modes = [rnd.lognormvariate(10, 3) for _ in range(options.modes)]
+    values = [int(rnd.choice(modes) * rnd.uniform(
+        1 - options.spread, 1 + options.spread)) for _ in range(options.values)]
+    statistics = [ListSplittedStatistics(statistics_type=MeanVariance),
+                  SplittedStatistics(statistics_type=MeanVariance)]
+    rows = []
+    for start in range(0, options.values, options.step):
+        chunk = values[start:start + options.step]
+        durations = [timed(add_all, statistic, chunk)[1] / len(chunk) * 1e6
+                     for statistic in statistics]
+        rows.append([start + len(chunk), len(statistics[1]._statistics)] +
+                    durations)
+    print_table(["values", "components", "list us/add", "us/add"], rows)
+
+
+if __name__ == '__main__':
+    main()
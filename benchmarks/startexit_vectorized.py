@@ -0,0 +1,66 @@
+"""
+Benchmark compares the time per event of StartExitDistance with and without
+*vectorized* for a growing number of prototypes. Names of nodes are drawn from
+a large set, so the number of prototypes matching a signature hardly grows with
+the number of prototypes. The monitored tree is the first prototype.
+
+Results of events are only materialised at the end of the tree, so the time per
+event is determined by the distance.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.startexit_vectorized
+"""
+import argparse
+import functools
+
+from assess.algorithms.distances.startexitdistance import StartExitDistance
+from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
+from assess.algorithms.signatures.signatures import ParentChildByNameTopologySignature
+from assess.algorithms.statistics.setstatistics import SetStatistics
+
+from benchmarks.utility import random_prototype, timed, print_table
+
+
+def run(algorithm, tree):
+    algorithm.start_tree()
+    algorithm.add_events(
+        tree.event_iter(supported=algorithm.supported), checkpoint_events=None)
+    algorithm.finish_tree()
+    return [value for value in algorithm.distance.iter_on_prototypes(
+        algorithm.prototypes)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--prototypes", type=int, nargs="+",
+                        default=[10, 100, 1000])
+    parser.add_argument("--nodes", type=int, default=200)
+    parser.add_argument("--name_count", type=int, default=100000)
+    options = parser.parse_args()
+
+    tree = random_prototype(options.nodes, seed=0, name_count=options.name_count)
+    event_count = len(list(tree.event_iter(supported=IncrementalDistanceAlgorithm(
+        signature=ParentChildByNameTopologySignature()).supported)))
+    rows = []
+    for count in options.prototypes:
+        prototypes = [tree] + [
+            random_prototype(options.nodes, seed=seed, name_count=options.name_count)
+            for seed in range(1, count)]
+        results = []
+        for vectorized in [False, True]:
+            algorithm = IncrementalDistanceAlgorithm(
+                signature=ParentChildByNameTopologySignature(),
+                distance=functools.partial(
+                    StartExitDistance, weight=.5, vectorized=vectorized),
+                cache_statistics=SetStatistics)
+            algorithm.prototypes = prototypes
+            result, run_time = timed(run, algorithm, tree, repeat=3)
+            results.append(result)
+            rows.append([count, vectorized, run_time / event_count * 1e6])
+        assert results[0] == results[1]
+    print_table(["prototypes", "vectorized", "us/event"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark compares the time to determine the distances of a duration to the
+statistics of a growing number of prototypes per statistics and for all
+prototypes at once by StatisticsColumns. It also measures the StartExitDistance
+of monitoring trees to the prototypes with and without StatisticsColumns.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.statistics_columns
+"""
+import argparse
+import random
+
+from assess.algorithms.distances.startexitdistance import StartExitDistance
+from assess.algorithms.incrementaldistancealgorithm import IncrementalDistanceAlgorithm
+from assess.algorithms.signatures.signatures import \
+    ParentChildByNameTopologySignature
+from assess.algorithms.statistics.splittedstatistics import SplittedStatistics
+from assess.algorithms.statistics.statisticscolumns import StatisticsColumns
+from assess.exceptions.exceptions import EventNotSupportedException
+
+from benchmarks.utility import random_prototype, timed, print_table
+
+
+class StatisticsDistance(StartExitDistance):
+    """
+    Reference determining the distances of a value per statistics.
+    """
+    __slots__ = ()
+
+    def _column_distances(self, *args, **kwargs):
+        return None
+
+
+def measure(algorithm, trees):
+    for tree in trees:
+        algorithm.start_tree()
+        for event in tree.event_iter(supported=algorithm.supported):
+            try:
+                algorithm.add_event(event)
+            except EventNotSupportedException:
+                pass
+        algorithm.finish_tree()
+    return algorithm.distance.current_distance()
+
+
+def statistics_distances(statistics, values):
+    return [[statistic.distance(value=value, count=0) for statistic in statistics]
+            for value in values]
+
+
+def columns_distances(columns, values):
+    return [columns.distances(value, 0) for value in values]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--prototypes", type=int, nargs="+", default=[5, 20, 80])
+    parser.add_argument("--durations", type=int, default=200,
+                        help="Durations per prototype statistics")
+    parser.add_argument("--nodes", type=int, default=300)
+    parser.add_argument("--trees", type=int, default=3)
+    options = parser.parse_args()
+
+    rnd = random.Random(1234)
+    values = [int(rnd.lognormvariate(4, 2)) for _ in range(1000)]
+    trees = [random_prototype(options.nodes, seed=seed, name_count=2)
+             for seed in range(1000, 1000 + options.trees)]
+    rows = []
+    for count in options.prototypes:
+        statistics = []
+        for _ in range(count):
+            statistic = SplittedStatistics()
+            for _ in range(options.durations):
+                statistic.add(int(rnd.lognormvariate(4, 2)))
+            statistics.append(statistic)
+        columns = StatisticsColumns.from_statistics(list(range(count)), statistics)
+        expected, statistics_duration = timed(
+            statistics_distances, statistics, values, repeat=3)
+        result, columns_duration = timed(
+            columns_distances, columns, values, repeat=3)
+        assert expected == result
+
+        prototypes = [random_prototype(options.nodes, seed=seed, name_count=2)
+                      for seed in range(count)]
+        results = []
+        durations = []
+        for distance_cls in [StatisticsDistance, StartExitDistance]:
+            algorithm = IncrementalDistanceAlgorithm(
+                signature=ParentChildByNameTopologySignature(),
+                distance=lambda **kwargs: distance_cls(
+                    weight=.2, vectorized=True, **kwargs))
+            algorithm.prototypes = prototypes
+            # first run takes over statistics into columns
+            measure(algorithm, trees)
+            result, duration = timed(measure, algorithm, trees, repeat=3)
+            results.append(result)
+            durations.append(duration)
+        assert results[0] == results[1]
+        rows.append([count, statistics_duration / len(values) * 1e6,
+                     columns_duration / len(values) * 1e6] + durations)
+    print_table(["prototypes", "statistics us/value", "columns us/value",
+                 "statistics trees s", "columns trees s"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark compares the memory footprint, the build time, and the time to iterate
+the events of the object based :py:class:`Prototype` and the array based
+:py:class:`CompactPrototype` for trees of growing size.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.tree_memory
+"""
+import argparse
+
+from assess.events.events import ProcessStartEvent, ProcessExitEvent
+from assess.prototypes.compactprototypes import CompactPrototype
+from assess.prototypes.simpleprototypes import Prototype
+
+from benchmarks.utility import random_prototype, deep_sizeof, timed, print_table
+
+
+def iterate(tree):
+    count = 0
+    supported = {ProcessStartEvent: True, ProcessExitEvent: True}
+    for _ in tree.event_iter(supported=supported):
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, nargs="+",
+                        default=[1000, 10000, 100000])
+    options = parser.parse_args()
+
+    rows = []
+    for count in options.nodes:
+        for prototype_cls in [Prototype, CompactPrototype]:
+            tree, build_time = timed(
+                random_prototype, count, seed=count, name_count=50,
+                prototype_cls=prototype_cls)
+            _, iterate_time = timed(iterate, tree)
+            rows.append([
+                count, prototype_cls.__name__, deep_sizeof(tree) // 1024,
+                build_time, iterate_time])
+    print_table(["nodes", "tree", "KiB", "build s", "events s"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+Module offers helpers that are shared by the different benchmark scripts.
+
+The benchmarks are meant to be run from the root of the repository, e.g.
+``python -m benchmarks.anomaly_scaling``.
+"""
+import random
+import sys
+import time
+
+from assess.prototypes.simpleprototypes import Prototype
+
+
+def random_prototype(node_count, seed=None, name_count=10, window=20,
+                     prototype_cls=Prototype):
+    """
+    Method creates a random but valid process tree. Nodes are started one after
+    another, so the tme of a node equals its index. The parent of a node is
+    chosen from the *window* nodes started last. A parent exits after all of its
+    children have exited.
+
+    :param node_count: Number of nodes within the tree
+    :param seed: Seed for the random number generator
+    :param name_count: Number of different names being used for nodes
+    :param window: Number of latest nodes to choose the parent from
+    :param prototype_cls: Class of tree to create
+    :return: Created tree
+    """
+    rnd = random.Random(seed)
+    parents = [None] + [rnd.randrange(max(0, index - window), index)
+                        for index in range(1, node_count)]
+    names = ["root"] + ["name_%d" % rnd.randrange(name_count)
+                        for _ in range(1, node_count)]
+    exit_tmes = [index + rnd.randint(0, 5) for index in range(node_count)]
+    for index in range(node_count - 1, 0, -1):
+        parent = parents[index]
+        exit_tmes[parent] = max(exit_tmes[parent], exit_tmes[index])
+    tree = prototype_cls()
+    nodes = []
+    for index in range(node_count):
+        parent = parents[index]
+        nodes.append(tree.add_node(
+            names[index],
+            parent=nodes[parent] if parent is not None else None,
+            tme=index,
+            exit_tme=exit_tmes[index],
+            pid=index + 1,
+            ppid=parent + 1 if parent is not None else 0
+        ))
+    return tree
+
+
+def deep_prototype(depth, width=2, seed=None, name_count=10,
+                   prototype_cls=Prototype):
+    """
+    Method creates a tree consisting of a single path of *depth* nodes where each
+    node on the path has additional *width* leaves.
+
+    :param depth: Depth of the tree
+    :param width: Number of leaves per node on the path
+    :param seed: Seed for the random number generator
+    :param name_count: Number of different names being used for leaves
+    :param prototype_cls: Class of tree to create
+    :return: Created tree
+    """
+    rnd = random.Random(seed)
+    node_count = depth * (width + 1)
+    tree = prototype_cls()
+    parent = None
+    tme = 0
+    pid = 1
+    for level in range(depth):
+        node = tree.add_node(
+            "level_%d" % level, parent=parent, tme=tme,
+            exit_tme=node_count + depth - level, pid=pid,
+            ppid=parent.pid if parent is not None else 0)
+        pid += 1
+        tme += 1
+        for _ in range(width):
+            tree.add_node(
+                "name_%d" % rnd.randrange(name_count), parent=node, tme=tme,
+                exit_tme=tme + 1, pid=pid, ppid=node.pid)
+            pid += 1
+            tme += 1
+        parent = node
+    return tree
+
+
+def deep_sizeof(obj, ignore=(type,)):
+    """
+    Method estimates the memory footprint in bytes of *obj* including all of the
+    objects it references. Each object is only counted once. Objects being an
+    instance of *ignore* are not considered.
+
+    :param obj: Object to determine memory footprint for
+    :param ignore: Tuple of types to ignore
+    :return: Size in bytes
+    """
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, ignore):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        try:
+            stack.append(vars(current))
+        except TypeError:
+            pass
+        for slots in (getattr(cls, "__slots__", ()) for cls in type(current).__mro__):
+            if isinstance(slots, str):
+                slots = (slots,)
+            for slot in slots:
+                try:
+                    stack.append(getattr(current, slot))
+                except AttributeError:
+                    pass
+    return size
+
+
+def timed(function, *args, repeat=1, **kwargs):
+    """
+    Method executes *function* *repeat* times and returns the result of the last
+    execution as well as the best wall clock time in seconds.
+
+    :param function: Function to call
+    :param repeat: Number of repetitions
+    :return: Tuple of result and time in seconds
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return result, best
+
+
+def print_table(header, rows):
+    """
+    Method prints the given *rows* as aligned table with given *header*.
+
+    :param header: List of column names
+    :param rows: List of rows containing a value for each column
+    """
+    formatted = [["%.6f" % value if isinstance(value, float) else str(value)
+                  for value in row] for row in rows]
+    widths = [max(len(str(element)) for element in column)
+              for column in zip(header, *formatted)]
+    print("  ".join(str(name).rjust(width) for name, width in zip(header, widths)))
+    for row in formatted:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))